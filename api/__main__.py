@@ -0,0 +1,47 @@
+# api/__main__.py
+"""
+Modo sin UI: solo la API JSON local.
+
+    python -m api [--host 127.0.0.1] [--port 8765]
+
+Para servirla desde la app de escritorio (mismo proceso, mismas caches) basta
+con GEMTRACK_API_PORT=<puerto> al iniciar main2.py.
+"""
+import argparse
+import asyncio
+import logging
+
+from core.logging_config import setup_logging
+
+logger = logging.getLogger("api")
+
+
+async def serve(host: str, port: int) -> None:
+    from data.data_version import start_data_version_watcher
+    from data.database import init_db
+    from api.local_api import start_local_api
+
+    await init_db()
+    # Las escrituras de la app de escritorio (otro proceso) invalidan la cache de respuestas.
+    start_data_version_watcher()
+    server = await start_local_api(host, port)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API JSON local de GemTrack (solo lectura).")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz donde escuchar (por defecto solo localhost).")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    setup_logging()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("API local detenida.")
+
+
+if __name__ == "__main__":
+    main()
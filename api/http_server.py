@@ -0,0 +1,245 @@
+# api/http_server.py
+"""
+Servidor HTTP/1.1 mínimo sobre asyncio.start_server para la API local (solo
+GET y HEAD de recursos JSON), sin dependencias nuevas.
+
+- Keep-alive: la conexión atiende varias solicitudes seguidas (también en
+  pipeline) hasta "Connection: close" o KEEP_ALIVE_TIMEOUT segundos sin actividad.
+- ETag: si If-None-Match coincide, responde 304 sin cuerpo.
+- gzip: con "Accept-Encoding: gzip" y cuerpos de GZIP_MIN_SIZE bytes o más.
+  La versión comprimida se guarda en la respuesta, así una respuesta cacheada
+  se comprime una sola vez.
+"""
+import asyncio
+import gzip
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+KEEP_ALIVE_TIMEOUT = 15.0
+GZIP_MIN_SIZE = 1024
+MAX_HEADERS = 100
+# Tope de una línea (solicitud o cabecera) en el StreamReader.
+MAX_LINE = 16 * 1024
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """Error que se responde al cliente con su código de estado."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HttpRequest:
+    """Solicitud ya leída: método, ruta decodificada, parámetros y cabeceras (en minúsculas)."""
+    __slots__ = ("method", "target", "path", "query", "headers", "version")
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str]):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("accept-encoding", "").lower()
+
+
+class HttpResponse:
+    """Respuesta JSON ya codificada, con su ETag y su versión gzip (perezosa)."""
+    __slots__ = ("status", "body", "etag", "headers", "_gzipped")
+
+    def __init__(self, status: int, body: bytes, etag: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.etag = etag
+        self.headers = headers or {}
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            # mtime=0: la misma entrada produce los mismos bytes.
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Si el ETag del cliente (If-None-Match) sigue vigente."""
+        if not if_none_match or self.etag is None:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Comparación débil: W/"x" y "x" son la misma representación.
+        return "*" in tags or self.etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+Handler = Callable[[HttpRequest], Awaitable[HttpResponse]]
+
+
+class HttpServer:
+    """Atiende conexiones HTTP y delega cada solicitud en un manejador asíncrono."""
+
+    def __init__(self, handler: Handler, host: str = "127.0.0.1", port: int = 0,
+                 keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Conexiones abiertas: close() las cierra aunque estén en keep-alive.
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self) -> Tuple[str, int]:
+        """
+        Empieza a escuchar.
+        Returns:
+            (host, puerto) reales (útil con port=0).
+        """
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port, limit=MAX_LINE)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        logger.info("API local escuchando en http://%s:%s", self.host, self.port)
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Deja de aceptar conexiones y cierra las abiertas."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    await self._write(writer, None, error_response(e.status, e.message), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                self.requests += 1
+                response = await self._dispatch(request)
+                keep_alive = request.keep_alive
+                await self._write(writer, request, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise HttpError(400, "Línea de solicitud demasiado larga.")
+        if not line:
+            return None
+        parts = line.decode("latin-1").strip().split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise HttpError(400, "Solicitud HTTP inválida.")
+        method, target, version = parts
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADERS + 1):
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise HttpError(400, "Cabecera demasiado larga.")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HttpError(400, "Demasiadas cabeceras.")
+
+        # Los GET no llevan cuerpo, pero si viene se descarta para no desincronizar la conexión.
+        length = headers.get("content-length")
+        if length:
+            try:
+                await reader.readexactly(int(length))
+            except ValueError:
+                raise HttpError(400, "Content-Length inválido.")
+        return HttpRequest(method.upper(), target, version, headers)
+
+    async def _dispatch(self, request: HttpRequest) -> HttpResponse:
+        if request.method not in ("GET", "HEAD"):
+            response = error_response(405, "Solo se admiten GET y HEAD.")
+            response.headers["Allow"] = "GET, HEAD"
+            return response
+        try:
+            return await self.handler(request)
+        except HttpError as e:
+            return error_response(e.status, e.message)
+        except Exception as e:
+            logger.error("Error al atender %s %s: %s", request.method, request.target, e, exc_info=True)
+            return error_response(500, "Error interno.")
+
+    async def _write(self, writer: asyncio.StreamWriter, request: Optional[HttpRequest],
+                     response: HttpResponse, keep_alive: bool) -> None:
+        status, body = response.status, response.body
+        headers: List[Tuple[str, str]] = [("Content-Type", "application/json; charset=utf-8")]
+        if response.etag is not None:
+            headers.append(("ETag", response.etag))
+            # El cliente puede guardar la respuesta, pero debe revalidarla con el ETag.
+            headers.append(("Cache-Control", "no-cache"))
+            if request is not None and response.status == 200 and response.matches(request.headers.get("if-none-match")):
+                status, body = 304, b""
+        if status != 304 and len(body) >= GZIP_MIN_SIZE:
+            headers.append(("Vary", "Accept-Encoding"))
+            if request is not None and request.accepts_gzip():
+                body = response.gzipped()
+                headers.append(("Content-Encoding", "gzip"))
+        headers.extend(response.headers.items())
+        headers.append(("Content-Length", str(len(body))))
+        if keep_alive:
+            headers.append(("Connection", "keep-alive"))
+            headers.append(("Keep-Alive", f"timeout={int(self.keep_alive_timeout)}"))
+        else:
+            headers.append(("Connection", "close"))
+
+        head = f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        if request is None or request.method != "HEAD":
+            writer.write(body)
+        await writer.drain()
+
+
+def error_response(status: int, message: str) -> HttpResponse:
+    """Respuesta de error {"error": mensaje} (sin ETag: no se cachea)."""
+    return HttpResponse(status, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"))
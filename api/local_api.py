@@ -0,0 +1,267 @@
+# api/local_api.py
+"""
+API JSON local (solo lectura) sobre la capa de servicios, para otras
+herramientas de la tienda (impresora de etiquetas, escáner del punto de venta)
+sin abrir gemtrack.db ni pasar por la UI.
+
+    GET /api/health
+    GET /api/products?q=&offset=&limit=       página de resúmenes
+    GET /api/products/<id>                    detalle con categorías y proveedor
+    GET /api/products/sku/<sku>               detalle por SKU (escáner)
+    GET /api/clients?q=&offset=&limit=
+    GET /api/clients/<id>
+    GET /api/categories?offset=&limit=
+    GET /api/search?q=                        búsqueda global (productos y clientes)
+
+Se sirve desde la app con GEMTRACK_API_PORT=<puerto> (start_shared_local_api,
+una vez por proceso) o sin UI con `python -m api`.
+
+Usa los mismos servicios, engine y serializadores que la app. Las respuestas
+200 se cachean ya codificadas (JSON, ETag y gzip) por URL; la cache se
+descarta entera con cualquier commit del engine de este proceso o cualquier
+evento del bus de cambios (incluidas las escrituras de otros procesos que
+detecta el watcher de data_version). Una lectura repetida sin escrituras en
+medio no toca la base de datos.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from api.http_server import HttpError, HttpRequest, HttpResponse, HttpServer
+from core.change_bus import ChangeEvent, change_bus
+from data.serializers import serialize, serialize_many
+from services.category_service import CategoryService
+from services.client_service import ClientService
+from services.product_service import PRODUCT_EXPORT_NESTED, ProductService
+from services.search import global_search, search_results_to_dicts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Respuestas codificadas que se guardan (las URL menos usadas salen primero).
+RESPONSE_CACHE_SIZE = 256
+
+Route = Callable[..., Awaitable[Any]]
+
+
+class LocalApi:
+    """
+    Enrutador y cache de respuestas de la API local.
+    Args:
+        product_service, client_service, category_service: Servicios a exponer
+            (por defecto, los mismos de la app).
+        engine: Engine asíncrono cuyos commits invalidan la cache (por defecto, el de la app).
+    """
+
+    def __init__(self, product_service: Optional[ProductService] = None,
+                 client_service: Optional[ClientService] = None,
+                 category_service: Optional[CategoryService] = None,
+                 engine: Any = None):
+        if engine is None:
+            from data.database import async_engine
+            engine = async_engine
+        self.products = product_service or ProductService()
+        self.clients = client_service or ClientService()
+        self.categories = category_service or CategoryService()
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._cache: "OrderedDict[str, Tuple[int, HttpResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._routes: List[Tuple[re.Pattern, Route]] = [
+            (re.compile(r"/api/health"), self._health),
+            (re.compile(r"/api/products"), self._product_page),
+            (re.compile(r"/api/products/(\d+)"), self._product_by_id),
+            (re.compile(r"/api/products/sku/(.+)"), self._product_by_sku),
+            (re.compile(r"/api/clients"), self._client_page),
+            (re.compile(r"/api/clients/(\d+)"), self._client_by_id),
+            (re.compile(r"/api/categories"), self._category_page),
+            (re.compile(r"/api/search"), self._search),
+        ]
+        # Los commits se notifican en el hilo de aiosqlite: solo se incrementa un contador.
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+        self._unsubscribe = change_bus.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """Deja de escuchar los commits y el bus de cambios."""
+        event.remove(self.engine.sync_engine, "commit", self._on_commit)
+        self._unsubscribe()
+
+    def _on_commit(self, conn: Any) -> None:
+        self.invalidate()
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Descarta las respuestas cacheadas (se descartan al pedirse de nuevo)."""
+        with self._lock:
+            self._generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache),
+                "generation": self._generation}
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        """Resuelve una solicitud GET/HEAD (manejador de HttpServer)."""
+        path = request.path.rstrip("/") or "/"
+        for pattern, route in self._routes:
+            match = pattern.fullmatch(path)
+            if match is not None:
+                break
+        else:
+            raise HttpError(404, f"Ruta desconocida: {path}")
+        if path == "/api/health":
+            return encode(await route(request))
+
+        key = request.target
+        with self._lock:
+            generation = self._generation
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == generation:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+        self.misses += 1
+
+        # La generación se toma ANTES de consultar: si un commit llega durante
+        # la consulta, la respuesta queda marcada como vieja.
+        response = encode(await route(request, *match.groups()))
+        with self._lock:
+            self._cache[key] = (generation, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return response
+
+    async def _health(self, request: HttpRequest) -> Dict[str, Any]:
+        return {"status": "ok"}
+
+    async def _product_page(self, request: HttpRequest) -> Dict[str, Any]:
+        offset, limit = page_params(request)
+        items, total = await self.products.get_product_summary_page(offset, limit, request.query.get("q"))
+        return page(serialize_many(items), total, offset, limit)
+
+    async def _product_by_id(self, request: HttpRequest, product_id: str) -> Dict[str, Any]:
+        return product_detail(await self.products.get_product_details(int(product_id)), product_id)
+
+    async def _product_by_sku(self, request: HttpRequest, sku: str) -> Dict[str, Any]:
+        return product_detail(await self.products.get_product_by_sku(sku), sku)
+
+    async def _client_page(self, request: HttpRequest) -> Dict[str, Any]:
+        offset, limit = page_params(request)
+        items, total = await self.clients.get_client_summary_page(offset, limit, request.query.get("q"))
+        return page(serialize_many(items), total, offset, limit)
+
+    async def _client_by_id(self, request: HttpRequest, client_id: str) -> Dict[str, Any]:
+        client = await self.clients.get_client_details(int(client_id))
+        if client is None:
+            raise HttpError(404, f"No existe el cliente {client_id}.")
+        # El serializador de User ya excluye password_hash.
+        return serialize(client)
+
+    async def _category_page(self, request: HttpRequest) -> Dict[str, Any]:
+        offset, limit = page_params(request)
+        categories = await self.categories.get_category_summaries()
+        return page(serialize_many(categories[offset:offset + limit]), len(categories), offset, limit)
+
+    async def _search(self, request: HttpRequest) -> Dict[str, Any]:
+        query = request.query.get("q", "").strip()
+        if not query:
+            raise HttpError(400, "Falta el parámetro q.")
+        # Mismo proveedor de sesiones que el servicio de productos.
+        results = await global_search(self.products.product_repo.session_provider, query)
+        return search_results_to_dicts(results)
+
+
+def page_params(request: HttpRequest) -> Tuple[int, int]:
+    """(offset, limit) de la solicitud, validados y con el límite acotado a MAX_PAGE_SIZE."""
+    try:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise HttpError(400, "offset y limit deben ser enteros.")
+    if offset < 0 or limit < 1:
+        raise HttpError(400, "offset debe ser >= 0 y limit >= 1.")
+    return offset, min(limit, MAX_PAGE_SIZE)
+
+
+def page(items: List[Dict[str, Any]], total: int, offset: int, limit: int) -> Dict[str, Any]:
+    """Sobre de una página: elementos, total y el offset de la siguiente (None si es la última)."""
+    next_offset = offset + limit if offset + limit < total else None
+    return {"items": items, "total": total, "offset": offset, "limit": limit, "next_offset": next_offset}
+
+
+def product_detail(product: Any, key: str) -> Dict[str, Any]:
+    if product is None:
+        raise HttpError(404, f"No existe el producto {key}.")
+    return serialize(product, nested=PRODUCT_EXPORT_NESTED)
+
+
+def encode(payload: Any) -> HttpResponse:
+    """Codifica una respuesta JSON con un ETag fuerte derivado de su contenido."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return HttpResponse(200, body, etag='"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest())
+
+
+async def start_local_api(host: str = "127.0.0.1", port: int = 8765, api: Optional[LocalApi] = None) -> HttpServer:
+    """
+    Inicia la API local en el event loop actual (la base de datos ya debe estar inicializada).
+    Args:
+        host: Interfaz donde escuchar; por defecto solo localhost.
+        port: Puerto (0 para uno libre).
+        api: LocalApi a servir (por defecto, sobre los servicios de la app).
+    Returns:
+        El HttpServer ya escuchando.
+    Raises:
+        OSError: Si no se pudo escuchar en el puerto (ej. ya está en uso).
+    """
+    own_api = api is None
+    api = api or LocalApi()
+    # El método ligado retiene la API: el bus de cambios solo guarda una referencia débil.
+    server = HttpServer(api.handle, host, port)
+    try:
+        await server.start()
+    except Exception:
+        if own_api:
+            # Sin servidor, la API no debe seguir escuchando commits ni el bus.
+            api.close()
+        raise
+    return server
+
+
+_shared_start: Optional[asyncio.Future] = None
+
+
+async def start_shared_local_api() -> Optional[HttpServer]:
+    """
+    Inicia (una vez por proceso) la API local de la app si GEMTRACK_API_PORT está
+    definido. En modo web cada sesión de Flet llama a esta función; solo la
+    primera crea el servidor y las demás reciben el mismo.
+    Returns:
+        El servidor compartido, o None si la API está desactivada o no pudo iniciarse.
+    Raises:
+        OSError, ValueError: Solo a quien lanzó el inicio, si falló.
+    """
+    global _shared_start
+    port = os.environ.get("GEMTRACK_API_PORT")
+    if not port:
+        return None
+    if _shared_start is None:
+        _shared_start = asyncio.ensure_future(start_local_api(port=int(port)))
+        return await asyncio.shield(_shared_start)
+    try:
+        return await asyncio.shield(_shared_start)
+    except Exception:
+        # El error ya se informó a la sesión que inició la API.
+        return None
@@ -39,7 +39,11 @@ class InventoryProductCard(ft.Card):
         # ¡CAMBIO CLAVE! Lógica para mostrar las categorías.
         # Unimos los nombres de todas las categorías en la lista con una coma.
         # Si no hay categorías, mostramos "N/A".
-        categories_text = ", ".join([cat.name for cat in product.categories]) if product.categories else "Sin categoría"
+        # Acepta tanto un Product como una fila ligera con 'category_names' (snapshot del inventario).
+        category_names = getattr(product, "category_names", None)
+        if category_names is None:
+            category_names = [cat.name for cat in product.categories] if product.categories else []
+        categories_text = ", ".join(category_names) if category_names else "Sin categoría"
 
         self.content = ft.Container(
             content=ft.Row(
@@ -0,0 +1,98 @@
+# components/query_stats_overlay.py
+import flet as ft
+
+from core.update_scheduler import get_scheduler
+from data.query_stats import QueryStats, query_stats
+
+
+class QueryStatsOverlay(ft.Container):
+    """
+    Panel de depuración (en page.overlay) con las estadísticas de SQL por acción
+    del controlador: invocaciones, sentencias por invocación, tiempo total y
+    sospechas de N+1. Se muestra/oculta con toggle() (Ctrl+Shift+Q en main2.py).
+    """
+
+    def __init__(self, page: ft.Page, stats: QueryStats = query_stats):
+        super().__init__(
+            visible=False,
+            right=8,
+            top=8,
+            width=420,
+            padding=10,
+            border_radius=8,
+            bgcolor=ft.Colors.with_opacity(0.92, ft.Colors.GREY_900),
+        )
+        self.stats = stats
+        self.scheduler = get_scheduler(page)
+        self.status_text = ft.Text("", size=11, color=ft.Colors.GREY_400)
+        self.rows_column = ft.Column(spacing=6, height=420, scroll=ft.ScrollMode.AUTO)
+        self.content = ft.Column(
+            [
+                ft.Row(
+                    [
+                        ft.Text("Consultas SQL por acción", weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+                        ft.Row(
+                            [
+                                ft.IconButton(ft.Icons.REFRESH, icon_color=ft.Colors.WHITE, tooltip="Actualizar",
+                                              on_click=lambda e: self.refresh()),
+                                ft.IconButton(ft.Icons.SAVE, icon_color=ft.Colors.WHITE, tooltip="Guardar JSON",
+                                              on_click=self._on_dump_click),
+                                ft.IconButton(ft.Icons.DELETE_SWEEP, icon_color=ft.Colors.WHITE, tooltip="Reiniciar",
+                                              on_click=self._on_reset_click),
+                                ft.IconButton(ft.Icons.CLOSE, icon_color=ft.Colors.WHITE, tooltip="Cerrar",
+                                              on_click=lambda e: self.toggle()),
+                            ],
+                            spacing=0,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                ),
+                self.status_text,
+                self.rows_column,
+            ],
+            tight=True,
+        )
+
+    def toggle(self):
+        """Muestra u oculta el panel; al mostrarlo, recarga los datos."""
+        self.visible = not self.visible
+        if self.visible:
+            self.refresh()
+        else:
+            self.scheduler.mark_dirty(self)
+
+    def refresh(self):
+        """Reconstruye las filas a partir del reporte actual."""
+        report = self.stats.report()
+        self.rows_column.controls = [self._action_row(action) for action in report["actions"]] or [
+            ft.Text("Sin consultas registradas.", color=ft.Colors.GREY_400)
+        ]
+        self.status_text.value = f"{len(report['actions'])} acciones · umbral N+1: {report['n_plus_one_threshold']}"
+        self.scheduler.mark_dirty(self)
+
+    @staticmethod
+    def _action_row(action: dict) -> ft.Control:
+        suspects = action["n_plus_one_suspects"]
+        lines = [
+            ft.Text(action["action"], color=ft.Colors.WHITE, size=12, weight=ft.FontWeight.W_500),
+            ft.Text(
+                f"{action['runs']} llamadas · {action['statements_per_run']} sentencias/llamada "
+                f"(máx. {action['max_statements_per_run']}) · {action['total_ms']} ms",
+                color=ft.Colors.GREY_400, size=11,
+            ),
+        ]
+        for suspect in suspects:
+            lines.append(ft.Text(
+                f"N+1 ×{suspect['max_repeats_per_run']}: {suspect['sql'][:120]}",
+                color=ft.Colors.ORANGE_300, size=10,
+            ))
+        return ft.Container(ft.Column(lines, spacing=2, tight=True), padding=ft.padding.only(bottom=4))
+
+    def _on_dump_click(self, e):
+        path = self.stats.dump()
+        self.status_text.value = f"Reporte guardado en {path}" if path else "No se pudo guardar el reporte."
+        self.scheduler.mark_dirty(self.status_text)
+
+    def _on_reset_click(self, e):
+        self.stats.reset()
+        self.refresh()
@@ -1,6 +1,6 @@
 # controllers/inventory_controller.py
 import flet as ft
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import logging # Importar el módulo logging
 
 # Importamos el servicio de productos
@@ -9,11 +9,20 @@ from services.supplier_service import SupplierService
 
 # Importamos el modelo Product (para tipado y quizás para pasar objetos completos)
 from data.models.product_models import Product
-from data.models.supplier_models import Supplier
+from data.read_models import SupplierSummary
+from data.utils import parse_price
+# Scheduler que agrupa las actualizaciones de la página
+from core.update_scheduler import get_scheduler
+# Snapshot de la lista de inventario (stale-while-revalidate)
+from services.inventory_snapshot import InventoryRow, InventorySnapshot, inventory_snapshot_cache
+# Agrupa las sentencias SQL por acción del controlador (estadísticas y detección de N+1)
+from data.query_stats import tracked_action
+from core.logging_config import SampledLogger
 
+logger = logging.getLogger(__name__)
+# La búsqueda se dispara con cada tecla: como mucho un registro por segundo.
+search_log = SampledLogger(logger, interval=1.0)
 
-# Configurar el logger para este módulo
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class InventoryController:
     """
@@ -21,25 +30,27 @@ class InventoryController:
     Actúa como intermediario entre la vista de inventario (UI) y el servicio de productos (lógica de negocio).
     """
     def __init__(self, page: ft.Page):
-        logging.info("Iniciando constructor de InventoryController.")
+        logger.info("Iniciando constructor de InventoryController.")
         self.page = page
+        # Todas las actualizaciones de UI pasan por el scheduler compartido de la página.
+        self.scheduler = get_scheduler(page)
 
         try:
             self.product_service = ProductService()
             self.supplier_service = SupplierService()
-            logging.info("ProductService y SupplierService inicializados en InventoryController.")
+            logger.info("ProductService y SupplierService inicializados en InventoryController.")
         except Exception as e:
-            logging.error(f"Error al inicializar servicios en InventoryController: {e}", exc_info=True)
+            logger.error("Error al inicializar servicios en InventoryController: %s", e, exc_info=True)
             raise # lanzar la excepción para que la vista pueda manejarla
 
         self.product_list_view = None # Se asignará cuando la vista lo proporcione
-        # ¡CAMBIO IMPORTANTE! Renombrar para mayor claridad
-        self.view = None
+        # Vista de inventario (la asigna set_view); None en los formularios.
+        self.inventory_view = None
 
     # ¡CAMBIO IMPORTANTE! Renombrar para mayor claridad
     def set_view(self, view):
         """Establece una referencia a la vista de inventario para poder actualizarla."""
-        logging.info("Referencia a InventoryView establecida en el controlador.")
+        logger.info("Referencia a InventoryView establecida en el controlador.")
         self.inventory_view = view
 
     def set_product_list_view(self, product_list_view_control: ft.Control):
@@ -47,34 +58,106 @@ class InventoryController:
         Permite al controlador tener una referencia al control de la lista de productos en la UI,
         para poder actualizarla.
         """
-        logging.info("Referencia a product_list_view establecida en InventoryController.")
+        logger.info("Referencia a product_list_view establecida en InventoryController.")
         self.product_list_view = product_list_view_control
 
+    @tracked_action()
     async def load_products(self) -> List[Product]:
         """
         Carga todos los productos desde el servicio y los devuelve.
         Este método será llamado por la vista para poblar la lista.
         """
-        logging.info("Cargando productos desde el servicio.")
+        logger.info("Cargando productos desde el servicio.")
         try:
             products = await self.product_service.get_products_list()
-            logging.info(f"Productos cargados exitosamente: {len(products)}.")
+            logger.info("Productos cargados exitosamente: %s.", len(products))
             return products
         except Exception as e:
-            logging.error(f"Error al cargar productos en InventoryController: {e}", exc_info=True)
+            logger.error("Error al cargar productos en InventoryController: %s", e, exc_info=True)
             self._show_snackbar(f"Error al cargar productos: {e}", ft.Colors.RED_500)
             return []
 
+    def get_cached_inventory(self) -> Optional[InventorySnapshot]:
+        """
+        Devuelve la última lista de inventario conocida (memoria o disco), para
+        pintarla al instante mientras se revalida en segundo plano.
+        """
+        return inventory_snapshot_cache.get()
+
+    @tracked_action()
+    async def stream_inventory_rows(self, first_chunk_size: int = 20, chunk_size: int = 100) -> AsyncIterator[List[InventoryRow]]:
+        """
+        Entrega la proyección de tarjetas (InventoryRow) por bloques y al terminar
+        guarda la lista completa como nuevo snapshot.
+        """
+        # La firma se toma ANTES de leer: si alguien escribe durante la carga,
+        # la próxima revalidación lo detectará.
+        generation = self.product_service.get_data_generation()
+        signature = await self.product_service.get_list_signature()
+        rows: List[InventoryRow] = []
+        try:
+            # Proyección de tarjetas: sin entidades ORM ni consultas extra de relaciones.
+            async for chunk in self.product_service.stream_product_cards(first_chunk_size, chunk_size):
+                rows.extend(chunk)
+                yield chunk
+        except Exception as e:
+            logger.error("Error al cargar productos por bloques en InventoryController: %s", e, exc_info=True)
+            self._show_snackbar(f"Error al cargar productos: {e}", ft.Colors.RED_500)
+            raise
+        logger.info("Productos cargados por bloques exitosamente: %s.", len(rows))
+        await self._store_inventory_snapshot(rows, signature, generation)
+
+    @tracked_action()
+    async def revalidate_inventory(self, snapshot: InventorySnapshot) -> Optional[List[InventoryRow]]:
+        """
+        Comprueba si el snapshot sigue vigente comparando la firma de la tabla y la
+        generación de escrituras del proceso.
+        Returns:
+            None si nada cambió; si cambió, la lista fresca de InventoryRow (ya guardada como snapshot).
+        """
+        generation = self.product_service.get_data_generation()
+        signature = await self.product_service.get_list_signature()
+        same_generation = snapshot.generation is None or snapshot.generation == generation
+        if signature == snapshot.signature and same_generation:
+            logger.info("Snapshot del inventario vigente; no se recarga la lista.")
+            return None
+
+        logger.info("El inventario cambió desde el último snapshot; recargando en segundo plano.")
+        return await self._reload_inventory(signature, generation)
+
+    @tracked_action()
+    async def refresh_inventory(self) -> List[InventoryRow]:
+        """
+        Vuelve a leer la lista completa del inventario (ej. cuando otro proceso
+        escribió en la base de datos) y la guarda como nuevo snapshot.
+        """
+        generation = self.product_service.get_data_generation()
+        signature = await self.product_service.get_list_signature()
+        return await self._reload_inventory(signature, generation)
+
+    async def _reload_inventory(self, signature, generation: int) -> List[InventoryRow]:
+        rows = await self.product_service.get_product_cards()
+        await self._store_inventory_snapshot(rows, signature, generation)
+        return rows
+
+    async def _store_inventory_snapshot(self, rows: List[InventoryRow], signature, generation: int):
+        inventory_snapshot_cache.store(InventorySnapshot(rows, signature, generation))
+        try:
+            await inventory_snapshot_cache.persist()
+        except Exception as e:
+            logger.warning("No se pudo persistir el snapshot del inventario: %s", e)
+
+    @tracked_action()
     async def add_product_clicked(self, e: ft.ControlEvent, product_data: Dict[str, Any]):
         """
         Maneja la creación de un producto Y la respuesta a la UI.
         """
-        logging.info("Evento add_product_clicked recibido.")
+        logger.info("Evento add_product_clicked recibido.")
         try:
             # Validaciones básicas de entrada (ej. que no estén vacíos campos críticos)
             if not product_data.get("name") or not product_data.get("sku"):
                 self._show_snackbar("Nombre y SKU son obligatorios.", ft.Colors.AMBER_500)
-                logging.warning("Validación fallida: Nombre o SKU vacíos al agregar producto.")
+                logger.warning("Validación fallida: Nombre o SKU vacíos al agregar producto.")
                 return
 
             # ¡CORRECCIÓN!
@@ -85,7 +168,7 @@ class InventoryController:
             # ¡CAMBIO! Ya no mostramos el SnackBar aquí. La vista lo hará.
             self._show_snackbar(f"Producto '{new_product.name}' agregado exitosamente!", ft.Colors.GREEN_500)
 
-            logging.info(f"Producto '{new_product.name}' agregado exitosamente.")
+            logger.info("Producto '%s' agregado exitosamente.", new_product.name)
 
             # Navegar de vuelta a la lista de inventario DESDE el controlador.
             self.page.go("/inventory")
@@ -94,76 +177,158 @@ class InventoryController:
             return new_product
         except ValueError as ve:
             # Manejar errores de validación (como SKU duplicado)
-            logging.warning(f"Error de validación al agregar producto: {ve}")
+            logger.warning("Error de validación al agregar producto: %s", ve)
             self._show_snackbar(f"Error: {ve}", ft.Colors.RED_500)
             return None
         except Exception as ex:
             # Manejar otros errores inesperados
-            logging.error(f"Error inesperado al agregar producto: {ex}", exc_info=True)
+            logger.error("Error inesperado al agregar producto: %s", ex, exc_info=True)
             self._show_snackbar(f"Error inesperado: {ex}", ft.Colors.RED_500)
             return None
         finally:
-            self.page.update()
+            self.scheduler.mark_dirty()
 
+    @tracked_action()
     async def update_product_clicked(self, e: ft.ControlEvent, product_id: int, new_data: Dict[str, Any]):
         """
         Maneja el evento de clic del botón "Actualizar Producto".
         Recibe el ID del producto y los datos actualizados del formulario.
+        Primero se validan los datos (SKU libre, stock y precio no negativos): si
+        no son válidos el usuario sigue en el formulario con lo que escribió.
+        Con datos válidos la edición es optimista: la fila del snapshot se parchea
+        y se navega al inventario de inmediato (la tarjeta ya aparece editada); la
+        escritura sigue en segundo plano y, si falla, la tarjeta vuelve a su estado anterior.
+        Returns:
+            El producto actualizado, o None si la validación o la escritura fallaron.
         """
-        logging.info(f"Evento update_product_clicked recibido para ID: {product_id}.")
+        logger.info("Evento update_product_clicked recibido para ID: %s.", product_id)
         try:
-            updated_product = await self.product_service.update_existing_product(product_id, new_data)
-            # ¡LÓGICA DE RESPUESTA AHORA AQUÍ!
-            logging.info(f"Producto '{updated_product.name}' actualizado. Navegando a /inventory.")
-            self._show_snackbar(f"Producto '{updated_product.name}' actualizado exitosamente!", ft.Colors.GREEN_500)
+            new_data = self._form_numbers(new_data)
+            await self.product_service.validate_product_update(product_id, new_data)
+        except ValueError as ve:
+            logger.warning("Error de validación al actualizar producto: %s", ve)
+            self._show_snackbar(f"Error de validación: {ve}", ft.Colors.RED_500)
+            self.scheduler.mark_dirty()
+            return None
+        except Exception as ex:
+            logger.error("Error inesperado al validar producto: %s", ex, exc_info=True)
+            self._show_snackbar(f"Error inesperado: {ex}", ft.Colors.RED_500)
+            self.scheduler.mark_dirty()
+            return None
 
-            self.page.go("/inventory")
+        undo = None
+        snapshot = inventory_snapshot_cache.get()
+        current = next((row for row in snapshot.rows if row.id == product_id), None) if snapshot else None
+        if current is not None:
+            undo = inventory_snapshot_cache.replace_row(product_id, self._edited_row(current, new_data))
+        self.page.go("/inventory")
+
+        try:
+            # Ya validado arriba: no se repiten las consultas de existencia y SKU.
+            updated_product = await self.product_service.update_existing_product(product_id, new_data, validate=False)
+            logger.info("Producto '%s' actualizado.", updated_product.name)
+            self._show_snackbar(f"Producto '{updated_product.name}' actualizado exitosamente!", ft.Colors.GREEN_500)
+            return updated_product
         except ValueError as ve:
             self._show_snackbar(f"Error de validación: {ve}", ft.Colors.RED_500)
-            logging.warning(f"Error de validación al actualizar producto: {ve}")
+            logger.warning("Error de validación al actualizar producto: %s", ve)
         except Exception as ex:
-            logging.error(f"Error inesperado al actualizar producto: {ex}", exc_info=True)
+            logger.error("Error inesperado al actualizar producto: %s", ex, exc_info=True)
             self._show_snackbar(f"Error inesperado: {ex}", ft.Colors.RED_500)
 
-        self.page.update()
+        # La escritura falló: se revierte el snapshot y la tarjeta que ya está en pantalla.
+        if undo is not None:
+            inventory_snapshot_cache.restore_row(undo)
+            view = self._visible_inventory_view()
+            if view is not None:
+                view.patch_product_row(undo[1])
+        return None
+
+    @staticmethod
+    def _form_numbers(new_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copia de los datos del formulario con precio y stock convertidos a número
+        (los campos de texto llegan como cadenas). Un campo vacío no se modifica.
+        Raises:
+            ValueError: Si el precio o el stock no son números válidos.
+        """
+        data = dict(new_data)
+        for field, convert in (("suggested_price", parse_price), ("buying_price", parse_price), ("stock", int)):
+            value = data.get(field)
+            if not isinstance(value, str):
+                continue
+            if not value.strip():
+                del data[field]
+                continue
+            try:
+                data[field] = convert(value.strip())
+            except ValueError:
+                raise ValueError("Por favor, introduce números válidos para precios y stock.")
+        return data
+
+    @staticmethod
+    def _edited_row(row: InventoryRow, new_data: Dict[str, Any]) -> InventoryRow:
+        """Fila de tarjeta con los datos del formulario (las categorías las confirma la revalidación)."""
+        try:
+            stock = int(new_data["stock"])
+        except (KeyError, TypeError, ValueError):
+            stock = row.stock
+        return row._replace(
+            name=new_data.get("name") or row.name,
+            stock=stock,
+            image_path=new_data.get("image_path") or new_data.get("image_url") or row.image_path,
+        )
+
+    def _visible_inventory_view(self):
+        """La vista de inventario en pantalla (la propia o la que se abrió al navegar), si hay una."""
+        if self.inventory_view is not None:
+            return self.inventory_view
+        return next((view for view in reversed(self.page.views) if hasattr(view, "patch_product_row")), None)
 
+    @tracked_action()
     async def delete_product_clicked(self, e: ft.ControlEvent, product_id: int):
         """
         Maneja la lógica de eliminación de un producto, incluyendo un diálogo de confirmación.
         """
-        logging.info(f"Solicitud para eliminar producto con ID: {product_id}")
+        logger.info("Solicitud para eliminar producto con ID: %s", product_id)
 
         # Función que se ejecutará si el usuario confirma la eliminación.
+        # Eliminación optimista: la tarjeta desaparece en el mismo update que cierra
+        # el diálogo (sin recargar el catálogo) y la escritura corre después; si
+        # falla, la tarjeta vuelve a su lugar y se muestra el error.
+        @tracked_action("InventoryController.delete_product_confirmed")
         async def handle_delete_confirm(e_confirm):
+            confirm_dialog.open = False
+            view = self._visible_inventory_view()
+            removed_card = view.remove_product_card(product_id) if view is not None else None
+            removed_row = inventory_snapshot_cache.replace_row(product_id, None)
+            self.scheduler.mark_dirty()
+
             try:
-                # 1. Llamar al servicio para eliminar el producto
                 success = await self.product_service.remove_product(product_id)
-
                 if success:
                     self._show_snackbar(f"Producto eliminado exitosamente.")
-                    logging.info(f"Producto con ID {product_id} eliminado de la DB.")
-
-                    # 2. Actualizar la vista de inventario para reflejar el cambio
-                    if self.view:
-                        # Usamos run_task para no bloquear el hilo de la UI
-                        self.page.run_task(self.view.load_data)
-                else:
-                    self._show_snackbar("Error: No se pudo encontrar el producto a eliminar.", ft.Colors.RED)
-                    logging.warning(f"No se encontró el producto con ID {product_id} para eliminar.")
-
+                    logger.info("Producto con ID %s eliminado de la DB.", product_id)
+                    return
+                # Ya no estaba en la DB: la tarjeta quitada refleja el estado real.
+                self._show_snackbar("Error: No se pudo encontrar el producto a eliminar.", ft.Colors.RED)
+                logger.warning("No se encontró el producto con ID %s para eliminar.", product_id)
+                return
             except Exception as ex:
                 self._show_snackbar(f"Error crítico al eliminar: {ex}", ft.Colors.RED)
-                logging.error(f"Error al eliminar producto {product_id}: {ex}", exc_info=True)
+                logger.error("Error al eliminar producto %s: %s", product_id, ex, exc_info=True)
 
-            # Cerrar el diálogo de confirmación
-            confirm_dialog.open = False
-            self.page.update()
+            # La escritura no se hizo: se deshace el cambio optimista.
+            if removed_card is not None:
+                view.restore_product_card(removed_card)
+            if removed_row is not None:
+                inventory_snapshot_cache.restore_row(removed_row)
 
         # Función que se ejecutará si el usuario cancela.
         def handle_delete_cancel(e_cancel):
             confirm_dialog.open = False
-            self.page.update()
-            logging.info(f"Eliminación del producto {product_id} cancelada por el usuario.")
+            self.scheduler.mark_dirty()
+            logger.info("Eliminación del producto %s cancelada por el usuario.", product_id)
 
         # Crear el diálogo de confirmación
         confirm_dialog = ft.AlertDialog(
@@ -180,52 +345,55 @@ class InventoryController:
         # Abrir el diálogo
         self.page.dialog = confirm_dialog
         confirm_dialog.open = True
-        self.page.update()
+        self.scheduler.mark_dirty()
 
+    @tracked_action()
     async def search_products_changed(self, e: ft.ControlEvent):
         """
         Maneja el evento de cambio en el campo de búsqueda de productos.
         """
         query = e.control.value
-        logging.info(f"Evento search_products_changed recibido. Query: '{query}'.")
+        search_log.info("Evento search_products_changed recibido. Query: %r.", query)
         try:
-            # El servicio de productos ya filtra por productos, aunque use global_search_db
-            found_products = await self.product_service.search_products(query)
+            found_products = await self.product_service.search_product_cards(query)
             # Actualizar la UI con los resultados de la búsqueda
             if self.product_list_view:
                 await self.product_list_view.update_list(found_products) # Asume que la vista tiene este método
-                logging.info(f"Lista de productos actualizada con {len(found_products)} resultados de búsqueda.")
+                search_log.info("Lista de productos actualizada con %s resultados de búsqueda.", len(found_products))
             else:
-                logging.warning("product_list_view no está asignado en el controlador durante la búsqueda.")
+                logger.warning("product_list_view no está asignado en el controlador durante la búsqueda.")
         except Exception as ex:
             self._show_snackbar(f"Error al buscar productos: {ex}", ft.Colors.RED_500)
-            logging.error(f"Error al buscar productos: {ex}", exc_info=True)
+            logger.error("Error al buscar productos: %s", ex, exc_info=True)
 
     async def _refresh_product_list(self):
         """
         Método interno para recargar la lista de productos en la UI.
         """
-        logging.info("Refrescando lista de productos.")
+        logger.info("Refrescando lista de productos.")
         if self.product_list_view:
-            products = await self.load_products()
-            await self.product_list_view.update_list(products) # Asume que la vista tiene este método
-            logging.info("Lista de productos refrescada.")
+            rows = await self.product_service.get_product_cards()
+            await self.product_list_view.update_list(rows) # Asume que la vista tiene este método
+            logger.info("Lista de productos refrescada.")
         else:
-            logging.warning("product_list_view no está asignado en el controlador durante el refresco.")
+            logger.warning("product_list_view no está asignado en el controlador durante el refresco.")
 
     def _show_snackbar(self, message: str, color: str = ft.Colors.BLUE_500):
         """
         Muestra un SnackBar en la página de Flet.
         """
-        logging.info(f"Mostrando SnackBar: '{message}' con color {color}.")
+        logger.debug("Mostrando SnackBar: %r con color %s.", message, color)
         self.page.snack_bar = ft.SnackBar(
             ft.Text(message, color=ft.Colors.WHITE), # Asegurar que el texto del snackbar sea blanco
             bgcolor=color,
             open=True
         )
         self.page.snack_bar.open = True
-        self.page.update()
+        # No actualizamos aquí directamente: si el manejador también navega o
+        # cierra un diálogo, todo se envía en un único update.
+        self.scheduler.mark_dirty()
 
+    @tracked_action()
     async def get_product_details(self, product_id: int) -> Optional[Product]:
         """
         Obtiene los detalles de un producto específico por su ID.
@@ -234,69 +402,73 @@ class InventoryController:
         Returns:
             La instancia de Product si se encuentra, de lo contrario None.
         """
-        logging.info(f"Obteniendo detalles del producto con ID: {product_id}.")
+        logger.info("Obteniendo detalles del producto con ID: %s.", product_id)
         try:
             product = await self.product_service.get_product_by_id(product_id)
             if product:
-                logging.info(f"Producto encontrado: {product.name}.")
+                logger.info("Producto encontrado: %s.", product.name)
             else:
-                logging.warning(f"Producto con ID {product_id} no encontrado.")
+                logger.warning("Producto con ID %s no encontrado.", product_id)
             return product
         except Exception as e:
-            logging.error(f"Error al obtener detalles del producto ID {product_id}: {e}", exc_info=True)
+            logger.error("Error al obtener detalles del producto ID %s: %s", product_id, e, exc_info=True)
             self._show_snackbar(f"Error al obtener detalles del producto: {e}", ft.Colors.RED_500)
             return None
 
-    async def get_all_suppliers(self) -> List[Supplier]:
+    @tracked_action()
+    async def get_all_suppliers(self) -> List[SupplierSummary]:
         """
         Obtiene la lista de todos los proveedores desde el SupplierService.
-        Este método es llamado por la vista del formulario para poblar el dropdown.
+        Este método es llamado por la vista del formulario para poblar el dropdown,
+        que solo necesita id y nombre: se devuelven resúmenes, no entidades.
         """
-        logging.info("Controlador obteniendo la lista de proveedores.")
+        logger.info("Controlador obteniendo la lista de proveedores.")
         try:
-            return await self.supplier_service.get_all_suppliers()
+            return await self.supplier_service.get_supplier_summaries()
         except Exception as e:
-            logging.error(f"Error al obtener proveedores en InventoryController: {e}", exc_info=True)
+            logger.error("Error al obtener proveedores en InventoryController: %s", e, exc_info=True)
             self._show_snackbar(f"Error al cargar proveedores: {e}", ft.Colors.RED_500)
             return []
 
     # ¡NUEVO!
+    @tracked_action()
     async def filter_products(self, filter_type: str):
         """
         Maneja la lógica de filtrado de productos y actualiza la vista.
         """
-        logging.info(f"Controlador aplicando filtro: {filter_type}")
+        logger.info("Controlador aplicando filtro: %s", filter_type)
         try:
             # La lógica de "scan" es diferente, la manejamos aquí
             if filter_type == "scan":
                 self._show_snackbar("Funcionalidad de escaneo pendiente.", ft.Colors.BLUE_GREY)
                 return
 
-            filtered_products = await self.product_service.get_products_by_filter(filter_type)
+            filtered_products = await self.product_service.get_product_cards_by_filter(filter_type)
             if self.product_list_view:
                 await self.product_list_view.update_list(filtered_products)
         except Exception as e:
-            logging.error(f"Error al filtrar productos: {e}", exc_info=True)
+            logger.error("Error al filtrar productos: %s", e, exc_info=True)
             self._show_snackbar(f"Error al aplicar filtro: {e}", ft.Colors.RED_500)
 
     # ¡NUEVO!
+    @tracked_action()
     async def search_products(self, query: str):
         """
-        Busca productos según un texto y actualiza la vista.
+        Busca productos según un texto y actualiza la vista con filas de tarjeta.
         Si la consulta está vacía, carga todos los productos.
         """
-        logging.info(f"Controlador buscando por: '{query}'")
+        search_log.info("Controlador buscando por: %r", query)
         try:
             if query:
-                results = await self.product_service.search_products(query)
+                results = await self.product_service.search_product_cards(query)
             else:
                 # Si la búsqueda está vacía, mostrar todos los productos
-                results = await self.product_service.get_products_list()
+                results = await self.product_service.get_product_cards()
 
             if self.product_list_view:
                 await self.product_list_view.update_list(results)
         except Exception as e:
-            logging.error(f"Error al buscar productos: {e}", exc_info=True)
+            logger.error("Error al buscar productos: %s", e, exc_info=True)
             self._show_snackbar(f"Error en la búsqueda: {e}", ft.Colors.RED_500)
 
 
@@ -0,0 +1,162 @@
+# core/change_bus.py
+"""
+Bus de eventos de cambio dentro del proceso.
+
+Los repositorios publican un ChangeEvent DESPUÉS de confirmar (commit) cada
+escritura: qué entidad, qué id, qué tipo de cambio y qué campos cambiaron con
+sus valores nuevos. Las vistas y caches se suscriben y aplican el cambio de
+forma incremental (parchear una tarjeta, quitar una fila) en lugar de volver
+a consultar la lista completa.
+
+Los manejadores se ejecutan en el hilo que publica (el event loop, en la app)
+y deben ser rápidos: solo tocar estado en memoria y marcar la UI como sucia.
+Un manejador que falla se registra y no afecta a los demás ni a la escritura.
+"""
+import logging
+import threading
+import weakref
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeKind(str, Enum):
+    """Tipo de cambio confirmado en la base de datos."""
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    # Otro proceso escribió en la base de datos: no se sabe qué cambió.
+    INVALIDATED = "invalidated"
+
+
+class ChangeEvent:
+    """
+    Cambio confirmado de una entidad.
+    entity: nombre de la entidad ("product", "client"...); None si afecta a todas.
+    entity_id: id del registro (None si no se conoce).
+    kind: ChangeKind.
+    values: campos que cambiaron con su valor nuevo (vacío en DELETED).
+    """
+    __slots__ = ("entity", "entity_id", "kind", "values")
+
+    def __init__(self, entity: Optional[str], entity_id: Any, kind: ChangeKind,
+                 values: Optional[Dict[str, Any]] = None):
+        self.entity = entity
+        self.entity_id = entity_id
+        self.kind = ChangeKind(kind)
+        self.values = dict(values or {})
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """Nombres de los campos que cambiaron."""
+        return frozenset(self.values)
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.entity}#{self.entity_id} {self.kind.value} {sorted(self.values)})"
+
+
+Handler = Callable[[ChangeEvent], Any]
+
+
+class ChangeBus:
+    """
+    Publicación/suscripción síncrona de ChangeEvent. Los métodos ligados
+    (ej. los de una vista) se guardan con referencia débil: una vista que se
+    descarta sin desuscribirse no queda retenida por el bus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (entidad o None para todas, referencia al manejador)
+        self._subscribers: List[Tuple[Optional[str], Callable[[], Optional[Handler]]]] = []
+        self.published = 0
+        self.delivered = 0
+        self.failed = 0
+
+    def subscribe(self, handler: Handler, entity: Optional[str] = None) -> Callable[[], None]:
+        """
+        Suscribe un manejador a los cambios de una entidad (o de todas).
+        Args:
+            handler: Función o método que recibe el ChangeEvent.
+            entity: Entidad a escuchar; None para todas.
+        Returns:
+            Una función que cancela la suscripción (idempotente).
+        """
+        if hasattr(handler, "__self__") and hasattr(handler, "__func__"):
+            ref = weakref.WeakMethod(handler)
+        else:
+            ref = lambda: handler
+        entry = (entity, ref)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                try:
+                    self._subscribers.remove(entry)
+                except ValueError:
+                    pass
+
+        return unsubscribe
+
+    def publish(self, event: ChangeEvent) -> int:
+        """
+        Entrega un evento a los suscriptores de su entidad (a todos si el
+        evento no tiene entidad).
+        Returns:
+            A cuántos manejadores se entregó.
+        """
+        handlers = []
+        with self._lock:
+            self.published += 1
+            alive = []
+            for entry in self._subscribers:
+                handler = entry[1]()
+                if handler is None:
+                    # El dueño del método ya no existe.
+                    continue
+                alive.append(entry)
+                if entry[0] is None or event.entity is None or entry[0] == event.entity:
+                    handlers.append(handler)
+            self._subscribers = alive
+
+        delivered = 0
+        for handler in handlers:
+            try:
+                handler(event)
+                delivered += 1
+            except Exception as e:
+                logger.error("Error en un suscriptor de %r: %s", event, e, exc_info=True)
+                with self._lock:
+                    self.failed += 1
+        with self._lock:
+            self.delivered += delivered
+        logger.debug("%r entregado a %s suscriptores.", event, delivered)
+        return delivered
+
+    def subscriber_count(self) -> int:
+        """Suscripciones vivas (para diagnóstico y pruebas)."""
+        with self._lock:
+            return sum(1 for _, ref in self._subscribers if ref() is not None)
+
+
+# Bus compartido por todo el proceso.
+change_bus = ChangeBus()
+
+
+def publish_change(entity: Optional[str], entity_id: Any, kind: ChangeKind,
+                   values: Optional[Dict[str, Any]] = None) -> ChangeEvent:
+    """
+    Publica en el bus compartido un cambio ya confirmado.
+    Args:
+        entity: Nombre de la entidad.
+        entity_id: Id del registro.
+        kind: Tipo de cambio.
+        values: Campos que cambiaron con su valor nuevo.
+    Returns:
+        El ChangeEvent publicado.
+    """
+    event = ChangeEvent(entity, entity_id, kind, values)
+    change_bus.publish(event)
+    return event
@@ -0,0 +1,149 @@
+# core/live_updates.py
+"""
+Cambios en vivo entre sesiones (modo web con varios usuarios).
+
+Todas las sesiones de la app comparten el proceso y la misma base SQLite. Cada
+cambio confirmado que llega al bus del proceso (core/change_bus.py) se difunde
+como un delta compacto por page.pubsub, en el tema CHANGES_TOPIC. Cada sesión
+lo recibe en su propio event loop y lo vuelve a publicar en su bus local
+(LiveUpdates.bus), donde están suscritas sus vistas: la sesión que escribió no
+ejecuta el trabajo de UI de las demás, y ninguna vuelve a consultar el catálogo.
+
+Formato del delta: (entidad, id, tipo, valores), con el tipo abreviado a una
+letra y solo los valores simples (texto, números, booleanos, None y tuplas de
+ellos); lo demás (ej. fechas) no viaja.
+"""
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from core.change_bus import ChangeBus, ChangeEvent, ChangeKind, Handler, change_bus
+
+logger = logging.getLogger(__name__)
+
+CHANGES_TOPIC = "gemtrack.changes"
+
+_KIND_CODES = {ChangeKind.CREATED: "c", ChangeKind.UPDATED: "u", ChangeKind.DELETED: "d",
+               ChangeKind.INVALIDATED: "i"}
+_CODE_KINDS = {code: kind for kind, code in _KIND_CODES.items()}
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+Delta = Tuple[str, Any, str, Dict[str, Any]]
+
+
+def _is_simple(value: Any) -> bool:
+    if isinstance(value, (tuple, list)):
+        return all(isinstance(item, _SIMPLE_TYPES) for item in value)
+    return isinstance(value, _SIMPLE_TYPES)
+
+
+def encode_delta(event: ChangeEvent) -> Delta:
+    """Convierte un ChangeEvent en el delta compacto que viaja por pubsub."""
+    values = {key: tuple(value) if isinstance(value, list) else value
+              for key, value in event.values.items() if _is_simple(value)}
+    return event.entity, event.entity_id, _KIND_CODES[event.kind], values
+
+
+def decode_delta(delta: Delta) -> ChangeEvent:
+    """Reconstruye el ChangeEvent de un delta recibido por pubsub."""
+    entity, entity_id, code, values = delta
+    return ChangeEvent(entity, entity_id, _CODE_KINDS[code], values)
+
+
+class LiveUpdates:
+    """
+    Receptor de deltas de una sesión: se suscribe al tema de cambios en el
+    pubsub de la página y publica cada cambio en `bus`, el bus local de la
+    sesión. Se cierra (sale del pubsub y del registro) cuando se cancela la
+    última suscripción, es decir, al desmontarse la última vista que lo usa;
+    Flet desmonta las vistas también al cerrar la sesión.
+    """
+
+    def __init__(self, page: Any):
+        # Referencia débil: _receivers tiene la página como clave débil y una
+        # referencia fuerte aquí la mantendría viva después de cerrar la sesión.
+        self._page = weakref.ref(page)
+        self.bus = ChangeBus()
+        self.received = 0
+        self.closed = False
+        page.pubsub.subscribe_topic(CHANGES_TOPIC, self._on_message)
+
+    @property
+    def page(self) -> Optional[Any]:
+        """La página, o None si ya se liberó."""
+        return self._page()
+
+    def subscribe(self, handler: Handler, entity: Optional[str] = None):
+        """
+        Suscribe un manejador (ej. de una vista) a los cambios que recibe esta sesión.
+        Returns:
+            Una función que cancela la suscripción; al cancelar la última, el receptor se cierra.
+        """
+        unsubscribe = self.bus.subscribe(handler, entity)
+
+        def release() -> None:
+            unsubscribe()
+            if self.bus.subscriber_count() == 0:
+                self.close()
+
+        return release
+
+    def close(self) -> None:
+        """Deja de recibir cambios y sale del registro de receptores (idempotente)."""
+        page = self.page
+        with _receivers_lock:
+            if self.closed:
+                return
+            self.closed = True
+            if page is not None and _receivers.get(page) is self:
+                del _receivers[page]
+        if page is not None:
+            page.pubsub.unsubscribe_topic(CHANGES_TOPIC)
+
+    async def _on_message(self, topic: str, delta: Delta) -> None:
+        self.received += 1
+        try:
+            event = decode_delta(delta)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Delta de cambios inválido, se ignora: %r (%s)", delta, e)
+            return
+        self.bus.publish(event)
+
+
+# Un receptor abierto por página (sesión).
+_receivers: "weakref.WeakKeyDictionary[Any, LiveUpdates]" = weakref.WeakKeyDictionary()
+_receivers_lock = threading.Lock()
+_unsubscribe_broadcast = None
+
+
+def _broadcast(event: ChangeEvent) -> None:
+    """Suscriptor del bus del proceso: difunde el cambio a todas las sesiones."""
+    with _receivers_lock:
+        # Las sesiones de una app comparten el hub de pubsub: basta con el cliente
+        # de una, la más reciente cuyo event loop siga abierto.
+        page = next((p for p, receiver in reversed(list(_receivers.items()))
+                     if not receiver.closed and not p.loop.is_closed()), None)
+    if page is None:
+        return
+    page.pubsub.send_all_on_topic(CHANGES_TOPIC, encode_delta(event))
+
+
+def get_live_updates(page: Any) -> LiveUpdates:
+    """
+    Obtiene (o crea) el receptor de cambios en vivo de una página; si el anterior
+    se cerró, crea uno nuevo. La primera llamada del proceso conecta el bus de
+    cambios con pubsub.
+    Args:
+        page: La página de Flet (una por sesión).
+    Returns:
+        El LiveUpdates de esa página.
+    """
+    global _unsubscribe_broadcast
+    with _receivers_lock:
+        receiver = _receivers.get(page)
+        if receiver is None:
+            receiver = _receivers[page] = LiveUpdates(page)
+        if _unsubscribe_broadcast is None:
+            _unsubscribe_broadcast = change_bus.subscribe(_broadcast)
+        return receiver
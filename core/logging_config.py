@@ -0,0 +1,189 @@
+# core/logging_config.py
+"""
+Configuración central del logging de GemTrack.
+
+Los módulos solo crean su logger (`logger = logging.getLogger(__name__)`) y
+registran con argumentos %-style (`logger.info("Cargados %d productos", n)`):
+el mensaje se formatea únicamente si el nivel está activo y, en ese caso, en
+el hilo escritor, no en el del event loop. setup_logging() instala en la raíz
+un QueueHandler que solo encola el registro; un QueueListener en su propio
+hilo lo formatea y lo escribe en consola (y en archivo si se pide).
+
+Niveles por subsistema (el primer componente del nombre del módulo: views,
+controllers, services, repos, data, core...) con GEMTRACK_LOG_LEVELS, ej.:
+    GEMTRACK_LOG_LEVELS="views=DEBUG,repos=WARNING"
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+DEFAULT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+# Registros pendientes como máximo; si el escritor se atrasa, se descartan en
+# lugar de bloquear al event loop.
+QUEUE_SIZE = 10_000
+
+# Niveles por defecto de cada subsistema (los de la app heredan el de la raíz).
+SUBSYSTEM_LEVELS: Dict[str, int] = {
+    "sqlalchemy": logging.WARNING,
+    "aiosqlite": logging.WARNING,
+    "flet": logging.WARNING,
+    "flet_core": logging.WARNING,
+    "asyncio": logging.WARNING,
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_setup_lock = threading.Lock()
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que registra (el listener vive en
+    el mismo proceso, así que el registro viaja tal cual con msg y args) y
+    que, con la cola llena, descarta en lugar de bloquear.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    """Convierte "views=DEBUG,repos=WARNING" en {"views": 10, "repos": 30}."""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if name and level:
+            value = logging.getLevelName(level)
+            if isinstance(value, int):
+                levels[name] = value
+    return levels
+
+
+def _skip_unused_record_fields(fmt: str) -> None:
+    """
+    Evita calcular en cada registro los campos que el formato no usa (la
+    optimización que documenta el módulo logging): la búsqueda del llamador
+    en la pila es lo más caro de crear un LogRecord en el hilo que registra.
+    """
+    if not any(field in fmt for field in ("%(pathname)", "%(filename)", "%(module)", "%(funcName)", "%(lineno)")):
+        logging._srcfile = None
+    if "%(thread" not in fmt:
+        logging.logThreads = False
+    if "%(process" not in fmt:
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+
+def setup_logging(level: Union[int, str, None] = None, levels: Optional[Dict[str, int]] = None,
+                  log_file: Optional[str] = None, fmt: str = DEFAULT_FORMAT) -> logging.handlers.QueueListener:
+    """
+    Configura el logging del proceso (idempotente: las llamadas siguientes
+    solo devuelven el listener ya iniciado).
+    Args:
+        level: Nivel de la raíz (por defecto GEMTRACK_LOG_LEVEL o INFO).
+        levels: Niveles por subsistema; se combinan con SUBSYSTEM_LEVELS y GEMTRACK_LOG_LEVELS.
+        log_file: Archivo adicional de salida (por defecto GEMTRACK_LOG_FILE, si existe).
+        fmt: Formato de los mensajes.
+    Returns:
+        El QueueListener que escribe los registros.
+    """
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = logging.Formatter(fmt)
+        handlers = [logging.StreamHandler(sys.stderr)]
+        log_file = log_file or os.environ.get("GEMTRACK_LOG_FILE")
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        _skip_unused_record_fields(fmt)
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(QUEUE_SIZE))
+        root = logging.getLogger()
+        # Reemplaza los handlers de un basicConfig previo: todo pasa por la cola.
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        root.setLevel(level or os.environ.get("GEMTRACK_LOG_LEVEL", "INFO").upper())
+
+        subsystem_levels = dict(SUBSYSTEM_LEVELS)
+        subsystem_levels.update(levels or {})
+        subsystem_levels.update(_parse_levels(os.environ.get("GEMTRACK_LOG_LEVELS", "")))
+        for name, subsystem_level in subsystem_levels.items():
+            logging.getLogger(name).setLevel(subsystem_level)
+
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging() -> None:
+    """Vacía la cola y detiene el hilo escritor (se llama también al salir)."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        if _queue_handler is not None and _queue_handler.dropped:
+            sys.stderr.write(f"logging: {_queue_handler.dropped} registros descartados con la cola llena\n")
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = _queue_handler = None
+
+
+class SampledLogger:
+    """
+    Envoltorio para eventos de alta frecuencia (cada tecla de la búsqueda,
+    cada redimensionamiento): cada plantilla de mensaje se registra como
+    máximo una vez por `interval` segundos; las ocurrencias omitidas se
+    informan en el siguiente registro que sí se escribe.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.logger = logger
+        self.interval = interval
+        self.clock = clock
+        # plantilla -> (último registro escrito, omitidos desde entonces)
+        self._state: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, msg: str, *args) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        now = self.clock()
+        with self._lock:
+            last, skipped = self._state.get(msg, (float("-inf"), 0))
+            if now - last < self.interval:
+                self._state[msg] = (last, skipped + 1)
+                return
+            self._state[msg] = (now, 0)
+        if skipped:
+            self.logger.log(level, msg + " (+%d similares omitidos)", *args, skipped)
+        else:
+            self.logger.log(level, msg, *args)
+
+    def debug(self, msg: str, *args) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args) -> None:
+        self.log(logging.INFO, msg, *args)
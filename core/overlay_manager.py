@@ -0,0 +1,151 @@
+# core/overlay_manager.py
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Clave del FilePicker compartido por todas las vistas de una página.
+FILE_PICKER_KEY = "file_picker"
+
+
+class OverlayManager:
+    """
+    Ciclo de vida de los controles de page.overlay de una página.
+    Cada navegación recrea la vista, y antes cada vista agregaba sus propios
+    FilePicker/BottomSheet al overlay sin quitarlos nunca: el overlay crecía
+    con cada visita y retenía las vistas viejas (sus manejadores las referencian).
+
+    - Compartidos (`shared`, `file_picker`): se registran una sola vez por
+      página; el FilePicker se reapunta al manejador de la vista que lo usa.
+    - De la vista (`attach`): se quitan del overlay al desmontar la vista
+      (`release`) o al cambiar de ruta (`release_except`).
+    """
+
+    def __init__(self, page: Any):
+        self.page = page
+        self._lock = threading.Lock()
+        self._shared: Dict[str, Any] = {}
+        # id(dueño) -> controles que agregó al overlay
+        self._owned: Dict[int, List[Any]] = {}
+        # Dueño actual de los manejadores de cada control compartido (clave -> id).
+        self._handler_owners: Dict[str, int] = {}
+
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Obtiene (o crea y agrega al overlay) un control compartido por todas las vistas.
+        Args:
+            key: Nombre del control compartido.
+            factory: Crea el control la primera vez.
+        Returns:
+            El mismo control en todas las llamadas con esa clave.
+        """
+        with self._lock:
+            control = self._shared.get(key)
+            if control is None:
+                control = self._shared[key] = factory()
+                self.page.overlay.append(control)
+                logger.debug("Overlay compartido '%s' registrado.", key)
+            return control
+
+    def file_picker(self, owner: Any, on_result: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        FilePicker compartido de la página. Con `on_result` el resultado del
+        próximo pick_files() se entrega a ese manejador (de `owner`).
+        Args:
+            owner: La vista que va a usar el picker.
+            on_result: Manejador del resultado.
+        Returns:
+            El FilePicker compartido.
+        """
+        import flet as ft
+
+        picker = self.shared(FILE_PICKER_KEY, ft.FilePicker)
+        if on_result is not None:
+            with self._lock:
+                picker.on_result = on_result
+                self._handler_owners[FILE_PICKER_KEY] = id(owner)
+        return picker
+
+    def attach(self, owner: Any, *controls: Any) -> None:
+        """
+        Agrega controles propios de una vista al overlay.
+        Args:
+            owner: La vista dueña; sus controles se quitan con release(owner).
+            controls: Controles a agregar (ej. un BottomSheet con manejadores de la vista).
+        """
+        with self._lock:
+            owned = self._owned.setdefault(id(owner), [])
+            for control in controls:
+                if control not in owned:
+                    owned.append(control)
+                    self.page.overlay.append(control)
+
+    def release(self, owner: Any) -> int:
+        """
+        Quita del overlay los controles de una vista y suelta los manejadores
+        compartidos que apuntaban a ella. Es idempotente.
+        Returns:
+            Cuántos controles se quitaron del overlay.
+        """
+        with self._lock:
+            return self._release(id(owner))
+
+    def release_except(self, owners: Iterable[Any]) -> int:
+        """
+        Libera todas las vistas que no estén en `owners` (las vistas montadas
+        tras un cambio de ruta), incluidas las que se crearon y nunca se montaron.
+        Returns:
+            Cuántos controles se quitaron del overlay.
+        """
+        keep = {id(owner) for owner in owners}
+        with self._lock:
+            stale = set(self._owned) | set(self._handler_owners.values())
+            return sum(self._release(owner_id) for owner_id in stale - keep)
+
+    def stats(self) -> Dict[str, int]:
+        """Tamaño del overlay y controles registrados, para diagnóstico y pruebas."""
+        with self._lock:
+            return {
+                "overlay": len(self.page.overlay),
+                "shared": len(self._shared),
+                "owned": sum(len(controls) for controls in self._owned.values()),
+                "owners": len(self._owned),
+            }
+
+    def _release(self, owner_id: int) -> int:
+        removed = 0
+        for control in self._owned.pop(owner_id, []):
+            if control in self.page.overlay:
+                self.page.overlay.remove(control)
+                removed += 1
+        for key, handler_owner in list(self._handler_owners.items()):
+            if handler_owner == owner_id:
+                self._shared[key].on_result = None
+                del self._handler_owners[key]
+        return removed
+
+
+# Un gestor por página (cada sesión de Flet tiene su propio overlay), guardado
+# en la propia página: el gestor y sus controles del overlay referencian la
+# página, así que en un registro global (aunque fuera de claves débiles) la
+# página de una sesión cerrada nunca se liberaría. Como atributo, página y
+# gestor forman un ciclo que el recolector libera junto.
+PAGE_ATTRIBUTE = "_gemtrack_overlays"
+_managers_lock = threading.Lock()
+
+
+def get_overlay_manager(page: Any) -> OverlayManager:
+    """
+    Obtiene (o crea) el OverlayManager asociado a una página.
+    Args:
+        page: La página de Flet.
+    Returns:
+        La instancia compartida por todas las vistas de esa página.
+    """
+    with _managers_lock:
+        manager = getattr(page, PAGE_ATTRIBUTE, None)
+        if manager is None:
+            manager = OverlayManager(page)
+            setattr(page, PAGE_ATTRIBUTE, manager)
+        return manager
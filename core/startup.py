@@ -0,0 +1,137 @@
+# core/startup.py
+import importlib
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """
+    Registra los hitos del arranque de la aplicación (imports, init_db,
+    primera ruta, primer pintado) en milisegundos desde el inicio del proceso.
+    El reporte se puede loguear y guardar como JSON para comparar entre versiones.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events: List[Dict[str, Any]] = []
+        self._marked = set()
+
+    def elapsed_ms(self) -> float:
+        """Milisegundos transcurridos desde el origen del timeline."""
+        return (time.perf_counter() - self._origin) * 1000
+
+    def mark(self, name: str, once: bool = False, **extra: Any) -> bool:
+        """
+        Registra un hito.
+        Args:
+            name: Nombre del hito (ej. "imports", "init_db", "first_route").
+            once: Si es True, solo se registra la primera vez (útil para "first_paint").
+            extra: Datos adicionales que se guardan junto al hito.
+        Returns:
+            True si el hito se registró, False si ya existía y once=True.
+        """
+        with self._lock:
+            if once and name in self._marked:
+                return False
+            self._marked.add(name)
+            event = {"name": name, "ms": round(self.elapsed_ms(), 2)}
+            event.update(extra)
+            self.events.append(event)
+        logger.debug("Startup: %s a los %s ms.", name, event['ms'])
+        return True
+
+    def has(self, name: str) -> bool:
+        """Indica si un hito ya fue registrado."""
+        return name in self._marked
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Construye el reporte del arranque.
+        Returns:
+            Un diccionario con metadatos del entorno y la lista de hitos.
+        """
+        with self._lock:
+            events = list(self.events)
+        return {
+            "release": os.environ.get("GEMTRACK_RELEASE", "dev"),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "events": events,
+        }
+
+    def log_report(self) -> None:
+        """Escribe el timeline en el log, un hito por línea."""
+        report = self.report()
+        lines = [f"  {e['ms']:>10.2f} ms  {e['name']}" for e in report["events"]]
+        body = "\n".join(lines)
+        logger.info("Timeline de arranque (%s):\n%s", report['release'], body)
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Añade el reporte como una línea JSON al archivo indicado (o al de la
+        variable de entorno GEMTRACK_STARTUP_LOG). Así cada arranque queda
+        guardado y se pueden comparar versiones.
+        Returns:
+            La ruta del archivo escrito, o None si no hay destino configurado.
+        """
+        path = path or os.environ.get("GEMTRACK_STARTUP_LOG")
+        if not path:
+            return None
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.report()) + "\n")
+            return path
+        except OSError as e:
+            logger.error("No se pudo guardar el timeline de arranque en %s: %s", path, e)
+            return None
+
+
+# Timeline compartido por todo el proceso. Se crea al importar este módulo,
+# por eso main2.py lo importa antes que cualquier otra cosa.
+timeline = StartupTimeline()
+
+
+def lazy_view(module_path: str, class_name: str) -> Callable[..., Any]:
+    """
+    Devuelve una fábrica que importa la clase de una vista solo la primera vez
+    que se instancia. Así las rutas se registran sin cargar controladores,
+    servicios, repositorios ni SQLAlchemy hasta que el usuario navega a ellas.
+    Args:
+        module_path: Ruta del módulo (ej. "views.inventory_view2").
+        class_name: Nombre de la clase de la vista dentro del módulo.
+    Returns:
+        Un callable que recibe los mismos argumentos que la vista y devuelve una instancia.
+    """
+    cache: Dict[str, type] = {}
+    lock = threading.Lock()
+
+    def load() -> type:
+        view_class = cache.get(class_name)
+        if view_class is not None:
+            return view_class
+        with lock:
+            if class_name not in cache:
+                start = time.perf_counter()
+                module = importlib.import_module(module_path)
+                cache[class_name] = getattr(module, class_name)
+                import_ms = round((time.perf_counter() - start) * 1000, 2)
+                timeline.mark(f"import:{module_path}", import_ms=import_ms)
+                logger.info("Vista %s importada bajo demanda en %s ms.", class_name, import_ms)
+            return cache[class_name]
+
+    def factory(*args: Any, **kwargs: Any) -> Any:
+        return load()(*args, **kwargs)
+
+    factory.load = load
+    return factory
@@ -0,0 +1,247 @@
+# core/task_manager.py
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import threading
+import time
+import weakref
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPriority(IntEnum):
+    """Orden en que arrancan las tareas que esperan un lugar (menor = antes)."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class TaskStats:
+    """Acumulado de las ejecuciones de una tarea (por nombre) dentro de una vista."""
+    __slots__ = ("name", "started", "completed", "cancelled", "failed", "total_ms", "max_ms", "wait_ms")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Tiempo en cola esperando un lugar por el límite de concurrencia.
+        self.wait_ms = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.completed + self.cancelled + self.failed
+        return {
+            "name": self.name,
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / finished, 2) if finished else 0,
+            "max_ms": round(self.max_ms, 2),
+            "wait_ms": round(self.wait_ms, 2),
+        }
+
+
+class TaskManager:
+    """
+    Tareas en segundo plano de una vista. Reemplaza a page.run_task() para
+    las corrutinas que escriben en los controles de la vista:
+
+    - close() (al desmontar la vista o cambiar de ruta) cancela todas las
+      pendientes y rechaza las nuevas, así una carga vieja no escribe en
+      controles que ya no están en pantalla.
+    - Como mucho `max_concurrent` tareas corren a la vez; el resto espera en
+      orden de prioridad (y de llegada, a igual prioridad).
+    - Con `key`, una tarea nueva cancela a la anterior con la misma clave
+      (ej. cada tecla de la búsqueda: solo importa el último resultado).
+    - Registra la duración, la espera en cola y el resultado de cada tarea.
+
+    run() y close() se pueden llamar desde cualquier hilo (Flet ejecuta los
+    manejadores síncronos en un executor); las tareas corren en el event loop.
+    """
+
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop, max_concurrent: int = 4):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent debe ser al menos 1")
+        self.name = name
+        self.loop = loop
+        self.max_concurrent = max_concurrent
+        self.closed = False
+        self._lock = threading.Lock()
+        self._futures: Dict[concurrent.futures.Future, str] = {}
+        self._keyed: Dict[str, concurrent.futures.Future] = {}
+        self._stats: Dict[str, TaskStats] = {}
+        self._seq = itertools.count()
+        # Solo se tocan desde el event loop: lugares ocupados y tareas en espera.
+        self._running = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+
+    def run(self, fn: Callable[..., Awaitable[Any]], *args: Any, name: Optional[str] = None,
+            priority: TaskPriority = TaskPriority.NORMAL, key: Optional[str] = None) -> concurrent.futures.Future:
+        """
+        Programa una corrutina en el event loop de la vista.
+        Args:
+            fn: Función async a ejecutar.
+            args: Argumentos de la función.
+            name: Nombre para las métricas (por defecto el de la función).
+            priority: Prioridad frente a otras tareas de la vista que esperan lugar.
+            key: Si se indica, cancela la tarea anterior con la misma clave.
+        Returns:
+            El Future de la tarea (cancelado de antemano si la vista ya se cerró).
+        """
+        name = name or getattr(fn, "__qualname__", repr(fn))
+        with self._lock:
+            if self.closed:
+                logger.debug("%s: tarea %s descartada, la vista ya se cerró.", self.name, name)
+                future = concurrent.futures.Future()
+                future.cancel()
+                return future
+            previous = self._keyed.get(key) if key is not None else None
+            future = asyncio.run_coroutine_threadsafe(
+                self._execute(fn, args, name, priority, next(self._seq)), self.loop)
+            self._futures[future] = name
+            if key is not None:
+                self._keyed[key] = future
+        if previous is not None and previous.cancel():
+            logger.debug("%s: tarea '%s' reemplazada por una más nueva.", self.name, key)
+        future.add_done_callback(lambda f: self._forget(f, key))
+        return future
+
+    def close(self) -> int:
+        """
+        Cancela todas las tareas de la vista y rechaza las nuevas. Es idempotente.
+        Returns:
+            Cuántas tareas seguían pendientes.
+        """
+        with self._lock:
+            self.closed = True
+            pending = list(self._futures)
+        cancelled = sum(1 for future in pending if future.cancel())
+        if cancelled:
+            logger.info("%s: %s tareas canceladas al cerrar la vista.", self.name, cancelled)
+        return cancelled
+
+    def pending(self) -> int:
+        """Tareas programadas que aún no terminaron (corriendo o en espera)."""
+        with self._lock:
+            return len(self._futures)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Métricas por tarea, las de mayor tiempo total primero."""
+        with self._lock:
+            stats = [s.to_dict() for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
+
+    def _forget(self, future: concurrent.futures.Future, key: Optional[str]) -> None:
+        with self._lock:
+            self._futures.pop(future, None)
+            if key is not None and self._keyed.get(key) is future:
+                del self._keyed[key]
+
+    def _task_stats(self, name: str) -> TaskStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = TaskStats(name)
+        return stats
+
+    async def _execute(self, fn: Callable[..., Awaitable[Any]], args: Tuple[Any, ...], name: str,
+                       priority: TaskPriority, seq: int) -> Any:
+        queued = time.perf_counter()
+        try:
+            await self._acquire(priority, seq)
+        except asyncio.CancelledError:
+            with self._lock:
+                stats = self._task_stats(name)
+                stats.cancelled += 1
+                stats.wait_ms += (time.perf_counter() - queued) * 1000
+            raise
+        start = time.perf_counter()
+        with self._lock:
+            stats = self._task_stats(name)
+            stats.started += 1
+            stats.wait_ms += (start - queued) * 1000
+        outcome = "failed"
+        try:
+            result = await fn(*args)
+            outcome = "completed"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            logger.error("%s: la tarea %s falló: %s", self.name, name, e, exc_info=True)
+            raise
+        finally:
+            self._release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                setattr(stats, outcome, getattr(stats, outcome) + 1)
+                stats.total_ms += elapsed_ms
+                stats.max_ms = max(stats.max_ms, elapsed_ms)
+            logger.debug("%s: tarea %s %s en %.1f ms.", self.name, name, outcome, elapsed_ms)
+
+    async def _acquire(self, priority: TaskPriority, seq: int) -> None:
+        """Espera un lugar libre; los lugares se entregan por prioridad y llegada."""
+        if self._running < self.max_concurrent and not self._waiters:
+            self._running += 1
+            return
+        waiter = self.loop.create_future()
+        heapq.heappush(self._waiters, (priority, seq, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Ya nos habían cedido el lugar: pasa a la siguiente en espera.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Cede el lugar a la siguiente tarea en espera (o lo libera)."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+
+# Un gestor por vista; se cierran al desmontar la vista o al cambiar de ruta.
+_managers: "weakref.WeakKeyDictionary[Any, TaskManager]" = weakref.WeakKeyDictionary()
+_managers_lock = threading.Lock()
+
+
+def get_task_manager(owner: Any, max_concurrent: int = 4) -> TaskManager:
+    """
+    Obtiene (o crea) el TaskManager de una vista.
+    Args:
+        owner: La vista dueña de las tareas (necesita `page` con su event loop).
+        max_concurrent: Tareas de la vista que pueden correr a la vez.
+    Returns:
+        El TaskManager de esa vista.
+    """
+    with _managers_lock:
+        manager = _managers.get(owner)
+        if manager is None:
+            name = f"{type(owner).__name__}({getattr(owner, 'route', None) or ''})"
+            manager = _managers[owner] = TaskManager(name, owner.page.loop, max_concurrent)
+        return manager
+
+
+def close_task_managers(owners: Iterable[Any]) -> int:
+    """
+    Cierra los TaskManager de las vistas indicadas (las que se reemplazan en un
+    cambio de ruta); las vistas sin tareas se ignoran.
+    Returns:
+        Cuántas tareas se cancelaron en total.
+    """
+    with _managers_lock:
+        managers = [_managers.get(owner) for owner in owners]
+    return sum(manager.close() for manager in managers if manager is not None)
@@ -0,0 +1,268 @@
+# core/ui_stats.py
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_SOURCE = "(desconocido)"
+UI_STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui_stats.json")
+
+# Módulos de la app cuyas funciones cuentan como "origen" de una actualización
+# (__main__ incluye los manejadores de main2.py, ej. route_change).
+_SOURCE_MODULES = ("views.", "components.", "controllers.", "__main__")
+
+
+class HandlerStats:
+    """Acumulado de las actualizaciones de una pantalla provocadas por un manejador."""
+    __slots__ = ("source", "updates", "total_ms", "max_ms", "controls", "max_controls", "payload_bytes",
+                 "coalesced")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.updates = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.controls = 0
+        self.max_controls = 0
+        self.payload_bytes = 0
+        # Peticiones de otros manejadores que el UpdateScheduler fusionó en estas actualizaciones.
+        self.coalesced = 0
+
+    def add(self, wall_ms: float, controls: int, payload_bytes: int, coalesced: int) -> None:
+        self.updates += 1
+        self.total_ms += wall_ms
+        self.max_ms = max(self.max_ms, wall_ms)
+        self.controls += controls
+        self.max_controls = max(self.max_controls, controls)
+        self.payload_bytes += payload_bytes
+        self.coalesced += coalesced
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "updates": self.updates,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.updates, 2) if self.updates else 0,
+            "max_ms": round(self.max_ms, 2),
+            "controls": self.controls,
+            "controls_per_update": round(self.controls / self.updates, 1) if self.updates else 0,
+            "max_controls": self.max_controls,
+            "payload_bytes": self.payload_bytes,
+            "payload_per_update": int(self.payload_bytes / self.updates) if self.updates else 0,
+            "coalesced": self.coalesced,
+        }
+
+
+class UiStats:
+    """
+    Colector de estadísticas de renderizado: por cada page.update() (directo,
+    vía control.update() o desde el UpdateScheduler) mide el tiempo de pared,
+    los controles que cambian y el tamaño aproximado del diff enviado al
+    cliente de Flet. Se agrupa por pantalla (page.route) y por manejador de
+    origen ("InventoryView.on_search_change", "InventoryController.load_products"...).
+
+    Se activa con la variable de entorno GEMTRACK_UI_STATS=1 (o enabled=True).
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get("GEMTRACK_UI_STATS") == "1"
+        self.enabled = enabled
+        # pantalla -> origen -> HandlerStats
+        self._screens: Dict[str, Dict[str, HandlerStats]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, screen: str, source: str, wall_ms: float, controls: int, payload_bytes: int,
+               coalesced: int = 0) -> None:
+        """Registra una actualización ya enviada al cliente."""
+        with self._lock:
+            handlers = self._screens.setdefault(screen, {})
+            stats = handlers.get(source)
+            if stats is None:
+                stats = handlers[source] = HandlerStats(source)
+            stats.add(wall_ms, controls, payload_bytes, coalesced)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Construye el reporte por pantalla.
+        Returns:
+            Un diccionario con las pantallas ordenadas por tiempo total de
+            actualización y, dentro de cada una, sus manejadores más caros primero.
+        """
+        with self._lock:
+            screens = {screen: [h.to_dict() for h in handlers.values()] for screen, handlers in self._screens.items()}
+        result = []
+        for screen, handlers in screens.items():
+            handlers.sort(key=lambda h: h["total_ms"], reverse=True)
+            updates = sum(h["updates"] for h in handlers)
+            total_ms = sum(h["total_ms"] for h in handlers)
+            controls = sum(h["controls"] for h in handlers)
+            payload = sum(h["payload_bytes"] for h in handlers)
+            result.append({
+                "screen": screen,
+                "updates": updates,
+                "total_ms": round(total_ms, 2),
+                "avg_ms": round(total_ms / updates, 2) if updates else 0,
+                "max_ms": max((h["max_ms"] for h in handlers), default=0),
+                "controls": controls,
+                "controls_per_update": round(controls / updates, 1) if updates else 0,
+                "payload_bytes": payload,
+                "payload_per_update": int(payload / updates) if updates else 0,
+                "handlers": handlers,
+            })
+        result.sort(key=lambda s: s["total_ms"], reverse=True)
+        return {"timestamp": datetime.now().isoformat(), "screens": result}
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Escribe el reporte en JSON (por defecto en GEMTRACK_UI_STATS_FILE o
+        core/ui_stats.json).
+        Returns:
+            La ruta del archivo escrito, o None si falló.
+        """
+        path = path or os.environ.get("GEMTRACK_UI_STATS_FILE") or UI_STATS_FILE
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            return path
+        except OSError as e:
+            logger.error("No se pudo guardar el reporte de renderizado en %s: %s", path, e)
+            return None
+
+    def reset(self) -> None:
+        """Descarta todo lo acumulado."""
+        with self._lock:
+            self._screens.clear()
+
+
+# Colector compartido por todo el proceso.
+ui_stats = UiStats()
+
+# Estado de la actualización en curso en este hilo: Flet arma y envía el diff
+# de forma síncrona dentro de page.update(), en el hilo que la llamó.
+_local = threading.local()
+
+
+def current_source(skip: int = 1) -> str:
+    """
+    Manejador que originó la llamada actual: subiendo por la pila, la última
+    función del tramo continuo de views/, components/, controllers/ y main2.py (el
+    manejador de evento o la acción del controlador), como "Clase.metodo".
+    En corrutinas la pila incluye la cadena de awaits, así que una acción async
+    del controlador que actualiza la vista también se encuentra.
+    """
+    source = None
+    frame = sys._getframe(skip)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(_SOURCE_MODULES):
+            source = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        elif source is not None:
+            break
+        frame = frame.f_back
+    return source or UNKNOWN_SOURCE
+
+
+@contextmanager
+def flush_sources(sources: Sequence[str]):
+    """
+    Contexto que usa el UpdateScheduler al vaciar su cola: atribuye la
+    actualización a los manejadores que pidieron los cambios (la pila del flush
+    ya no los contiene). El primero es el origen; el resto cuenta como fusionado.
+    """
+    previous = getattr(_local, "sources", None)
+    _local.sources = list(sources)
+    try:
+        yield
+    finally:
+        _local.sources = previous
+
+
+def _count_controls(commands: Sequence[Any]) -> int:
+    """Controles afectados por los comandos del diff: set = 1, add = sus hijos, remove = sus ids."""
+    count = 0
+    for command in commands:
+        name = getattr(command, "name", None)
+        if name == "set":
+            count += 1
+        elif name == "add":
+            count += len(command.commands)
+        elif name == "remove":
+            count += len(command.values)
+    return count
+
+
+def _payload_bytes(commands: Sequence[Any]) -> int:
+    """Tamaño del diff serializado como lo envía Flet (JSON compacto)."""
+    try:
+        from flet.core.protocol import CommandEncoder
+        return len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")).encode("utf-8"))
+    except Exception:
+        return 0
+
+
+def _wrap_connection(conn: Any) -> None:
+    """Intercepta send_commands de la conexión (compartida entre sesiones) una sola vez."""
+    if conn is None or getattr(conn, "_gemtrack_ui_stats", False):
+        return
+    original = conn.send_commands
+
+    def send_commands(session_id, commands):
+        captured = getattr(_local, "commands", None)
+        if captured is not None:
+            captured.extend(commands)
+        return original(session_id, commands)
+
+    conn.send_commands = send_commands
+    conn._gemtrack_ui_stats = True
+
+
+# Métodos de Page que arman y envían un diff (add/insert/remove no pasan por update()).
+_PAGE_METHODS = ("update", "add", "insert", "remove", "remove_at")
+
+
+def _measured(page: Any, original: Any, stats: UiStats) -> Any:
+    def method(*args):
+        if getattr(_local, "commands", None) is not None:
+            # Llamada anidada (ej. did_mount que actualiza): la cuenta la externa.
+            return original(*args)
+        _wrap_connection(getattr(page, "_Page__conn", None))
+        sources = getattr(_local, "sources", None)
+        source = sources[0] if sources else current_source(2)
+        commands: List[Any] = []
+        _local.commands = commands
+        start = time.perf_counter()
+        try:
+            return original(*args)
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            _local.commands = None
+            # El tamaño del diff se calcula fuera del tiempo medido.
+            stats.record(getattr(page, "route", None) or "/", source, wall_ms, _count_controls(commands),
+                         _payload_bytes(commands) if commands else 0,
+                         coalesced=len(sources) - 1 if sources else 0)
+    return method
+
+
+def install(page: Any, stats: UiStats = ui_stats) -> None:
+    """
+    Instrumenta page.update() (y add/insert/remove) de una página, una vez por
+    página. Con Flet 0.28 el diff se arma en Page.__update y se envía por la
+    conexión privada de la página; si esa conexión no existe, solo se mide el tiempo.
+    """
+    if not stats.enabled or installed_stats(page) is not None:
+        return
+    for name in _PAGE_METHODS:
+        setattr(page, name, _measured(page, getattr(page, name), stats))
+    page._gemtrack_ui_stats = stats
+
+
+def installed_stats(page: Any) -> Optional[UiStats]:
+    """Colector instalado en la página, o None si no está instrumentada."""
+    return getattr(page, "_gemtrack_ui_stats", None)
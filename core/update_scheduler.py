@@ -0,0 +1,142 @@
+# core/update_scheduler.py
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from core.ui_stats import current_source, flush_sources, install as install_ui_stats, installed_stats
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateScheduler:
+    """
+    Agrupa las llamadas a page.update() de vistas y controladores.
+    En lugar de enviar un diff al cliente de Flet por cada cambio, los
+    componentes marcan la página (o controles concretos) como "sucios" y el
+    scheduler hace UNA sola actualización por tick del event loop.
+    """
+
+    def __init__(self, page: Any):
+        # Referencia débil: el registro _schedulers tiene la página como clave
+        # débil, y una referencia fuerte aquí la mantendría viva para siempre.
+        self._page = weakref.ref(page)
+        self._lock = threading.Lock()
+        self._dirty_controls: Dict[int, Any] = {}
+        self._full_update = False
+        self._flush_scheduled = False
+        # Manejadores que pidieron los cambios pendientes (solo si la página está
+        # instrumentada con core/ui_stats.py, GEMTRACK_UI_STATS=1).
+        self._track_sources = installed_stats(page) is not None
+        self._sources: Dict[str, None] = {}
+
+        # Métricas para saber cuántas actualizaciones nos hemos ahorrado.
+        self.requested = 0
+        self.flushed = 0
+        self.absorbed = 0
+
+    @property
+    def page(self) -> Optional[Any]:
+        """La página, o None si la sesión ya se cerró y se liberó."""
+        return self._page()
+
+    def mark_dirty(self, *controls: Any) -> None:
+        """
+        Marca la página (sin argumentos) o algunos controles como pendientes de actualizar.
+        El envío real ocurre en el siguiente tick del event loop.
+        Args:
+            controls: Controles concretos a actualizar. Si se omiten, se actualiza toda la página.
+        """
+        source = current_source(2) if self._track_sources else None
+        with self._lock:
+            self.requested += 1
+            if source is not None:
+                self._sources[source] = None
+            if controls:
+                for control in controls:
+                    self._dirty_controls[id(control)] = control
+            else:
+                self._full_update = True
+
+            if self._flush_scheduled:
+                # Ya hay un flush en camino: esta petición queda absorbida.
+                self.absorbed += 1
+                return
+            self._flush_scheduled = True
+
+        self._schedule_flush()
+
+    def flush(self) -> None:
+        """
+        Envía inmediatamente los cambios pendientes al cliente.
+        Se puede llamar manualmente cuando se necesita la UI al día antes de seguir
+        (ej. mostrar un ProgressRing antes de una operación larga).
+        """
+        with self._lock:
+            full_update = self._full_update
+            controls = list(self._dirty_controls.values())
+            self._dirty_controls.clear()
+            self._full_update = False
+            self._flush_scheduled = False
+            sources = list(self._sources)
+            self._sources.clear()
+
+        page = self.page
+        if page is None or (not full_update and not controls):
+            return
+
+        try:
+            with flush_sources(sources):
+                if full_update:
+                    page.update()
+                else:
+                    # Solo los controles que siguen montados en la página.
+                    mounted = [c for c in controls if getattr(c, "page", None) is not None]
+                    if not mounted:
+                        return
+                    page.update(*mounted)
+            self.flushed += 1
+        except Exception as e:
+            logger.error("Error al actualizar la página desde UpdateScheduler: %s", e, exc_info=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve las métricas acumuladas del scheduler."""
+        return {
+            "requested": self.requested,
+            "flushed": self.flushed,
+            "absorbed": self.absorbed,
+        }
+
+    def _schedule_flush(self) -> None:
+        loop: Optional[asyncio.AbstractEventLoop] = getattr(self.page, "loop", None)
+        if loop is None or loop.is_closed():
+            # Sin event loop (ej. pruebas o pyodide): actualizamos directamente.
+            self.flush()
+            return
+        # call_soon_threadsafe funciona tanto desde el hilo del loop como desde
+        # los hilos del executor donde Flet ejecuta los manejadores síncronos.
+        loop.call_soon_threadsafe(self.flush)
+
+
+# Un scheduler por página (cada sesión de Flet tiene su propia página).
+_schedulers: "weakref.WeakKeyDictionary[Any, UpdateScheduler]" = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(page: Any) -> UpdateScheduler:
+    """
+    Obtiene (o crea) el UpdateScheduler asociado a una página.
+    Args:
+        page: La página de Flet.
+    Returns:
+        La instancia de UpdateScheduler compartida por todas las vistas de esa página.
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(page)
+        if scheduler is None:
+            # Con GEMTRACK_UI_STATS=1 se miden también las actualizaciones de esta página.
+            install_ui_stats(page)
+            scheduler = UpdateScheduler(page)
+            _schedulers[page] = scheduler
+        return scheduler
@@ -0,0 +1,263 @@
+# core/worker_pool.py
+"""
+Ejecutores compartidos por toda la aplicación para el trabajo que no debe
+correr en el event loop:
+
+- CPU (`run_cpu`): un pool de procesos para lo que consume CPU con el GIL
+  tomado. Hoy solo bcrypt (UserService.authenticate_user): la app no
+  decodifica ni redimensiona imágenes (Pillow no es dependencia) ni tiene una
+  importación masiva de precios. Las funciones y sus argumentos deben poder
+  serializarse con pickle (funciones de nivel de módulo).
+- I/O (`run_io`): un pool de hilos para E/S bloqueante (archivos, copias).
+  El SHA-256 de las imágenes subidas se calcula aquí, en la misma pasada que
+  la copia (copy_with_sha256): hashlib suelta el GIL con bloques grandes, y
+  enviarlo a otro proceso obligaría a leer el archivo dos veces.
+
+Cada pool acepta como máximo `queue_size` trabajos a la vez (en ejecución más
+en cola); el que llega con el pool lleno espera sin bloquear el event loop,
+así una importación masiva no acumula miles de trabajos en memoria
+(back-pressure). pool_stats() muestra qué tan saturado está cada pool.
+
+Tamaños configurables con GEMTRACK_CPU_WORKERS y GEMTRACK_IO_WORKERS;
+GEMTRACK_CPU_WORKERS=0 ejecuta el trabajo de CPU en el pool de hilos. Es el
+valor por defecto donde no hay procesos (Android, iOS, pyodide), y si el pool
+de procesos no se puede crear se usa un pool de hilos en su lugar.
+"""
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Envoltorio de un Executor de concurrent.futures con un tope de trabajos
+    admitidos y métricas de saturación. Se puede usar desde varios event loops.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], concurrent.futures.Executor], workers: int,
+                 queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._factory = factory
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._lock = threading.Lock()
+        # Trabajos que esperan lugar: (loop, future) a despertar cuando se libere uno.
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = collections.deque()
+        self._created = time.perf_counter()
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.run_ms = 0.0
+        self.backpressure_waits = 0
+        self.backpressure_ms = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Ejecuta fn(*args, **kwargs) en el pool y espera su resultado.
+        Si el pool ya tiene `queue_size` trabajos, espera a que se libere un lugar.
+        """
+        await self._acquire()
+        start = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            result = await asyncio.wrap_future(executor.submit(functools.partial(fn, *args, **kwargs)))
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._release(elapsed_ms)
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del pool; `saturation` es la fracción de workers ocupados ahora."""
+        with self._lock:
+            uptime_ms = (time.perf_counter() - self._created) * 1000
+            finished = self.completed + self.failed
+            return {
+                "name": self.name,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "saturation": round(min(self.in_flight, self.workers) / self.workers, 2),
+                "max_in_flight": self.max_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_ms": round(self.run_ms / finished, 2) if finished else 0,
+                # Tiempo ocupado (incluida la cola interna) frente al disponible desde que existe el pool.
+                "utilization": round(min(1.0, self.run_ms / (uptime_ms * self.workers)), 3) if uptime_ms else 0,
+                "backpressure_waits": self.backpressure_waits,
+                "backpressure_ms": round(self.backpressure_ms, 2),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene el executor (se vuelve a crear si se usa de nuevo)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        with self._lock:
+            if self._executor is None:
+                # Se crea con el primer trabajo: arrancar procesos tiene su costo.
+                self._executor = self._factory()
+                logger.info("Pool '%s' iniciado con %s workers.", self.name, self.workers)
+            return self._executor
+
+    async def _acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.submitted += 1
+            if self.in_flight < self.queue_size and not self._waiters:
+                self._admit()
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+            self.backpressure_waits += 1
+        start = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, waiter))
+                except ValueError:
+                    # Ya nos habían cedido el lugar: lo devolvemos.
+                    self._release_locked()
+            raise
+        finally:
+            with self._lock:
+                self.backpressure_ms += (time.perf_counter() - start) * 1000
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _release(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.run_ms += elapsed_ms
+            self._release_locked()
+
+    def _release_locked(self) -> None:
+        self.in_flight -= 1
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            if loop.is_closed():
+                continue
+            # El lugar pasa directamente al siguiente en espera.
+            self._admit()
+            loop.call_soon_threadsafe(_wake, waiter)
+            return
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def processes_supported() -> bool:
+    """Si la plataforma permite lanzar procesos (no en Android, iOS ni pyodide)."""
+    # Python < 3.13 en Android reporta "linux" pero expone getandroidapilevel.
+    return sys.platform not in ("android", "ios", "emscripten", "wasi") and not hasattr(sys, "getandroidapilevel")
+
+
+def _cpu_executor(workers: int) -> concurrent.futures.Executor:
+    """Pool de procesos para CPU; uno de hilos si la plataforma no admite procesos o semáforos."""
+    try:
+        # "spawn" y no "fork": el proceso de la app ya tiene hilos (Flet, logging)
+        # y un fork con hilos activos puede heredar locks tomados.
+        return concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+    except (ImportError, NotImplementedError, OSError) as e:
+        logger.warning("Sin pool de procesos (%s); el trabajo de CPU usará hilos.", e)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemtrack-cpu")
+
+
+_CPU_COUNT = os.cpu_count() or 1
+IO_WORKERS = _env_int("GEMTRACK_IO_WORKERS", min(32, _CPU_COUNT + 4))
+CPU_WORKERS = _env_int("GEMTRACK_CPU_WORKERS", _CPU_COUNT if processes_supported() else 0)
+
+io_pool = BoundedExecutor(
+    "io",
+    lambda: concurrent.futures.ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="gemtrack-io"),
+    workers=IO_WORKERS,
+    queue_size=IO_WORKERS * 4,
+)
+
+if CPU_WORKERS > 0:
+    cpu_pool = BoundedExecutor(
+        "cpu",
+        lambda: _cpu_executor(CPU_WORKERS),
+        workers=CPU_WORKERS,
+        queue_size=CPU_WORKERS * 4,
+    )
+else:
+    cpu_pool = io_pool
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Ejecuta trabajo de CPU en el pool de procesos compartido.
+    Args:
+        fn: Función de nivel de módulo (debe poder serializarse con pickle).
+        args, kwargs: Sus argumentos (también serializables).
+    Returns:
+        El resultado de fn.
+    """
+    return await cpu_pool.run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Ejecuta E/S bloqueante en el pool de hilos compartido.
+    Returns:
+        El resultado de fn.
+    """
+    return await io_pool.run(fn, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Métricas de saturación de los pools compartidos."""
+    return {pool.name: pool.stats() for pool in {id(p): p for p in (cpu_pool, io_pool)}.values()}
+
+
+def shutdown_pools() -> None:
+    """Detiene los pools (se llama también al salir del proceso)."""
+    for name, stats in pool_stats().items():
+        if stats["submitted"]:
+            logger.info("Pool '%s': %s trabajos, %.1f ms de media, pico de %s en vuelo, %s esperas por cola llena.",
+                        name, stats["completed"], stats["avg_ms"], stats["max_in_flight"],
+                        stats["backpressure_waits"])
+    cpu_pool.shutdown()
+    io_pool.shutdown()
+
+
+atexit.register(shutdown_pools)
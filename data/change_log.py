@@ -0,0 +1,214 @@
+# data/change_log.py
+"""
+Registro de cambios para la sincronización entre instancias (escritorio,
+teléfonos de la tienda), cada una con su propio SQLite.
+
+Un evento after_flush de la sesión escribe, EN LA MISMA TRANSACCIÓN que el
+cambio, una fila en change_log por cada producto o cliente creado, modificado
+o eliminado: si la escritura se confirma, su registro también, y viceversa.
+Cada fila lleva el id de la instancia que hizo el cambio (origin) y un reloj
+de Lamport (clock): max(clock) conocido + 1.
+
+Formato del payload (JSON):
+    {"set": {campo: valor}}            valores nuevos (en "created", todos)
+    {"add": {"stock": -2}}             contadores como diferencia: dos ventas
+                                       simultáneas en dos equipos se suman
+                                       en lugar de pisarse.
+Las fechas viajan en ISO y los Enum por su valor.
+
+Los cambios que aplica la propia sincronización (sesión con
+session.info[APPLYING_REMOTE]) no se registran como locales.
+"""
+import enum
+import json
+import logging
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Enum, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from data.models.product_models import Product
+from data.models.sync_models import ChangeLogEntry, SyncMeta
+from data.models.user_models import Client
+
+logger = logging.getLogger(__name__)
+
+# Marca de sesión: los cambios que aplica la sincronización ya traen su registro.
+APPLYING_REMOTE = "gemtrack_sync_applying"
+INSTANCE_ID_KEY = "instance_id"
+
+CREATED, UPDATED, DELETED = "created", "updated", "deleted"
+
+
+class SyncedEntity:
+    """
+    Cómo se sincroniza un modelo: clave natural, campos que viajan y cuáles
+    son contadores (se envían como diferencia).
+    """
+
+    def __init__(self, name: str, model: type, key: str, exclude: Tuple[str, ...],
+                 counters: Tuple[str, ...] = (), relations: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.model = model
+        self.key = key
+        self.exclude = frozenset(exclude)
+        self.counters = frozenset(counters)
+        # Campos calculados desde relaciones: {campo: "relacion.atributo"}.
+        self.relations = relations or {}
+        self._decoders: Optional[Dict[str, Optional[Callable[[Any], Any]]]] = None
+
+    @property
+    def decoders(self) -> Dict[str, Optional[Callable[[Any], Any]]]:
+        """Campos de columna que viajan y cómo convertir su valor JSON (se resuelve al primer uso)."""
+        if self._decoders is None:
+            decoders = {}
+            for attr in inspect(self.model).column_attrs:
+                if attr.key in self.exclude:
+                    continue
+                column_type = attr.columns[0].type
+                if isinstance(column_type, (DateTime, Date)):
+                    decoders[attr.key] = datetime.fromisoformat
+                elif isinstance(column_type, Enum) and column_type.enum_class is not None:
+                    decoders[attr.key] = column_type.enum_class
+                else:
+                    decoders[attr.key] = None
+            self._decoders = decoders
+        return self._decoders
+
+    def decode(self, field: str, value: Any) -> Any:
+        decoder = self.decoders.get(field)
+        return decoder(value) if decoder is not None and value is not None else value
+
+    def snapshot(self, obj: Any) -> Dict[str, Any]:
+        """Payload "created": todos los campos que viajan."""
+        values = {field: _encode(getattr(obj, field)) for field in self.decoders}
+        state = inspect(obj)
+        for field, path in self.relations.items():
+            relation, _, attribute = path.partition(".")
+            if relation in state.dict:
+                values[field] = sorted(getattr(item, attribute) for item in state.dict[relation])
+        return {"set": values}
+
+    def changes(self, obj: Any) -> Dict[str, Dict[str, Any]]:
+        """Payload "updated": solo los campos modificados en este flush."""
+        state = inspect(obj)
+        values, deltas = {}, {}
+        for field in self.decoders:
+            history = state.attrs[field].history
+            if not history.has_changes():
+                continue
+            new = history.added[0] if history.added else None
+            if field in self.counters and history.deleted and history.deleted[0] is not None:
+                deltas[field] = (new or 0) - history.deleted[0]
+            else:
+                values[field] = _encode(new)
+        for field, path in self.relations.items():
+            relation, _, attribute = path.partition(".")
+            if state.attrs[relation].history.has_changes():
+                values[field] = sorted(getattr(item, attribute) for item in getattr(obj, relation))
+        payload = {}
+        if values:
+            payload["set"] = values
+        if deltas:
+            payload["add"] = deltas
+        return payload
+
+    def previous_key(self, obj: Any) -> Any:
+        """Clave natural antes de este flush (si el cambio la renombró, la anterior)."""
+        history = inspect(obj).attrs[self.key].history
+        if history.deleted:
+            return history.deleted[0]
+        return getattr(obj, self.key)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+# Entidades sincronizables, por nombre (el mismo de los ChangeEvent del bus).
+SYNCED_ENTITIES: Dict[str, SyncedEntity] = {
+    "product": SyncedEntity(
+        "product", Product, key="sku",
+        # Los ids y el proveedor son locales; las fechas de alta/modificación también.
+        exclude=("id", "supplier_id", "creation_date", "modification_date"),
+        counters=("stock",),
+        relations={"category_names": "categories.name"},
+    ),
+    "client": SyncedEntity(
+        "client", Client, key="username",
+        exclude=("id", "role", "creation_date", "modification_date"),
+    ),
+}
+_BY_MODEL = {spec.model: spec for spec in SYNCED_ENTITIES.values()}
+
+_instance_ids: Dict[str, str] = {}
+_instance_lock = threading.Lock()
+
+
+def get_instance_id(connection: Any) -> str:
+    """
+    Id de esta instancia (un uuid por base de datos, guardado en sync_meta).
+    Args:
+        connection: Conexión síncrona de SQLAlchemy a la base de datos.
+    """
+    url = str(connection.engine.url)
+    with _instance_lock:
+        instance_id = _instance_ids.get(url)
+    if instance_id is not None:
+        return instance_id
+    instance_id = connection.execute(select(SyncMeta.value).where(SyncMeta.key == INSTANCE_ID_KEY)).scalar()
+    if instance_id is None:
+        instance_id = uuid.uuid4().hex
+        connection.execute(insert(SyncMeta).values(key=INSTANCE_ID_KEY, value=instance_id))
+    with _instance_lock:
+        return _instance_ids.setdefault(url, instance_id)
+
+
+def next_clock(connection: Any) -> int:
+    """Siguiente valor del reloj de Lamport: mayor que cualquier cambio registrado."""
+    return (connection.execute(select(func.max(ChangeLogEntry.clock))).scalar() or 0) + 1
+
+
+def capture_changes(session: Session, flush_context: Any) -> None:
+    """after_flush: registra los cambios de productos y clientes de este flush."""
+    if session.info.get(APPLYING_REMOTE):
+        return
+    changes: List[Tuple[SyncedEntity, Any, str, Dict[str, Any]]] = []
+    for obj in session.new:
+        spec = _BY_MODEL.get(type(obj))
+        if spec is not None:
+            changes.append((spec, getattr(obj, spec.key), CREATED, spec.snapshot(obj)))
+    for obj in session.dirty:
+        spec = _BY_MODEL.get(type(obj))
+        if spec is not None and session.is_modified(obj):
+            payload = spec.changes(obj)
+            if payload:
+                changes.append((spec, spec.previous_key(obj), UPDATED, payload))
+    for obj in session.deleted:
+        spec = _BY_MODEL.get(type(obj))
+        if spec is not None:
+            changes.append((spec, spec.previous_key(obj), DELETED, {}))
+    if not changes:
+        return
+
+    connection = session.connection()
+    origin = get_instance_id(connection)
+    clock = next_clock(connection)
+    rows = []
+    for offset, (spec, key, kind, payload) in enumerate(changes):
+        rows.append({
+            "origin": origin, "clock": clock + offset, "entity": spec.name, "entity_key": str(key),
+            "kind": kind, "payload": json.dumps(payload, separators=(",", ":"), ensure_ascii=False),
+        })
+    connection.execute(insert(ChangeLogEntry), rows)
+    logger.debug("%s cambios registrados para sincronizar.", len(rows))
+
+
+event.listen(Session, "after_flush", capture_changes)
@@ -1,6 +1,6 @@
 from sqlalchemy.future import select
 from typing import Type, TypeVar, List, Dict, Any, Optional
-from sqlalchemy import and_
+from sqlalchemy import and_, inspect
 
 # Importamos la Base declarativa de nuestros modelos
 from data.database import Base
@@ -32,6 +32,18 @@ async def create_record(session_provider: SessionProvider, model: ModelType) ->
         await session.refresh(model)
         return model
 
+def loaded_column_values(record: Any) -> Dict[str, Any]:
+    """
+    Valores de las columnas ya cargadas de una instancia (sin disparar cargas
+    perezosas, que fallan fuera de la sesión asíncrona).
+    Args:
+        record: Una instancia de un modelo de SQLAlchemy.
+    Returns:
+        Un diccionario {atributo: valor} con las columnas cargadas.
+    """
+    state = inspect(record)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
 async def get_record_by_id(session_provider: SessionProvider, model_type: Type[ModelType], record_id: Any) -> Optional[ModelType]:
     """
     Obtiene un registro por su ID.
@@ -0,0 +1,149 @@
+# data/data_version.py
+"""
+Detección de escrituras de OTROS procesos sobre la misma gemtrack.db (ej. la
+app de escritorio y un kiosco, o dos workers web).
+
+SQLite cambia `PRAGMA data_version` de una conexión cada vez que otra conexión
+confirma una escritura en el archivo. El watcher mantiene una conexión propia y
+consulta ese pragma cada `interval` segundos: una sola sentencia sin E/S de
+tablas. Las escrituras de este proceso (que también usan otras conexiones del
+pool) se cuentan con el evento "commit" del engine; si el pragma cambió sin
+commits locales en el intervalo, escribió otro proceso y se publica un
+ChangeEvent INVALIDATED (sin entidad) en el bus de cambios.
+
+Un intervalo con escrituras locales y externas a la vez se toma como local:
+los cambios propios ya llegaron por el bus y la firma del inventario (que se
+revalida en cada visita) detecta el resto.
+
+El evento "commit" se dispara justo ANTES de escribir, y un commit local
+puede caer mientras se lee el pragma. Por eso una lectura cuenta como local
+si hubo commits entre el momento previo a la lectura anterior y el posterior
+a esta: todo commit cuyo efecto pudo aparecer en el cambio de versión.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+from core.change_bus import ChangeKind, publish_change
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre consultas del pragma; 0 desactiva el watcher.
+DEFAULT_INTERVAL = float(os.environ.get("GEMTRACK_DATA_VERSION_INTERVAL", "2.0"))
+
+
+class DataVersionWatcher:
+    """Sondea PRAGMA data_version en una conexión dedicada del engine."""
+
+    def __init__(self, engine: Any, interval: float = DEFAULT_INTERVAL):
+        self.engine = engine
+        self.interval = interval
+        self._connection = None
+        self._version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        # Commits de este proceso: el evento se dispara en el hilo de aiosqlite.
+        self._local_commits = 0
+        # Contador antes de la lectura anterior del pragma (inicio de la ventana).
+        self._window_start = 0
+        self.checks = 0
+        self.external_changes = 0
+        event.listen(engine.sync_engine, "commit", self._on_local_commit)
+
+    def _on_local_commit(self, conn: Any) -> None:
+        with self._lock:
+            self._local_commits += 1
+
+    async def check(self) -> bool:
+        """
+        Consulta el pragma una vez.
+        Returns:
+            True si otro proceso escribió desde la consulta anterior (y se publicó la invalidación).
+        """
+        if self._connection is None:
+            self._connection = await self.engine.connect()
+        with self._lock:
+            before = self._local_commits
+        result = await self._connection.exec_driver_sql("PRAGMA data_version")
+        version = result.scalar()
+        with self._lock:
+            local_commits = self._local_commits - self._window_start
+        self._window_start = before
+        # Sin transacción abierta entre consultas: no retenemos bloqueos de lectura.
+        await self._connection.rollback()
+        self.checks += 1
+        previous, self._version = self._version, version
+        if previous is None or version == previous or local_commits:
+            return False
+
+        self.external_changes += 1
+        logger.info("Otro proceso escribió en la base de datos; se invalidan las caches.")
+        publish_change(None, None, ChangeKind.INVALIDATED)
+        return True
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Lanza el sondeo en segundo plano en el event loop actual (idempotente)."""
+        if self.interval <= 0:
+            return None
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+            logger.info("Watcher de data_version iniciado (cada %.1f s).", self.interval)
+        return self._task
+
+    async def stop(self) -> None:
+        """Detiene el sondeo y cierra la conexión dedicada."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"checks": self.checks, "external_changes": self.external_changes,
+                "local_commits": self._local_commits, "version": self._version}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Base bloqueada o cerrada: se reintenta en el próximo intervalo con otra conexión.
+                logger.warning("No se pudo consultar data_version: %s", e)
+                connection, self._connection = self._connection, None
+                if connection is not None:
+                    try:
+                        await connection.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(self.interval)
+
+
+_watcher: Optional[DataVersionWatcher] = None
+
+
+def start_data_version_watcher() -> Optional[DataVersionWatcher]:
+    """
+    Inicia (una vez por proceso) el watcher sobre el engine de la aplicación.
+    Debe llamarse desde el event loop, con la base de datos ya inicializada.
+    Returns:
+        El watcher compartido, o None si está desactivado (GEMTRACK_DATA_VERSION_INTERVAL=0).
+    """
+    global _watcher
+    if DEFAULT_INTERVAL <= 0:
+        return None
+    if _watcher is None:
+        from data.database import async_engine
+        _watcher = DataVersionWatcher(async_engine)
+    _watcher.start()
+    return _watcher
@@ -1,8 +1,15 @@
 # Añadir al final de test_assets_config1.py
+import logging
 import os
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.schema import CreateIndex
 from data.models.base_model import Base
+from data.query_stats import install as install_query_stats
+# Registra (en la misma transacción) los cambios a sincronizar con otras instancias
+import data.change_log  # noqa: F401
 
+logger = logging.getLogger(__name__)
 
 # Configuración de base de datos
 DB_NAME = "gemtrack.db"
@@ -17,6 +24,20 @@ DB_URL = f"sqlite+aiosqlite:///{DB_FILE}"
 
 # Engine y sesión asíncrona
 async_engine = create_async_engine(DB_URL, echo=False, future=True)
+# Hooks de instrumentación: latencia y filas por sentencia, agrupadas por acción
+# del controlador (se activan con GEMTRACK_QUERY_STATS=1, ver data/query_stats.py).
+install_query_stats(async_engine.sync_engine)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _enable_wal(dbapi_connection, connection_record):
+    # WAL: los lectores (la UI, la API local, otros procesos) no bloquean a
+    # quien escribe ni esperan a que termine.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
@@ -45,14 +66,29 @@ async def init_db():
         # run_sync permite ejecutar operaciones síncronas de SQLAlchemy
         # dentro de un contexto asíncrono. Base.metadata.create_all es síncrono.
         await conn.run_sync(Base.metadata.create_all)
-    print("Base de datos inicializada y tablas creadas (si no existían).")
+        # create_all solo crea los índices de las tablas nuevas; en bases de datos
+        # existentes añadimos los índices que falten.
+        await conn.run_sync(ensure_indexes)
+    logger.info("Base de datos inicializada y tablas creadas (si no existían).")
+
+
+def ensure_indexes(sync_conn):
+    """
+    Crea los índices definidos en los modelos que aún no existan en la base de datos.
+    Se ejecuta con run_sync dentro de init_db.
+    """
+    # CREATE INDEX IF NOT EXISTS en lugar de checkfirst: la reflexión de SQLAlchemy
+    # no ve los índices de expresiones (ej. lower(email)) y los intentaría recrear.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            sync_conn.execute(CreateIndex(index, if_not_exists=True))
 
 # 4. Notifica el estado de la base de datos
 def notify_db_status(exists):
     if exists:
-        print(f"La base de datos '{DB_FILE}' ya existe y está lista para usarse.")
+        logger.info("La base de datos '%s' ya existe y está lista para usarse.", DB_FILE)
     else:
-        print(f"Se ha creado la base de datos '{DB_FILE}' y sus tablas.")
+        logger.info("Se ha creado la base de datos '%s' y sus tablas.", DB_FILE)
 
 # 5. Verifica si el archivo de la base de datos es accesible
 def check_db_file():
@@ -62,7 +98,7 @@ def check_db_file():
     if not os.access(DB_FILE, os.R_OK | os.W_OK):
         raise PermissionError(f"No se tienen permisos para acceder al archivo '{DB_FILE}'.")
     else:
-        print(f"El archivo de la base de datos '{DB_FILE}' está accesible.")
+        logger.info("El archivo de la base de datos '%s' está accesible.", DB_FILE)
 
 # 6. Función para obtener la sesión de la base de datos
 async def get_db_session():
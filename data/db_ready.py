@@ -0,0 +1,72 @@
+# data/db_ready.py
+import asyncio
+import importlib
+import logging
+from typing import Optional
+
+from core.startup import timeline
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseReadiness:
+    """
+    Future compartido que indica cuándo la base de datos está lista.
+    La inicialización (importar SQLAlchemy/modelos y ejecutar init_db) corre en
+    segundo plano, así las rutas que no necesitan datos se pintan de inmediato
+    y las que sí los necesitan esperan a este future mostrando un indicador.
+    """
+
+    def __init__(self):
+        self._future: Optional[asyncio.Future] = None
+
+    def start(self) -> asyncio.Future:
+        """
+        Lanza la inicialización en segundo plano (solo la primera vez).
+        Debe llamarse desde el event loop de la aplicación.
+        Returns:
+            El future compartido de la inicialización.
+        """
+        if self._future is None:
+            logger.info("Iniciando la base de datos en segundo plano.")
+            self._future = asyncio.ensure_future(self._initialize())
+        return self._future
+
+    async def _initialize(self) -> None:
+        timeline.mark("init_db_start", once=True)
+        # El import de data.database (SQLAlchemy + todos los modelos) es costoso;
+        # lo hacemos en un hilo para no bloquear el event loop mientras se pinta la UI.
+        database = await asyncio.to_thread(importlib.import_module, "data.database")
+        await database.init_db()
+        timeline.mark("init_db", once=True)
+        logger.info("Base de datos inicializada correctamente.")
+
+    async def wait(self) -> None:
+        """
+        Espera a que la base de datos esté lista.
+        Raises:
+            Exception: La misma excepción que lanzó init_db, si la inicialización falló.
+        """
+        future = self.start()
+        # shield: si se cancela quien espera (ej. el usuario navega a otra ruta),
+        # la inicialización compartida sigue su curso.
+        await asyncio.shield(future)
+
+    def is_ready(self) -> bool:
+        """Indica si la inicialización terminó correctamente."""
+        return (
+            self._future is not None
+            and self._future.done()
+            and not self._future.cancelled()
+            and self._future.exception() is None
+        )
+
+    def error(self) -> Optional[BaseException]:
+        """Devuelve el error de inicialización, o None si no hubo (o aún no terminó)."""
+        if self._future is None or not self._future.done() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+
+# Instancia compartida por todas las vistas del proceso.
+db_ready = DatabaseReadiness()
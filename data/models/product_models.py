@@ -3,6 +3,7 @@ from data.models.base_model import Base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlalchemy import Table, Column, Integer, ForeignKey, String, Float, DateTime
+from data.serializers import serialize, deserialize
 
 
 # Asociación entre productos y categorías
@@ -29,7 +30,8 @@ class Product(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     image_path = Column(String, nullable=True)  # NUEVO CAMPO PARA LA IMAGEN
     sku = Column(String(50), unique=True, nullable=False)
-    name = Column(String(100), nullable=False)
+    # Indexado: la lista de inventario se ordena por nombre y se carga por bloques.
+    name = Column(String(100), nullable=False, index=True)
     description = Column(String(500), nullable=True)
     categories = relationship(
         "Category",
@@ -53,20 +55,10 @@ class Product(Base):
         return f"<Product(id={self.id}, name='{self.name}', sku='{self.sku}')>"
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        # Serializador generado y cacheado por modelo (ver data/serializers.py).
+        return serialize(self)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
-        # Obtiene los nombres de las columnas válidas para este modelo
-        valid_keys = {c.name for c in cls.__table__.columns}
-        # Crea un nuevo diccionario solo con las claves que existen en el modelo
-        filtered_data = {key: value for key, value in data.items() if key in valid_keys}
-        # Llama al constructor solo con los datos filtrados y válidos
-        return cls(**filtered_data)
-
-
-
-
-
-
-
+        # Ignora las claves que no son columnas del modelo (ej. 'category_ids').
+        return deserialize(cls, data)
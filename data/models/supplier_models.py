@@ -2,6 +2,7 @@
 from data.models.base_model import Base
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
+from data.serializers import serialize
 
 
 class Supplier(Base):
@@ -17,4 +18,4 @@ class Supplier(Base):
     products = relationship("Product", back_populates="supplier")
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return serialize(self)
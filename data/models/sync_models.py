@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Index, Integer, String, Text
+
+from data.models.base_model import Base
+
+
+class ChangeLogEntry(Base):
+    """
+    Un cambio de una entidad sincronizable (producto o cliente), escrito en la
+    misma transacción que el cambio (ver data/change_log.py).
+    origin + clock identifican el cambio en todas las instancias: clock es un
+    reloj de Lamport (mayor que cualquier cambio visto hasta entonces).
+    entity_key es la clave natural (sku, username): los ids locales difieren
+    entre instancias.
+    """
+    __tablename__ = 'change_log'
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String(32), nullable=False)
+    clock = Column(Integer, nullable=False)
+    entity = Column(String(20), nullable=False)
+    entity_key = Column(String(100), nullable=False)
+    kind = Column(String(10), nullable=False)  # 'created', 'updated', 'deleted'
+    payload = Column(Text, nullable=False, default="{}")  # JSON
+    # Par del que se recibió el cambio (None si es local): no se le reenvía.
+    received_from = Column(String(32), nullable=True)
+
+    __table_args__ = (
+        Index('ux_change_log_origin_clock', origin, clock, unique=True),
+        Index('ix_change_log_entity_key', entity, entity_key),
+        Index('ix_change_log_clock', clock),
+    )
+
+    def __repr__(self):
+        return f"<ChangeLogEntry(seq={self.seq}, {self.entity}:{self.entity_key} {self.kind} @{self.clock}/{self.origin})>"
+
+
+class SyncPeer(Base):
+    """Marcas de agua de la sincronización con otra instancia."""
+    __tablename__ = 'sync_peers'
+
+    peer_id = Column(String(32), primary_key=True)
+    # Último seq local ya enviado al par.
+    pushed_seq = Column(Integer, nullable=False, default=0)
+    # Último seq del par ya recibido.
+    pulled_seq = Column(Integer, nullable=False, default=0)
+
+
+class SyncMeta(Base):
+    """Pares clave/valor de la instancia (ej. su instance_id)."""
+    __tablename__ = 'sync_meta'
+
+    key = Column(String(50), primary_key=True)
+    value = Column(String(200), nullable=True)
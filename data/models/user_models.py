@@ -1,8 +1,8 @@
 from data.models.base_model import Base
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from sqlalchemy import Table, Column, Integer, ForeignKey, Enum, String, DateTime
+from sqlalchemy import Table, Column, Integer, ForeignKey, Enum, String, DateTime, Index, func
+from data.serializers import serialize
 
 
 
@@ -26,7 +26,6 @@ class User(Base):
     modification_date = Column(DateTime, onupdate=datetime.now)
     delete_date = Column(DateTime, nullable=True)
     role = Column(Enum(UserRole), nullable=False)
-    product = relationship('Product', back_populates='supplier')
     status = Column(Enum('active', 'inactive', name='user_status'), default='active')
 
     __mapper_args__ = {
@@ -34,22 +33,20 @@ class User(Base):
         'polymorphic_identity': 'user'
     }
 
+    __table_args__ = (
+        # Búsqueda de email sin distinguir mayúsculas: WHERE lower(email) = lower(?)
+        Index('ix_users_email_lower', func.lower(email)),
+        # Listados por tipo de usuario (ej. solo clientes) ordenados por apellido y nombre.
+        Index('ix_users_role_name', role, last_name, first_name),
+    )
+
+    # El hash de la contraseña nunca sale en los diccionarios serializados.
+    __serializer_exclude__ = ("password_hash",)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'username': self.username,
-            'first_name': self.name,
-            'last_name': self.lastname,
-            'email': self.email,
-            'phone_number': self.phone_number,
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
-            'creation_date': self.creation_date.isoformat(),
-            'modification_date': self.modification_date.isoformat() if self.modification_date else None,
-            'delete_date': self.delete_date.isoformat() if self.delete_date else None,
-            'role': self.role.value,
-            'status': self.status
-
-        }
+        # El serializador generado para cada subclase (Client, Admin) ya incluye
+        # sus columnas propias; los Enum salen como su valor y las fechas en ISO.
+        return serialize(self)
 
 # Subtipo: Cliente
 class Client(User):
@@ -75,21 +72,6 @@ class Client(User):
         'polymorphic_identity': UserRole.CLIENT,
     }
 
-    def to_dict(self):
-        data = super().to_dict()
-        data.update({
-            'shipping_address': self.shipping_address,
-            'billing_address': self.billing_address,
-            # 'preferred_contact_method': self.preferred_contact_method,
-            # 'preferred_language': self.preferred_language,
-            # 'loyalty_points': self.loyalty_points,
-            # 'purchase_history': self.purchase_history,
-            # 'preferred_payment_method': self.preferred_payment_method,
-            # 'preferred_shipping_method': self.preferred_shipping_method,
-            # 'newsletter_subscription': self.newsletter_subscription,
-            # 'preferred_currency': self.preferred_currency
-        })
-
 
 class DepartmentEnum(enum.Enum):
     IT = "IT"
@@ -131,11 +113,3 @@ class Admin(User):
     __mapper_args__ = {
         'polymorphic_identity': UserRole.ADMIN,
     }
-
-    def to_dict(self):
-        data = super().to_dict()
-        data.update({
-            'permissions': self.permissions,
-            'department': self.department,
-        })
-        return data
\ No newline at end of file
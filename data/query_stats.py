@@ -0,0 +1,261 @@
+# data/query_stats.py
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Acción en curso (ej. "InventoryController.add_product_clicked"). La fija el
+# controlador y la heredan las sesiones de SQLAlchemy que se abren dentro de ella.
+_current_run: contextvars.ContextVar[Optional["ActionRun"]] = contextvars.ContextVar(
+    "gemtrack_query_action", default=None
+)
+
+NO_ACTION = "(sin acción)"
+QUERY_STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_stats.json")
+
+
+class ActionRun:
+    """Sentencias ejecutadas durante UNA invocación de una acción."""
+    __slots__ = ("name", "statements", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+        # (sql, milisegundos, filas o None)
+        self.statements: List[tuple] = []
+        self.started = time.perf_counter()
+
+
+class ActionStats:
+    """Acumulado de todas las invocaciones de una acción."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.runs = 0
+        self.statements = 0
+        self.total_ms = 0.0
+        self.max_statements_per_run = 0
+        # sql -> [veces, ms totales, filas totales]
+        self.by_sql: Dict[str, List[float]] = {}
+        # sql -> máximo de repeticiones idénticas dentro de una misma invocación
+        self.n_plus_one: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        slowest = sorted(self.by_sql.items(), key=lambda item: item[1][1], reverse=True)[:10]
+        return {
+            "action": self.name,
+            "runs": self.runs,
+            "statements": self.statements,
+            "statements_per_run": round(self.statements / self.runs, 2) if self.runs else 0,
+            "max_statements_per_run": self.max_statements_per_run,
+            "total_ms": round(self.total_ms, 2),
+            "n_plus_one_suspects": [
+                {"sql": sql, "max_repeats_per_run": repeats}
+                for sql, repeats in sorted(self.n_plus_one.items(), key=lambda item: -item[1])
+            ],
+            "top_statements": [
+                {"sql": sql, "count": int(count), "total_ms": round(ms, 2), "rows": int(rows)}
+                for sql, (count, ms, rows) in slowest
+            ],
+        }
+
+
+class QueryStats:
+    """
+    Colector de estadísticas de SQL: latencia y filas de cada sentencia,
+    agrupadas por acción del controlador. Marca como sospecha de N+1 la misma
+    sentencia repetida `n_plus_one_threshold` veces o más en una sola invocación.
+
+    Se activa con la variable de entorno GEMTRACK_QUERY_STATS=1 (o enabled=True);
+    desactivado, los hooks del engine salen en la primera línea.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, n_plus_one_threshold: int = 3):
+        if enabled is None:
+            enabled = os.environ.get("GEMTRACK_QUERY_STATS") == "1"
+        self.enabled = enabled
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._actions: Dict[str, ActionStats] = {}
+        self._lock = threading.Lock()
+
+    # --- Registro ---
+
+    def record(self, sql: str, elapsed_ms: float, rows: Optional[int]) -> None:
+        """Registra una sentencia en la acción en curso (o en "(sin acción)")."""
+        run = _current_run.get()
+        if run is not None:
+            run.statements.append((sql, elapsed_ms, rows))
+        else:
+            # Fuera de una acción cada sentencia cuenta como una invocación propia.
+            orphan = ActionRun(NO_ACTION)
+            orphan.statements.append((sql, elapsed_ms, rows))
+            self.finish_run(orphan)
+
+    def finish_run(self, run: ActionRun) -> None:
+        """Acumula una invocación terminada y avisa si hay sospechas de N+1."""
+        repeats = Counter(sql for sql, _, _ in run.statements)
+        suspects = {sql: n for sql, n in repeats.items() if n >= self.n_plus_one_threshold}
+        with self._lock:
+            stats = self._actions.get(run.name)
+            if stats is None:
+                stats = self._actions[run.name] = ActionStats(run.name)
+            stats.runs += 1
+            stats.statements += len(run.statements)
+            stats.max_statements_per_run = max(stats.max_statements_per_run, len(run.statements))
+            for sql, elapsed_ms, rows in run.statements:
+                entry = stats.by_sql.get(sql)
+                if entry is None:
+                    entry = stats.by_sql[sql] = [0, 0.0, 0]
+                entry[0] += 1
+                entry[1] += elapsed_ms
+                entry[2] += rows or 0
+                stats.total_ms += elapsed_ms
+            for sql, n in suspects.items():
+                stats.n_plus_one[sql] = max(stats.n_plus_one.get(sql, 0), n)
+        for sql, n in suspects.items():
+            logger.warning("Posible N+1 en %s: %s ejecuciones de: %s", run.name, n, sql[:200])
+
+    # --- Consulta ---
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Construye el reporte de todas las acciones.
+        Returns:
+            Un diccionario con las acciones ordenadas por tiempo total de SQL.
+        """
+        with self._lock:
+            actions = [stats.to_dict() for stats in self._actions.values()]
+        actions.sort(key=lambda a: a["total_ms"], reverse=True)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "actions": actions,
+        }
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Escribe el reporte en JSON (por defecto en GEMTRACK_QUERY_STATS_FILE o
+        data/query_stats.json).
+        Returns:
+            La ruta del archivo escrito, o None si falló.
+        """
+        path = path or os.environ.get("GEMTRACK_QUERY_STATS_FILE") or QUERY_STATS_FILE
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            return path
+        except OSError as e:
+            logger.error("No se pudo guardar el reporte de consultas en %s: %s", path, e)
+            return None
+
+    def reset(self) -> None:
+        """Descarta todo lo acumulado."""
+        with self._lock:
+            self._actions.clear()
+
+
+# Colector compartido por todo el proceso.
+query_stats = QueryStats()
+
+
+@contextmanager
+def query_action(name: str):
+    """
+    Agrupa bajo `name` las sentencias SQL ejecutadas dentro del bloque.
+    Si ya hay una acción en curso, las sentencias se suman a esa (la externa manda).
+    """
+    if _current_run.get() is not None or not query_stats.enabled:
+        yield
+        return
+    run = ActionRun(name)
+    token = _current_run.set(run)
+    try:
+        yield
+    finally:
+        try:
+            _current_run.reset(token)
+        except ValueError:
+            # Generador cerrado desde otro contexto: solo limpiamos.
+            _current_run.set(None)
+        query_stats.finish_run(run)
+
+
+def tracked_action(name: Optional[str] = None) -> Callable:
+    """
+    Decorador para métodos async (y generadores async) de los controladores:
+    ejecuta cada llamada dentro de query_action. Por defecto el nombre es
+    "Clase.metodo".
+    """
+    def decorator(func: Callable) -> Callable:
+        action_name = name or func.__qualname__
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def gen_wrapper(*args, **kwargs):
+                with query_action(action_name):
+                    async for item in func(*args, **kwargs):
+                        yield item
+            return gen_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with query_action(action_name):
+                return await func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _row_count(cursor: Any) -> Optional[int]:
+    """
+    Filas afectadas/devueltas, si se conocen sin consumir el cursor:
+    rowcount para INSERT/UPDATE/DELETE y, para SELECT, las filas que el
+    adaptador asíncrono ya dejó en su buffer. None si no se puede saber
+    (ej. cursores de streaming).
+    """
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        return rowcount
+    buffered = getattr(cursor, "_rows", None)
+    return len(buffered) if buffered is not None else None
+
+
+def install(sync_engine: Any, stats: QueryStats = query_stats) -> None:
+    """
+    Registra los hooks before/after_cursor_execute en el engine (usar
+    async_engine.sync_engine con engines asíncronos).
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if stats.enabled:
+            conn.info.setdefault("gemtrack_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        if not stats.enabled:
+            return
+        starts = conn.info.get("gemtrack_query_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        stats.record(statement, elapsed_ms, _row_count(cursor))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        # La sentencia falló: descartamos su marca de inicio para no desalinear la pila.
+        conn = exception_context.connection
+        starts = conn.info.get("gemtrack_query_start") if conn is not None else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,87 @@
+# data/read_models.py
+from collections import namedtuple
+from typing import Any, Optional, Sequence
+
+# Separador para group_concat: un carácter de control que no aparece en los nombres
+# de categoría (a diferencia de la coma).
+CATEGORY_SEPARATOR = "\x1f"
+
+
+def split_names(value: Optional[str]) -> tuple:
+    """Convierte el resultado de group_concat en una tupla ordenada de nombres."""
+    if not value:
+        return ()
+    return tuple(sorted(value.split(CATEGORY_SEPARATOR)))
+
+
+class ProductCardRow(namedtuple("ProductCardRow", ["id", "name", "stock", "image_path", "category_names"])):
+    """
+    Proyección de un producto con solo las columnas que muestra InventoryProductCard.
+    Es una tupla (sin __dict__ ni estado de SQLAlchemy), por lo que ocupa una
+    fracción de memoria de un Product y se compara por valor.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "ProductCardRow":
+        """Crea la fila a partir de (id, name, stock, image_path, group_concat de categorías)."""
+        return cls(row[0], row[1], row[2], row[3], split_names(row[4]))
+
+    @classmethod
+    def from_product(cls, product: Any) -> "ProductCardRow":
+        """Crea la fila a partir de un Product con sus categorías cargadas."""
+        return cls(
+            product.id,
+            product.name,
+            product.stock,
+            product.image_path,
+            tuple(sorted(category.name for category in product.categories)) if product.categories else (),
+        )
+
+
+class ProductSummary(namedtuple("ProductSummary", ["id", "sku", "name", "description", "stock",
+                                                   "suggested_price", "availability_status", "image_path"])):
+    """
+    Resumen inmutable de un producto para búsquedas y listados que no son la tarjeta
+    del inventario. Para editar un producto se carga la entidad ORM completa.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "ProductSummary":
+        """Crea el resumen a partir de una fila con las columnas en el orden de los campos."""
+        return tuple.__new__(cls, row)
+
+
+class ClientSummary(namedtuple("ClientSummary", ["id", "first_name", "last_name", "email", "phone_number"])):
+    """Resumen inmutable de un cliente para listados y búsquedas."""
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "ClientSummary":
+        """Crea el resumen a partir de una fila con las columnas en el orden de los campos."""
+        return tuple.__new__(cls, row)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name or ''} {self.last_name or ''}".strip()
+
+
+class SupplierSummary(namedtuple("SupplierSummary", ["id", "name", "contact_person", "email", "phone"])):
+    """Resumen inmutable de un proveedor (dropdowns y listados)."""
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "SupplierSummary":
+        """Crea el resumen a partir de una fila con las columnas en el orden de los campos."""
+        return tuple.__new__(cls, row)
+
+
+class CategorySummary(namedtuple("CategorySummary", ["id", "name"])):
+    """Resumen inmutable de una categoría (dropdowns y filtros)."""
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "CategorySummary":
+        """Crea el resumen a partir de una fila (id, name)."""
+        return tuple.__new__(cls, row)
@@ -0,0 +1,175 @@
+# data/serializers.py
+import enum
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, DateTime, Enum, inspect
+
+# Tipos de conversión de cada campo en el código generado.
+_PLAIN, _ISO, _ENUM = "plain", "iso", "enum"
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+class SerializerRegistry:
+    """
+    Genera y cachea, la primera vez que se pide, una función especializada por
+    modelo (y por combinación de columnas/relaciones) que convierte una instancia
+    en un diccionario. El código se genera con los nombres de los campos ya
+    resueltos: al serializar no se recorre __table__.columns ni se construyen
+    conjuntos de claves.
+
+    Sirve tanto para modelos ORM como para los read models (namedtuples) de
+    data/read_models.py.
+    """
+
+    def __init__(self):
+        self._serializers: Dict[Tuple, Callable[[Any], Dict[str, Any]]] = {}
+        self._deserializers: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+        self._lock = threading.Lock()
+
+    def serializer(self, cls: type, fields: Optional[Sequence[str]] = None,
+                   nested: Optional[Dict[str, str]] = None) -> Callable[[Any], Dict[str, Any]]:
+        """
+        Obtiene (o genera) el serializador de una clase.
+        Args:
+            cls: Modelo ORM o namedtuple.
+            fields: Subconjunto de campos a incluir (None para todos los no excluidos).
+            nested: Campos calculados desde relaciones, {clave: "relacion.atributo"}.
+                Ej. {"category_names": "categories.name", "supplier_name": "supplier.name"}.
+                Las relaciones uno-a-muchos producen una lista.
+        Returns:
+            Una función obj -> dict.
+        """
+        # nested sin ordenar, como fields: el orden de las claves es el del dict
+        # generado, así que dos órdenes distintos son dos serializadores.
+        key = (cls, tuple(fields) if fields is not None else None, tuple(nested.items()) if nested else ())
+        func = self._serializers.get(key)
+        if func is None:
+            with self._lock:
+                func = self._serializers.get(key)
+                if func is None:
+                    func = self._compile(cls, fields, nested or {})
+                    self._serializers[key] = func
+        return func
+
+    def deserializer(self, model: type) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Obtiene (o genera) la función dict -> instancia del modelo, que ignora las
+        claves que no son columnas (ej. "category_ids").
+        """
+        func = self._deserializers.get(model)
+        if func is None:
+            with self._lock:
+                func = self._deserializers.get(model)
+                if func is None:
+                    func = self._deserializers[model] = _compile_deserializer(model)
+        return func
+
+    def _compile(self, cls: type, fields: Optional[Sequence[str]], nested: Dict[str, str]) -> Callable:
+        available = _describe_fields(cls)
+        if fields is None:
+            selected = list(available)
+        else:
+            unknown = [name for name in fields if name not in available]
+            if unknown:
+                raise ValueError(f"{cls.__name__} no tiene los campos: {', '.join(unknown)}")
+            selected = list(fields)
+
+        lines = [f"def serialize(obj):", "    return {"]
+        for name in selected:
+            kind = available[name]
+            if kind == _ISO:
+                expr = f"_iso(obj.{name})"
+            elif kind == _ENUM:
+                expr = f"_enum_value(obj.{name})"
+            else:
+                expr = f"obj.{name}"
+            lines.append(f"        {name!r}: {expr},")
+        for out_key, path in nested.items():
+            lines.append(f"        {out_key!r}: {_nested_expr(cls, path)},")
+        lines.append("    }")
+
+        namespace = {"_iso": _iso, "_enum_value": _enum_value}
+        exec("\n".join(lines), namespace)
+        serialize = namespace["serialize"]
+        serialize.__qualname__ = f"serialize_{cls.__name__}"
+        return serialize
+
+
+def _compile_deserializer(model: type) -> Callable[[Dict[str, Any]], Any]:
+    valid_keys = frozenset(attr.key for attr in inspect(model).column_attrs)
+
+    def deserialize(data: Dict[str, Any]) -> Any:
+        return model(**{k: v for k, v in data.items() if k in valid_keys})
+
+    deserialize.__qualname__ = f"deserialize_{model.__name__}"
+    return deserialize
+
+
+def _describe_fields(cls: type) -> Dict[str, str]:
+    """Campos serializables de la clase y su conversión, en orden de declaración."""
+    if hasattr(cls, "_fields"):  # namedtuple / read model
+        return {name: _PLAIN for name in cls._fields}
+
+    exclude = set(getattr(cls, "__serializer_exclude__", ()))
+    described = {}
+    for attr in inspect(cls).column_attrs:
+        if attr.key in exclude:
+            continue
+        column_type = attr.columns[0].type
+        if isinstance(column_type, (DateTime, Date)):
+            kind = _ISO
+        elif isinstance(column_type, Enum) and column_type.enum_class is not None:
+            kind = _ENUM
+        else:
+            kind = _PLAIN
+        described[attr.key] = kind
+    return described
+
+
+def _nested_expr(cls: type, path: str) -> str:
+    relation_name, _, attribute = path.partition(".")
+    if not attribute:
+        raise ValueError(f"Ruta anidada inválida '{path}': se espera 'relacion.atributo'.")
+    relationship = inspect(cls).relationships.get(relation_name)
+    if relationship is None:
+        raise ValueError(f"{cls.__name__} no tiene la relación '{relation_name}'.")
+    if relationship.uselist:
+        return f"[item.{attribute} for item in obj.{relation_name}]"
+    return f"(obj.{relation_name}.{attribute} if obj.{relation_name} is not None else None)"
+
+
+# Registro compartido por todo el proceso.
+serializers = SerializerRegistry()
+
+
+def serialize(obj: Any, fields: Optional[Sequence[str]] = None, nested: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Serializa una instancia con el serializador cacheado de su clase."""
+    return serializers.serializer(type(obj), fields, nested)(obj)
+
+
+def serialize_many(objs: Iterable[Any], fields: Optional[Sequence[str]] = None,
+                   nested: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Serializa una colección homogénea: el serializador se busca una sola vez.
+    Returns:
+        Una lista de diccionarios (vacía si no hay elementos).
+    """
+    objs = list(objs)
+    if not objs:
+        return []
+    func = serializers.serializer(type(objs[0]), fields, nested)
+    return [func(obj) for obj in objs]
+
+
+def deserialize(model: type, data: Dict[str, Any]) -> Any:
+    """Crea una instancia del modelo a partir de un diccionario, ignorando claves desconocidas."""
+    return serializers.deserializer(model)(data)
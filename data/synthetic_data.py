@@ -0,0 +1,346 @@
+# data/synthetic_data.py
+"""
+Generador de datos sintéticos para pruebas de carga: proveedores, categorías,
+productos (con sus categorías) y clientes (users + clients), escritos
+directamente en el esquema de GemTrack con inserts masivos.
+
+Es determinista: con la misma semilla y la misma base de partida genera
+exactamente las mismas filas. Cada tabla usa su propio generador aleatorio,
+así que cambiar (por ejemplo) la cantidad de clientes no altera los productos.
+Los identificadores continúan desde el máximo existente, de modo que se puede
+agregar volumen a una base que ya tiene datos.
+
+Uso:
+    python -m data.synthetic_data --db /tmp/carga.db --products 1000000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table
+
+from data.database import ensure_indexes
+from data.models.base_model import Base
+from data.models.product_models import Product, Category, product_category_association
+from data.models.supplier_models import Supplier
+from data.models.user_models import Client, User, UserRole
+
+logger = logging.getLogger(__name__)
+
+GEM_NAMES = ["Esmeralda", "Rubí", "Zafiro", "Diamante", "Amatista", "Topacio", "Ópalo", "Turquesa", "Perla", "Granate"]
+CUTS = ["oval", "redonda", "cojín", "pera", "marquesa", "princesa", "esmeralda", "cabujón"]
+CATEGORY_NAMES = ["Anillos", "Collares", "Aretes", "Pulseras", "Dijes", "Piedras sueltas", "Broches", "Tobilleras"]
+FIRST_NAMES = ["Ana", "Luis", "María", "Jorge", "Lucía", "Pedro", "Sofía", "Diego", "Elena", "Raúl"]
+LAST_NAMES = ["García", "Pérez", "López", "Gómez", "Díaz", "Ruiz", "Torres", "Flores", "Vargas", "Rojas"]
+UNITS = ["unidad", "quilate", "gramo"]
+
+# Formato en el que el dialecto SQLite de SQLAlchemy guarda los DateTime; las
+# filas se insertan sin pasar por los tipos del ORM, así que se formatea aquí.
+_SQLITE_DATETIME = "%Y-%m-%d %H:%M:%S.%f"
+_EPOCH = datetime(2023, 1, 1)
+# Cache de páginas de SQLite (en KiB) mientras se generan los datos.
+GENERATION_CACHE_KB = 256 * 1024
+
+
+def sku_for(product_id: int) -> str:
+    """SKU sintético de un producto (único porque deriva del id)."""
+    return f"SKU-{product_id:08d}"
+
+
+class SyntheticConfig:
+    """
+    Volumen y distribuciones de los datos a generar.
+    Args:
+        products: Cantidad de productos.
+        suppliers: Cantidad de proveedores.
+        categories: Cantidad de categorías.
+        clients: Cantidad de clientes (None: 1 por cada 100 productos, mínimo 100).
+        seed: Semilla de los generadores aleatorios.
+        stock_max: Stock máximo de un producto.
+        stock_skew: Sesgo del stock normal (>= 10): 1 es uniforme y valores mayores
+            concentran los productos cerca de 10 (pocos productos con mucho stock).
+        out_of_stock_ratio: Fracción de productos agotados (stock 0).
+        low_stock_ratio: Fracción de productos con stock bajo (1 a 9).
+        categories_per_product: Rango (mínimo, máximo) de categorías por producto.
+        supplier_skew: Sesgo del reparto de proveedores: 1 es uniforme y valores
+            mayores concentran los productos en los primeros proveedores.
+        batch_size: Filas generadas e insertadas por lote (acota la memoria).
+    """
+
+    def __init__(self, products: int = 1000, suppliers: int = 50, categories: int = 30,
+                 clients: Optional[int] = None, seed: int = 20240501, stock_max: int = 500,
+                 stock_skew: float = 2.0, out_of_stock_ratio: float = 0.05, low_stock_ratio: float = 0.10,
+                 categories_per_product: Tuple[int, int] = (1, 3), supplier_skew: float = 1.0,
+                 batch_size: int = 50_000):
+        low, high = categories_per_product
+        if not 0 <= low <= high <= categories:
+            raise ValueError(f"categories_per_product {categories_per_product} inválido para {categories} categorías.")
+        if out_of_stock_ratio + low_stock_ratio > 1:
+            raise ValueError("out_of_stock_ratio + low_stock_ratio no puede superar 1.")
+        if products and not suppliers:
+            raise ValueError("Se necesita al menos un proveedor para generar productos.")
+        self.products = products
+        self.suppliers = suppliers
+        self.categories = categories
+        self.clients = max(100, products // 100) if clients is None else clients
+        self.seed = seed
+        self.stock_max = max(stock_max, 10)
+        self.stock_skew = stock_skew
+        self.out_of_stock_ratio = out_of_stock_ratio
+        self.low_stock_ratio = low_stock_ratio
+        self.categories_per_product = (low, high)
+        self.supplier_skew = supplier_skew
+        self.batch_size = batch_size
+
+    def rng(self, stream: str) -> random.Random:
+        """Generador aleatorio independiente para cada tabla."""
+        return random.Random(f"{self.seed}-{stream}")
+
+
+def _insert_sql(table: Table, columns: Sequence[str]) -> str:
+    return f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+def _max_id(sync_conn, table: Table) -> int:
+    return sync_conn.exec_driver_sql(f"SELECT coalesce(max(id), 0) FROM {table.name}").scalar()
+
+
+def _batches(first_id: int, count: int, size: int) -> Iterator[range]:
+    for start in range(first_id, first_id + count, size):
+        yield range(start, min(start + size, first_id + count))
+
+
+def _insert(sync_conn, table: Table, columns: Sequence[str], rows: List[tuple]) -> int:
+    if rows:
+        # executemany directo al driver con tuplas: sin construir diccionarios
+        # ni procesar parámetros fila por fila en el ORM.
+        sync_conn.exec_driver_sql(_insert_sql(table, columns), rows)
+    return len(rows)
+
+
+def _stock_picker(rng: random.Random, config: SyntheticConfig) -> Callable[[], int]:
+    """Función sin argumentos que sortea el stock de un producto según la configuración."""
+    uniform = rng.random
+    out_of_stock = config.out_of_stock_ratio
+    low_stock = out_of_stock + config.low_stock_ratio
+    span, skew = config.stock_max - 10, config.stock_skew
+
+    def pick() -> int:
+        roll = uniform()
+        if roll < out_of_stock:
+            return 0
+        if roll < low_stock:
+            return 1 + int(uniform() * 9)
+        return 10 + int(span * uniform() ** skew)
+    return pick
+
+
+def _timestamp_pool(rng: random.Random, size: int = 4096) -> List[str]:
+    """
+    Fechas ya formateadas (dentro de los dos años a partir de _EPOCH) para
+    sortear por índice: formatear una fecha por fila es lo más caro del bucle.
+    """
+    return sorted(
+        (_EPOCH + timedelta(seconds=rng.randrange(2 * 365 * 86400))).strftime(_SQLITE_DATETIME)
+        for _ in range(size)
+    )
+
+
+def _generate_suppliers(sync_conn, config: SyntheticConfig) -> Tuple[int, int]:
+    table = Supplier.__table__
+    first_id = _max_id(sync_conn, table) + 1
+    rows = [
+        (i, f"Proveedor {i}", f"Contacto {i}", f"ventas{i}@proveedor.com", f"555{i:07d}")
+        for i in range(first_id, first_id + config.suppliers)
+    ]
+    _insert(sync_conn, table, ("id", "name", "contact_person", "email", "phone"), rows)
+    return first_id, len(rows)
+
+
+def _generate_categories(sync_conn, config: SyntheticConfig) -> Tuple[int, int]:
+    table = Category.__table__
+    first_id = _max_id(sync_conn, table) + 1
+    rows = [
+        (i, f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i}")
+        for i in range(first_id, first_id + config.categories)
+    ]
+    _insert(sync_conn, table, ("id", "name"), rows)
+    return first_id, len(rows)
+
+
+def _generate_products(sync_conn, config: SyntheticConfig, first_supplier: int,
+                       first_category: int) -> Tuple[int, int]:
+    table = Product.__table__
+    columns = ("id", "sku", "name", "description", "stock", "availability_status", "buying_price",
+               "suggested_price", "measurement_unity", "supplier_id", "location", "image_path", "creation_date")
+    link_columns = ("product_id", "category_id")
+    rng = config.rng("products")
+    first_id = _max_id(sync_conn, table) + 1
+    low, high = config.categories_per_product
+    products = links = 0
+
+    # Los bucles usan rng.random() directamente y valores precalculados: con
+    # randrange/sample/strftime por fila la generación era el cuello de botella.
+    uniform = rng.random
+    pick_stock = _stock_picker(rng, config)
+    timestamps = _timestamp_pool(rng)
+    carats = [f"{tenths / 100:.2f}" for tenths in range(20, 801)]
+    n_gems, n_cuts, n_carats, n_times = len(GEM_NAMES), len(CUTS), len(carats), len(timestamps)
+    n_suppliers, supplier_skew, n_categories = config.suppliers, config.supplier_skew, config.categories
+    fan_out_span = high - low + 1
+
+    for batch in _batches(first_id, config.products, config.batch_size):
+        rows, link_rows = [], []
+        for product_id in batch:
+            gem = GEM_NAMES[int(uniform() * n_gems)]
+            cut = CUTS[int(uniform() * n_cuts)]
+            stock = pick_stock()
+            buying_price = int(uniform() * 498_000 + 2_000) / 100
+            rows.append((
+                product_id, sku_for(product_id), f"{gem} {cut} {carats[int(uniform() * n_carats)]} ct",
+                f"{gem} talla {cut}, pieza {product_id}", stock, "agotado" if stock == 0 else "en_stock",
+                buying_price, round(buying_price * (1.2 + uniform() * 1.3), 2), UNITS[product_id % 3],
+                first_supplier + int(n_suppliers * uniform() ** supplier_skew),
+                f"Vitrina {1 + int(uniform() * 40)}", f"uploads/sintetico/{product_id}.png",
+                timestamps[int(uniform() * n_times)],
+            ))
+            # Categorías distintas: consecutivas (módulo el total) a partir de una al azar.
+            first = int(uniform() * n_categories)
+            for offset in range(low + int(uniform() * fan_out_span)):
+                link_rows.append((product_id, first_category + (first + offset) % n_categories))
+        products += _insert(sync_conn, table, columns, rows)
+        links += _insert(sync_conn, product_category_association, link_columns, link_rows)
+    return products, links
+
+
+def _generate_clients(sync_conn, config: SyntheticConfig) -> int:
+    users, clients = User.__table__, Client.__table__
+    user_columns = ("id", "username", "password_hash", "first_name", "last_name", "email", "phone_number",
+                    "date_of_birth", "creation_date", "role", "status")
+    rng = config.rng("clients")
+    first_id = _max_id(sync_conn, users) + 1
+    # El Enum del ORM guarda el nombre del miembro, no su valor.
+    role = UserRole.CLIENT.name
+    count = 0
+
+    uniform = rng.random
+    timestamps = _timestamp_pool(rng)
+    birthdays = [(datetime(1950, 1, 1) + timedelta(days=days)).strftime(_SQLITE_DATETIME)
+                 for days in range(0, 50 * 365, 7)]
+    n_first, n_last, n_times, n_birthdays = len(FIRST_NAMES), len(LAST_NAMES), len(timestamps), len(birthdays)
+
+    for batch in _batches(first_id, config.clients, config.batch_size):
+        user_rows, client_rows = [], []
+        for user_id in batch:
+            address = f"Calle {1 + int(uniform() * 199)} #{1 + int(uniform() * 99)}-{1 + int(uniform() * 99)}"
+            user_rows.append((
+                user_id, f"cliente{user_id}", "!sintetico", FIRST_NAMES[int(uniform() * n_first)],
+                f"{LAST_NAMES[int(uniform() * n_last)]} {user_id}", f"Cliente{user_id}@Ejemplo.com",
+                f"300{user_id:07d}", birthdays[int(uniform() * n_birthdays)],
+                timestamps[int(uniform() * n_times)], role, "active",
+            ))
+            client_rows.append((user_id, address, address))
+        count += _insert(sync_conn, users, user_columns, user_rows)
+        _insert(sync_conn, clients, ("id", "shipping_address", "billing_address"), client_rows)
+    return count
+
+
+def generate(sync_conn, config: SyntheticConfig) -> Dict[str, Any]:
+    """
+    Genera todos los datos sobre una conexión síncrona (dentro de una transacción;
+    con engines asíncronos usar `await conn.run_sync(generate, config)`).
+    Args:
+        sync_conn: Conexión de SQLAlchemy con el esquema ya creado.
+        config: Volumen y distribuciones.
+    Returns:
+        Un diccionario con las filas insertadas por tabla, los segundos y las filas por segundo.
+    """
+    start = time.perf_counter()
+    # Con millones de filas los índices (sku, name, email...) ya no entran en la
+    # cache por defecto de SQLite (~2 MB) y cada insert lee páginas del disco.
+    # Se agranda mientras dura la generación y luego se restaura, porque la
+    # conexión vuelve al pool.
+    previous_cache = sync_conn.exec_driver_sql("PRAGMA cache_size").scalar()
+    sync_conn.exec_driver_sql(f"PRAGMA cache_size = -{GENERATION_CACHE_KB}")
+    try:
+        first_supplier, suppliers = _generate_suppliers(sync_conn, config)
+        first_category, categories = _generate_categories(sync_conn, config)
+        products, links = _generate_products(sync_conn, config, first_supplier, first_category)
+        clients = _generate_clients(sync_conn, config)
+    finally:
+        sync_conn.exec_driver_sql(f"PRAGMA cache_size = {int(previous_cache)}")
+    elapsed = time.perf_counter() - start
+
+    rows = {
+        "suppliers": suppliers,
+        "categories": categories,
+        "products": products,
+        "product_category_association": links,
+        # Cada cliente ocupa una fila en users y otra en clients.
+        "users": clients,
+        "clients": clients,
+    }
+    total = sum(rows.values())
+    return {"rows": rows, "total_rows": total, "seconds": round(elapsed, 3),
+            "rows_per_second": int(total / elapsed) if elapsed else total}
+
+
+async def populate(async_engine, config: SyntheticConfig, create_schema: bool = True) -> Dict[str, Any]:
+    """
+    Crea el esquema (si se pide) y genera los datos en una sola transacción.
+    Returns:
+        Las estadísticas de generate().
+    """
+    async with async_engine.begin() as conn:
+        if create_schema:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(ensure_indexes)
+        stats = await conn.run_sync(generate, config)
+    logger.info("Datos sintéticos generados: %s filas en %s s (%s filas/s)",
+                stats["total_rows"], stats["seconds"], stats["rows_per_second"])
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de GemTrack para pruebas de carga.")
+    parser.add_argument("--db", required=True, help="Archivo SQLite de destino (se crea si no existe).")
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--suppliers", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--clients", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=20240501)
+    parser.add_argument("--stock-skew", type=float, default=2.0)
+    parser.add_argument("--out-of-stock", type=float, default=0.05)
+    parser.add_argument("--low-stock", type=float, default=0.10)
+    parser.add_argument("--categories-per-product", default="1,3", help="Rango mínimo,máximo.")
+    parser.add_argument("--supplier-skew", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    low, high = (int(value) for value in args.categories_per_product.split(","))
+    config = SyntheticConfig(
+        products=args.products, suppliers=args.suppliers, categories=args.categories, clients=args.clients,
+        seed=args.seed, stock_skew=args.stock_skew, out_of_stock_ratio=args.out_of_stock,
+        low_stock_ratio=args.low_stock, categories_per_product=(low, high), supplier_skew=args.supplier_skew,
+    )
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{args.db}")
+        try:
+            return await populate(engine, config)
+        finally:
+            await engine.dispose()
+
+    stats = asyncio.run(run())
+    for table, count in stats["rows"].items():
+        print(f"{table:<30} {count:>10}")
+    print(f"Total: {stats['total_rows']} filas en {stats['seconds']} s ({stats['rows_per_second']} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
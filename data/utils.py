@@ -1,18 +1,57 @@
 # core/utils.py
+import hashlib
+import os
 import re
+import tempfile
 
-def parse_price_string(price_str: str) -> float:
+def parse_price(price_str: str) -> float:
     """
     Convierte una cadena de precio con separadores de miles a un float.
     Ejemplos: "1.500.000" -> 1500000.0, "1,500,000.50" -> 1500000.50
+    Raises:
+        ValueError: Si la cadena no es un número.
     """
-    if not isinstance(price_str, str):
-        return 0.0
     # Eliminar separadores de miles (puntos o comas)
-    cleaned_str = re.sub(r'[.,](?=\d{3})', '', price_str)
+    cleaned_str = re.sub(r'[.,](?=\d{3})', '', price_str.strip())
     # Reemplazar la coma decimal por un punto si es necesario
     cleaned_str = cleaned_str.replace(',', '.')
+    return float(cleaned_str)
+
+
+def parse_price_string(price_str: str) -> float:
+    """
+    Igual que parse_price, pero devuelve 0.0 si la cadena no es un número.
+    """
+    if not isinstance(price_str, str):
+        return 0.0
     try:
-        return float(cleaned_str)
+        return parse_price(price_str)
     except (ValueError, TypeError):
         return 0.0
+
+
+def copy_with_sha256(src_path: str, dest_dir: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Copia un archivo a `dest_dir` nombrándolo por el hash de su contenido,
+    calculado en la misma pasada que la copia. Dos fotos distintas con el mismo
+    nombre no se pisan y la misma foto subida dos veces ocupa un solo archivo.
+    Returns:
+        El nombre del archivo copiado (16 hex del SHA-256 + extensión original).
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    extension = os.path.splitext(src_path)[1].lower()
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out, open(src_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        name = f"{digest.hexdigest()[:16]}{extension}"
+        # Reemplazo atómico: la vista nunca ve un archivo a medio copiar.
+        os.replace(tmp_path, os.path.join(dest_dir, name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return name
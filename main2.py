@@ -1,33 +1,51 @@
 # main.py
+# El timeline se importa primero para que su origen sea lo más cercano
+# posible al inicio del proceso.
+from core.startup import timeline, lazy_view
+
 import re
 
 import flet as ft
 import os
 import logging # Importar el módulo logging
 
-from views.product_form_view import ProductFormView
-# Importar las vistas
-from views.dashboard_view4 import DashboardView # Asegúrate de que esta es la ruta correcta
-from views.inventory_view2 import InventoryView
-from views.product_add_view import ProductAddView
-# Importar la función de inicialización de la base de datos
-from data.database import init_db
+from core.logging_config import SampledLogger, setup_logging
+from core.overlay_manager import get_overlay_manager
+from core.task_manager import TaskPriority, close_task_managers
+from core.update_scheduler import get_scheduler
+# Future compartido de "base de datos lista" (no importa SQLAlchemy)
+from data.db_ready import db_ready
+# Estadísticas de SQL por acción (tampoco importa SQLAlchemy)
+from data.query_stats import query_stats
+# Estadísticas de renderizado por pantalla y manejador
+from core.ui_stats import ui_stats
+
+# Logging central: un hilo escritor formatea y escribe los registros, así que
+# el event loop solo los encola. Niveles por subsistema con GEMTRACK_LOG_LEVELS
+# (ej. "views=DEBUG,repos=WARNING"), ver core/logging_config.py.
+setup_logging()
+logger = logging.getLogger("main")
+# Arrastrar el borde de la ventana dispara decenas de on_resize por segundo.
+resize_log = SampledLogger(logger, interval=1.0)
 
-# Configurar el logger básico
-# Puedes ajustar el nivel (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-# y el formato según tus necesidades.
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Registrar las vistas de forma perezosa: cada módulo (y con él sus controladores,
+# servicios, repositorios, SQLAlchemy, bcrypt...) se importa solo la primera vez
+# que el usuario navega a esa ruta.
+DashboardView = lazy_view("views.dashboard_view4", "DashboardView")
+InventoryView = lazy_view("views.inventory_view2", "InventoryView")
+ProductFormView = lazy_view("views.product_form_view", "ProductFormView")
+ProductAddView = lazy_view("views.product_add_view", "ProductAddView")
 
 # Obtiene la ruta absoluta al directorio de assets
 assets_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "assets"))
 
-logging.info(f"Directorio de assets configurado: {assets_dir}")
-print(os.path.dirname(__file__))
-
+logger.info("Directorio de assets configurado: %s", assets_dir)
+timeline.mark("imports")
 
 
 async def main(page: ft.Page):
-    logging.info("Iniciando función main de Flet.")
+    logger.info("Iniciando función main de Flet.")
+    timeline.mark("main_start", once=True)
     # Configuración inicial de la página
     page.title = "GemTrack"
     page.vertical_alignment = ft.CrossAxisAlignment.START
@@ -36,84 +54,214 @@ async def main(page: ft.Page):
     page.window_min_width = 400  # Ancho inicial para simular un móvil
     page.window_min_height = 800  # Alto inicial para simular un móvil
     page.window_resizable = True  # Permitir redimensionar la ventana
+    scheduler = get_scheduler(page)
+    overlays = get_overlay_manager(page)
+
+    # Inicializar la base de datos EN SEGUNDO PLANO: el Dashboard no necesita
+    # datos y se pinta de inmediato; las vistas con datos esperan a db_ready.
+    db_ready.start()
+
+    def report_startup():
+        """Loguea y guarda el timeline cuando ya hubo primer pintado y la DB terminó."""
+        db_done = db_ready.is_ready() or db_ready.error() is not None
+        if timeline.has("first_paint") and db_done and timeline.mark("startup_complete", once=True):
+            timeline.log_report()
+            timeline.dump()
+
+    async def report_db_status():
+        try:
+            await db_ready.wait()
+            report_startup()
+            # Escrituras de otros procesos sobre la misma DB (un PRAGMA por intervalo).
+            from data.data_version import start_data_version_watcher
+            start_data_version_watcher()
+        except Exception as e:
+            logger.error("Error crítico al inicializar la base de datos: %s", e, exc_info=True)
+            # El error se muestra en la UI aunque el usuario siga en el Dashboard.
+            page.snack_bar = ft.SnackBar(
+                ft.Text(f"Error al iniciar la base de datos: {e}", color=ft.Colors.WHITE),
+                bgcolor=ft.Colors.RED_500,
+                open=True,
+            )
+            scheduler.mark_dirty()
+            report_startup()
+            return
+
+        # API JSON local para otras herramientas (mismo engine y caches), una por
+        # proceso aunque haya varias sesiones; ver api/local_api.py.
+        if os.environ.get("GEMTRACK_API_PORT"):
+            try:
+                from api.local_api import start_shared_local_api
+                await start_shared_local_api()
+            except Exception as e:
+                logger.error("No se pudo iniciar la API local: %s", e, exc_info=True)
+                page.snack_bar = ft.SnackBar(
+                    ft.Text(f"Error al iniciar la API local: {e}", color=ft.Colors.WHITE),
+                    bgcolor=ft.Colors.RED_500,
+                    open=True,
+                )
+                scheduler.mark_dirty()
+
+    page.run_task(report_db_status)
+
+    def needs_db(route: str) -> bool:
+        """Rutas cuyas vistas leen o escriben en la base de datos."""
+        return route == "/inventory" or route.startswith("/product/")
 
-    # Inicializar la base de datos al inicio de la aplicación
-    try:
-        await init_db()
-        logging.info("Base de datos inicializada correctamente.")
-    except Exception as e:
-        logging.error(f"Error crítico al inicializar la base de datos: {e}", exc_info=True)
-        # Aquí podrías añadir una UI de error o salir de la aplicación
-        page.add(ft.Text(f"Error al iniciar la aplicación: {e}", color=ft.Colors.RED_500))
-        page.update()
-        return # Detener la ejecución si la DB no se inicializa
+    def build_db_waiting_view(route: str) -> ft.View:
+        """Vista temporal con indicador de progreso mientras se inicializa la DB."""
+        return ft.View(
+            route,
+            [
+                ft.ProgressRing(),
+                ft.Text("Preparando la base de datos...", color=ft.Colors.GREY_400),
+            ],
+            bgcolor=ft.Colors.BLACK,
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+    def build_db_error_view(route: str, error: BaseException) -> ft.View:
+        """Vista de error cuando la DB no pudo inicializarse."""
+        return ft.View(
+            route,
+            [
+                ft.Text(f"Error al iniciar la aplicación: {error}", color=ft.Colors.RED_500),
+                ft.TextButton("Volver", on_click=lambda e: page.go("/")),
+            ],
+            bgcolor=ft.Colors.BLACK,
+        )
+
+    async def resume_route_when_db_ready(route: str):
+        """Espera a la DB y vuelve a resolver la ruta si el usuario sigue en ella."""
+        try:
+            await db_ready.wait()
+        except Exception:
+            pass  # route_change mostrará la vista de error
+        if page.route == route:
+            route_change(None)
 
 
     # Función para actualizar la vista al cambiar el tamaño
     def on_resize(e):
-        logging.debug(f"Evento de redimensionamiento detectado. Nuevo tamaño: {page.width}x{page.height}")
+        resize_log.debug("Evento de redimensionamiento detectado. Nuevo tamaño: %sx%s", page.width, page.height)
         try:
             # Reconstruir la vista actual para que se adapte al nuevo tamaño
             # Esta lógica es la que tenías y la mantenemos.
             if page.views and hasattr(page.views[-1], "build_ui"):
-                logging.debug(f"Llamando a build_ui en la vista actual: {page.views[-1].route}")
+                resize_log.debug("Llamando a build_ui en la vista actual: %s", page.views[-1].route)
                 page.views[-1].build_ui()
-            page.update()
-            logging.debug("Página actualizada después de redimensionamiento.")
+            scheduler.mark_dirty()
+            resize_log.debug("Página actualizada después de redimensionamiento.")
         except Exception as ex:
-            logging.error(f"Error al redimensionar la vista: {ex}", exc_info=True)
+            logger.error("Error al redimensionar la vista: %s", ex, exc_info=True)
 
     page.on_resize = on_resize
-    logging.info("Manejador on_resize configurado.")
+    logger.info("Manejador on_resize configurado.")
+
+    # Atajos de depuración (solo existen si la instrumentación correspondiente está activa).
+    debug_shortcuts = {}
+
+    if query_stats.enabled:
+        # Panel de depuración de consultas SQL: Ctrl+Shift+Q lo muestra u oculta.
+        from components.query_stats_overlay import QueryStatsOverlay
+        query_overlay = QueryStatsOverlay(page)
+        page.overlay.append(query_overlay)
+        debug_shortcuts["Q"] = query_overlay.toggle
+        logger.info("Estadísticas de SQL activas: Ctrl+Shift+Q muestra el panel.")
 
+    if ui_stats.enabled:
+        # get_scheduler() ya instrumentó page.update(); Ctrl+Shift+U guarda el reporte por pantalla.
+        def dump_ui_stats():
+            path = ui_stats.dump()
+            for screen in ui_stats.report()["screens"][:5]:
+                logger.info("UI %s: %s actualizaciones, %s ms, %s controles y %s bytes por actualización",
+                            screen["screen"], screen["updates"], screen["total_ms"],
+                            screen["controls_per_update"], screen["payload_per_update"])
+            logger.info("Reporte de renderizado guardado en %s", path)
+
+        debug_shortcuts["U"] = dump_ui_stats
+        logger.info("Estadísticas de renderizado activas: Ctrl+Shift+U guarda el reporte.")
+
+    if debug_shortcuts:
+        def on_keyboard(e: ft.KeyboardEvent):
+            if e.ctrl and e.shift and e.key.upper() in debug_shortcuts:
+                debug_shortcuts[e.key.upper()]()
+
+        page.on_keyboard_event = on_keyboard
 
     # Función para manejar los cambios de ruta
     def route_change(route):
-        logging.info(f"Cambio de ruta detectado. Nueva ruta: {page.route}")
+        logger.info("Cambio de ruta detectado. Nueva ruta: %s", page.route)
+        # Las tareas de las vistas reemplazadas ya no tienen dónde escribir.
+        close_task_managers(page.views)
         page.views.clear()
         try:
             # Ruta para el formulario de edición (ej. /product/edit/123)
             edit_match = re.match(r"/product/edit/(\d+)", page.route)
 
-            if page.route == "/":
-                logging.info("Añadiendo DashboardView a las vistas.")
+            if needs_db(page.route) and not db_ready.is_ready():
+                error = db_ready.error()
+                if error:
+                    logger.error("La ruta %s no está disponible: la DB falló al iniciar.", page.route)
+                    page.views.append(build_db_error_view(page.route, error))
+                else:
+                    # La vista real (y sus imports pesados) se crea cuando la DB esté lista.
+                    logger.info("Ruta %s en espera de la base de datos.", page.route)
+                    page.views.append(build_db_waiting_view(page.route))
+                    page.run_task(resume_route_when_db_ready, page.route)
+            elif page.route == "/":
+                logger.info("Añadiendo DashboardView a las vistas.")
                 page.views.append(DashboardView(page))
             elif page.route == "/inventory":
-                logging.info("Añadiendo InventoryView a las vistas.")
+                logger.info("Añadiendo InventoryView a las vistas.")
                 # 1. Crear la instancia de la vista
                 inventory_view = InventoryView(page)
                 page.views.append(inventory_view)
                 # 2. ¡CAMBIO CLAVE! Llamar explícitamente a la carga de datos
-                # Usamos page.run_task para ejecutar la corutina sin bloquear la UI
-                logging.info("Llamando explícitamente a load_data para InventoryView.")
-                page.run_task(inventory_view.load_data)
+                # La carga corre como tarea de la vista: se cancela si el usuario navega antes de que termine.
+                logger.info("Llamando explícitamente a load_data para InventoryView.")
+                inventory_view.tasks.run(inventory_view.load_data, priority=TaskPriority.HIGH)
             elif page.route == "/product/add":  # Ruta para agregar un nuevo producto
                 # Esta ruta ahora es manejada por el flujo del BottomSheet,
                 # pero la mantenemos por si la necesitamos.
                 # Podemos redirigir o manejarla de forma diferente.
-                logging.info("Ruta /product/add alcanzada, esperando flujo de imagen.")
+                logger.info("Ruta /product/add alcanzada, esperando flujo de imagen.")
                 page.views.append(ProductFormView(page))
             elif page.route == "/product/add_new":  # ¡NUEVA RUTA!
-                logging.info("Añadiendo ProductAddView a las vistas.")
+                logger.info("Añadiendo ProductAddView a las vistas.")
                 page.views.append(ProductAddView(page))
             elif edit_match:  # Si la ruta coincide con el patrón de edición
                 product_id = int(edit_match.group(1))
-                logging.info(f"Añadiendo ProductFormView para editar producto ID: {product_id}")
+                logger.info("Añadiendo ProductFormView para editar producto ID: %s", product_id)
                 page.views.append(ProductFormView(page, product_id=product_id))
             else:
-                logging.warning(f"Ruta no reconocida: {page.route}. Volviendo a la raíz.")
+                logger.warning("Ruta no reconocida: %s. Volviendo a la raíz.", page.route)
                 page.views.append(DashboardView(page))  # Fallback a Dashboard
 
             # Después de cambiar la ruta, forzar una actualización de la vista
             # para que se adapte al tamaño actual de la ventana.
             # Esta lógica es la que tenías y la mantenemos.
+            # Las vistas reemplazadas sueltan sus overlays en este mismo diff
+            # (will_unmount llega recién después de enviarlo).
+            overlays.release_except(page.views)
+
             if page.views and hasattr(page.views[-1], "build_ui"):
-                logging.debug(f"Llamando a build_ui en la nueva vista: {page.views[-1].route}")
+                logger.debug("Llamando a build_ui en la nueva vista: %s", page.views[-1].route)
                 page.views[-1].build_ui()
-            page.update()
-            logging.info(f"Página actualizada para la ruta: {page.route}")
+            if not timeline.has("first_paint"):
+                # La primera ruta no espera al siguiente tick: se envía ya y
+                # queda registrada como primer pintado en el timeline.
+                timeline.mark("first_route", route=page.route)
+                scheduler.mark_dirty()
+                scheduler.flush()
+                timeline.mark("first_paint", once=True)
+                report_startup()
+            else:
+                scheduler.mark_dirty()
+            logger.info("Página actualizada para la ruta: %s", page.route)
         except Exception as ex:
-            logging.error(f"Error crítico en route_change para ruta {page.route}: {ex}", exc_info=True)
+            logger.error("Error crítico en route_change para ruta %s: %s", page.route, ex, exc_info=True)
             # Aquí podrías añadir una UI de error o un mensaje más visible
             page.views.clear()
             page.views.append(ft.View(
@@ -123,15 +271,18 @@ async def main(page: ft.Page):
             ))
 
     page.on_route_change = route_change
-    logging.info("Manejador on_route_change configurado.")
+    logger.info("Manejador on_route_change configurado.")
 
     # Ir a la ruta inicial
-    logging.info(f"Navegando a la ruta inicial: {page.route}")
+    logger.info("Navegando a la ruta inicial: %s", page.route)
     page.go(page.route)
 
 
-# Ejecutar la aplicación Flet
-logging.info("Iniciando aplicación Flet.")
-ft.app(target=main, assets_dir=assets_dir)
-logging.info("Aplicación Flet finalizada.")
+# Ejecutar la aplicación Flet. Solo en el proceso principal: los workers del
+# pool de CPU (core/worker_pool.py) se inician con "spawn" e importan este módulo.
+if __name__ == "__main__":
+    logger.info("Iniciando aplicación Flet.")
+    timeline.mark("app_start")
+    ft.app(target=main, assets_dir=assets_dir)
+    logger.info("Aplicación Flet finalizada.")
 
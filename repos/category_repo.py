@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy.future import select
 from data.models.product_models import Category
 from data.database import AsyncSessionLocal
+from data.read_models import CategorySummary
 from data.crud_operations import get_all_records, get_record_by_id
 
 class CategoryRepository:
@@ -24,6 +25,14 @@ class CategoryRepository:
         """
         return await get_record_by_id(self.session_provider, Category, category_id)
 
+    async def get_summaries(self) -> List[CategorySummary]:
+        """
+        Obtiene las categorías como pares (id, name) para dropdowns, ordenadas por nombre.
+        """
+        async with self.session_provider() as session:
+            result = await session.execute(select(Category.id, Category.name).order_by(Category.name))
+            return [CategorySummary.from_row(row) for row in result.all()]
+
     # Aquí podrías añadir en el futuro métodos para crear, actualizar o eliminar categorías.
 
     # ¡NUEVO MÉTODO!
@@ -1,12 +1,46 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.future import select
-from sqlalchemy import and_
-# Importamos el modelo Client
-from data.models.user_models import Client
+from sqlalchemy import or_, func
+# Importamos el modelo Client (y User para las proyecciones sobre la tabla base)
+from data.models.user_models import Client, User, UserRole
+# Resumen ligero para listados y búsquedas
+from data.read_models import ClientSummary
 # Importamos el proveedor de sesiones de la base de datos
 from data.database import AsyncSessionLocal
 # Importamos las funciones CRUD genéricas
-from data.crud_operations import create_record, get_record_by_id, get_all_records, update_record, delete_record
+from data.crud_operations import (create_record, get_record_by_id, get_all_records, update_record, delete_record,
+                                  loaded_column_values)
+# Eventos de cambio que se publican tras cada escritura confirmada
+from core.change_bus import ChangeKind, publish_change
+
+# Nombre de la entidad en los eventos de cambio.
+CLIENT_ENTITY = "client"
+
+# Columnas de ClientSummary, en el orden de sus campos. Todas viven en la tabla
+# base `users`: la proyección se filtra por rol y no necesita el JOIN con `clients`.
+CLIENT_SUMMARY_COLUMNS = (User.id, User.first_name, User.last_name, User.email, User.phone_number)
+
+
+def client_text_filter(query: str):
+    """Criterio LIKE sobre nombre, apellido y email (el mismo de la búsqueda global)."""
+    like = f"%{query}%"
+    return or_(User.first_name.like(like), User.last_name.like(like), User.email.like(like))
+
+
+def client_summary_query(*criteria, limit: Optional[int] = None):
+    """
+    Consulta de ClientSummary sobre `users` (rol CLIENT), ordenada por apellido y
+    nombre: recorre el índice ix_users_role_name sin ordenar en memoria.
+    """
+    stmt = (
+        select(*CLIENT_SUMMARY_COLUMNS)
+        .where(User.role == UserRole.CLIENT, *criteria)
+        .order_by(User.role, User.last_name, User.first_name)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
 
 class ClientRepository:
     """
@@ -26,7 +60,9 @@ class ClientRepository:
         Returns:
             La instancia de Client creada con su ID asignado.
         """
-        return await create_record(self.session_provider, client)
+        created = await create_record(self.session_provider, client)
+        publish_change(CLIENT_ENTITY, created.id, ChangeKind.CREATED, loaded_column_values(created))
+        return created
 
     async def get_by_id(self, client_id: int) -> Optional[Client]:
         """
@@ -55,7 +91,11 @@ class ClientRepository:
         Returns:
             La instancia de Client actualizada si se encuentra, de lo contrario None.
         """
-        return await update_record(self.session_provider, Client, client_id, new_data)
+        updated = await update_record(self.session_provider, Client, client_id, new_data)
+        if updated:
+            changed = {key: value for key, value in new_data.items() if hasattr(Client, key)}
+            publish_change(CLIENT_ENTITY, client_id, ChangeKind.UPDATED, changed)
+        return updated
 
     async def delete(self, client_id: int) -> bool:
         """
@@ -65,14 +105,18 @@ class ClientRepository:
         Returns:
             True si el cliente fue eliminado, False si no se encontró.
         """
-        return await delete_record(self.session_provider, Client, client_id)
+        deleted = await delete_record(self.session_provider, Client, client_id)
+        if deleted:
+            publish_change(CLIENT_ENTITY, client_id, ChangeKind.DELETED)
+        return deleted
 
     # Aquí se pueden añadir métodos de consulta más específicos si son necesarios,
     # que no encajen en las operaciones CRUD genéricas.
     # Por ejemplo, buscar por email, por nombre, etc.
     async def get_by_email(self, email: str) -> Optional[Client]:
         """
-        Obtiene un cliente por su dirección de correo electrónico.
+        Obtiene un cliente por su dirección de correo electrónico, sin distinguir
+        mayúsculas (usa el índice ix_users_email_lower).
         Args:
             email: La dirección de correo electrónico del cliente a buscar.
         Returns:
@@ -80,6 +124,50 @@ class ClientRepository:
         """
         async with self.session_provider() as session:
             result = await session.execute(
-                select(Client).filter(and_(Client.email == email))
+                select(Client).filter(func.lower(Client.email) == email.lower())
             )
             return result.scalars().first()
+
+    async def get_summaries(self) -> List[ClientSummary]:
+        """
+        Obtiene la lista de clientes para listados, sin cargar entidades ORM.
+        Returns:
+            Una lista de ClientSummary ordenada por apellido y nombre.
+        """
+        return await self._fetch_summaries()
+
+    async def search_summaries(self, query: str, limit: Optional[int] = None) -> List[ClientSummary]:
+        """
+        Busca clientes por nombre, apellido o email, sin cargar entidades ORM.
+        Args:
+            query: La cadena de búsqueda.
+            limit: Máximo de resultados (None para todos).
+        Returns:
+            Una lista de ClientSummary ordenada por apellido y nombre.
+        """
+        return await self._fetch_summaries(client_text_filter(query), limit=limit)
+
+    async def get_summary_page(self, offset: int, limit: int,
+                               query: Optional[str] = None) -> Tuple[List[ClientSummary], int]:
+        """
+        Una página de ClientSummary ordenada por apellido y nombre.
+        Args:
+            offset: Cuántos clientes saltar.
+            limit: Tamaño de la página.
+            query: Filtro de texto opcional (el mismo de search_summaries).
+        Returns:
+            (resúmenes de la página, total de clientes que cumplen el filtro).
+        """
+        criteria = (client_text_filter(query),) if query else ()
+        stmt = client_summary_query(*criteria).order_by(User.id).offset(offset).limit(limit)
+        async with self.session_provider() as session:
+            total = (await session.execute(
+                select(func.count(User.id)).where(User.role == UserRole.CLIENT, *criteria))).scalar()
+            result = await session.execute(stmt)
+            return [ClientSummary.from_row(row) for row in result.all()], total
+
+    async def _fetch_summaries(self, *criteria, limit: Optional[int] = None) -> List[ClientSummary]:
+        stmt = client_summary_query(*criteria, limit=limit)
+        async with self.session_provider() as session:
+            result = await session.execute(stmt)
+            return [ClientSummary.from_row(row) for row in result.all()]
@@ -1,21 +1,97 @@
 # repositories/product_repository.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from sqlalchemy.future import select
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 # Importamos el modelo Product
-from data.models.product_models import Product
+from data.models.product_models import Product, Category, product_category_association
+from data.models.supplier_models import Supplier
+# Proyección ligera para la lista del inventario
+from data.read_models import ProductCardRow, ProductSummary, CATEGORY_SEPARATOR
 # Importamos el proveedor de sesiones de la base de datos
 from data.database import AsyncSessionLocal
 # Importamos las funciones CRUD genéricas
-from data.crud_operations import create_record, get_record_by_id, get_all_records, update_record, delete_record
-from sqlalchemy.orm import selectinload  # ¡CAMBIO CLAVE! Importar selectinload
+from data.crud_operations import (create_record, get_record_by_id, get_all_records, update_record, delete_record,
+                                  loaded_column_values)
+# Eventos de cambio que se publican tras cada escritura confirmada
+from core.change_bus import ChangeKind, publish_change
+from sqlalchemy.orm import selectinload, joinedload, raiseload, load_only  # Estrategias de carga por perfil
+
+# Perfiles de carga: cada caso de uso pide solo las columnas y relaciones que usa.
+#   exists: solo id y sku, sin relaciones (validaciones de existencia/unicidad).
+#   card:   columnas de la tarjeta del inventario + nombres de categorías.
+#   detail: entidad completa con categorías y proveedor (formularios de edición).
+#   export: entidad completa + nombre de categorías y proveedor (exportación).
+# Las relaciones que un perfil no usa llevan raiseload: no se consultan y, si
+# alguien las lee por error, falla en lugar de devolver datos vacíos.
+PRODUCT_LOADER_PROFILES = {
+    "exists": lambda: (
+        load_only(Product.id, Product.sku),
+        raiseload(Product.categories),
+        raiseload(Product.supplier),
+    ),
+    "card": lambda: (
+        load_only(Product.id, Product.name, Product.stock, Product.image_path),
+        selectinload(Product.categories).load_only(Category.id, Category.name),
+        raiseload(Product.supplier),
+    ),
+    "detail": lambda: (
+        selectinload(Product.categories),
+        # Muchos-a-uno: un JOIN en la misma consulta en lugar de un SELECT extra.
+        joinedload(Product.supplier),
+    ),
+    "export": lambda: (
+        selectinload(Product.categories).load_only(Category.id, Category.name),
+        joinedload(Product.supplier).load_only(Supplier.id, Supplier.name),
+    ),
+}
+
+
+def product_loader_options(profile: str) -> tuple:
+    """
+    Devuelve las opciones de carga de un perfil para usarlas en select(Product).options(...).
+    Raises:
+        ValueError: Si el perfil no existe.
+    """
+    try:
+        return PRODUCT_LOADER_PROFILES[profile]()
+    except KeyError:
+        raise ValueError(f"Perfil de carga desconocido: '{profile}'.") from None
+
+# Columnas de ProductSummary, en el orden de sus campos.
+PRODUCT_SUMMARY_COLUMNS = (
+    Product.id, Product.sku, Product.name, Product.description, Product.stock,
+    Product.suggested_price, Product.availability_status, Product.image_path,
+)
+
+
+def product_text_filter(query: str):
+    """Criterio LIKE sobre nombre, SKU y descripción (el mismo de la búsqueda global)."""
+    like = f"%{query}%"
+    return or_(Product.name.like(like), Product.sku.like(like), Product.description.like(like))
+
+
+def product_filter_criteria(filter_type: str) -> list:
+    """Criterios WHERE de cada filtro del inventario ("location" aún no filtra)."""
+    if filter_type == "low_stock":
+        return [or_(Product.stock < 10, Product.stock == 0)]
+    return []
+
+
+# Nombre de la entidad en los eventos de cambio.
+PRODUCT_ENTITY = "product"
 
 class ProductRepository:
     """
     Clase de repositorio para manejar las operaciones de persistencia
     relacionadas con el modelo Product.
     Encapsula la lógica de acceso a datos para los productos.
+    Cada escritura confirmada publica un ChangeEvent (entidad "product") en el
+    bus del proceso, con los campos que cambiaron.
     """
+    # Generación de escrituras del proceso: aumenta con cada create/update/delete.
+    # Las caches la comparan para saber si sus datos siguen vigentes.
+    generation = 0
+
     def __init__(self):
         # El repositorio "conoce" cómo obtener una sesión asíncrona.
         # AsyncSessionLocal es la fábrica de sesiones que se pasará a las funciones CRUD.
@@ -29,7 +105,14 @@ class ProductRepository:
         Returns:
             La instancia de Product creada con su ID asignado.
         """
-        return await create_record(self.session_provider, product)
+        # Las categorías ya están asignadas (y cargadas) antes del commit.
+        category_names = tuple(sorted(category.name for category in product.categories))
+        created = await create_record(self.session_provider, product)
+        ProductRepository._bump_generation()
+        values = loaded_column_values(created)
+        values["category_names"] = category_names
+        publish_change(PRODUCT_ENTITY, created.id, ChangeKind.CREATED, values)
+        return created
 
     async def update(self, product_id: int, new_data: Dict[str, Any]) -> Optional[Product]:
         """
@@ -40,7 +123,13 @@ class ProductRepository:
         Returns:
             La instancia de Product actualizada si se encuentra, de lo contrario None.
         """
-        return await update_record(self.session_provider, Product, product_id, new_data)
+        updated = await update_record(self.session_provider, Product, product_id, new_data)
+        if updated:
+            ProductRepository._bump_generation()
+            # Solo los campos que update_record aplicó (los que existen en el modelo).
+            changed = {key: value for key, value in new_data.items() if hasattr(Product, key)}
+            publish_change(PRODUCT_ENTITY, product_id, ChangeKind.UPDATED, changed)
+        return updated
 
     async def delete(self, product_id: int) -> bool:
         """
@@ -50,76 +139,197 @@ class ProductRepository:
         Returns:
             True si el producto fue eliminado, False si no se encontró.
         """
-        return await delete_record(self.session_provider, Product, product_id)
+        deleted = await delete_record(self.session_provider, Product, product_id)
+        if deleted:
+            ProductRepository._bump_generation()
+            publish_change(PRODUCT_ENTITY, product_id, ChangeKind.DELETED)
+        return deleted
+
+    @classmethod
+    def _bump_generation(cls):
+        cls.generation += 1
+
+    async def get_list_signature(self) -> Tuple[Any, ...]:
+        """
+        Obtiene una firma barata de la tabla de productos: cantidad, id máximo y
+        max(modification_date). Si la firma no cambia, la lista tampoco.
+        Returns:
+            Una tupla (count, max_id, max_modification_date en ISO o None).
+        """
+        async with self.session_provider() as session:
+            result = await session.execute(
+                select(func.count(Product.id), func.max(Product.id), func.max(Product.modification_date))
+            )
+            count, max_id, max_modification = result.one()
+            if max_modification is not None and hasattr(max_modification, "isoformat"):
+                max_modification = max_modification.isoformat()
+            return count, max_id, max_modification
 
-    async def get_by_id(self, product_id: int) -> Optional[Product]:
+    async def get_by_id(self, product_id: int, profile: str = "detail") -> Optional[Product]:
         """
-        Obtiene un producto por su ID, cargando ansiosamente sus relaciones.
+        Obtiene un producto por su ID, cargando lo que indica el perfil.
+        Args:
+            product_id: El ID del producto a buscar.
+            profile: Perfil de carga ("exists", "card", "detail" o "export").
         """
         async with self.session_provider() as session:
             result = await session.execute(
                 select(Product)
-                .options(
-                    selectinload(Product.categories),  # Cargar la lista de categorías
-                    selectinload(Product.supplier)     # Cargar el objeto proveedor
-                )
+                .options(*product_loader_options(profile))
                 .filter(Product.id == product_id)
             )
             return result.scalars().first()
 
-    async def get_all(self) -> List[Product]:
+    async def get_all(self, profile: str = "detail") -> List[Product]:
         """
-        Obtiene todos los productos, cargando ansiosamente sus relaciones.
+        Obtiene todos los productos, cargando lo que indica el perfil.
+        Args:
+            profile: Perfil de carga ("exists", "card", "detail" o "export").
         """
         async with self.session_provider() as session:
             result = await session.execute(
                 select(Product)
-                .options(
-                    selectinload(Product.categories),  # Cargar la lista de categorías
-                    selectinload(Product.supplier)     # Cargar el objeto proveedor
-                )
+                .options(*product_loader_options(profile))
                 .order_by(Product.name) # Es buena práctica ordenar los resultados
             )
-            return result.scalars().all()
+            # unique(): joinedload de una relación puede repetir filas de la entidad.
+            return result.unique().scalars().all()
+
+    async def get_card_rows(self) -> List[ProductCardRow]:
+        """
+        Obtiene la lista del inventario con solo las columnas de la tarjeta
+        (id, nombre, stock, imagen y nombres de categorías) en UNA consulta.
+        No crea entidades ORM ni ejecuta los selectinload de categorías/proveedor.
+        """
+        return await self._fetch_card_rows()
+
+    async def search_card_rows(self, query: str) -> List[ProductCardRow]:
+        """
+        Busca productos por nombre, SKU o descripción y devuelve filas de tarjeta.
+        Args:
+            query: La cadena de búsqueda.
+        Returns:
+            Una lista de ProductCardRow ordenada por nombre.
+        """
+        return await self._fetch_card_rows(product_text_filter(query))
+
+    async def get_filtered_card_rows(self, filter_type: str) -> List[ProductCardRow]:
+        """
+        Versión de get_filtered que devuelve filas de tarjeta en lugar de entidades.
+        Args:
+            filter_type: "all", "low_stock" o "location".
+        Returns:
+            Una lista de ProductCardRow ordenada por nombre.
+        """
+        return await self._fetch_card_rows(*product_filter_criteria(filter_type))
+
+    async def _fetch_card_rows(self, *criteria) -> List[ProductCardRow]:
+        category_names = func.group_concat(Category.name, CATEGORY_SEPARATOR)
+        query = (
+            select(Product.id, Product.name, Product.stock, Product.image_path, category_names)
+            .select_from(Product)
+            .outerjoin(product_category_association, product_category_association.c.product_id == Product.id)
+            .outerjoin(Category, Category.id == product_category_association.c.category_id)
+            .where(*criteria)
+            .group_by(Product.id)
+            .order_by(Product.name)
+        )
+        async with self.session_provider() as session:
+            result = await session.execute(query)
+            return [ProductCardRow.from_row(row) for row in result.all()]
+
+    async def search_summaries(self, query: str, limit: Optional[int] = None) -> List[ProductSummary]:
+        """
+        Busca productos por nombre, SKU o descripción sin cargar entidades ORM.
+        Args:
+            query: La cadena de búsqueda.
+            limit: Máximo de resultados (None para todos).
+        Returns:
+            Una lista de ProductSummary ordenada por nombre.
+        """
+        stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(product_text_filter(query)).order_by(Product.name)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        async with self.session_provider() as session:
+            result = await session.execute(stmt)
+            return [ProductSummary.from_row(row) for row in result.all()]
+
+    async def get_summary_page(self, offset: int, limit: int,
+                               query: Optional[str] = None) -> Tuple[List[ProductSummary], int]:
+        """
+        Una página de ProductSummary ordenada por nombre (e id, para que el orden sea estable).
+        Args:
+            offset: Cuántos productos saltar.
+            limit: Tamaño de la página.
+            query: Filtro de texto opcional (el mismo de search_summaries).
+        Returns:
+            (resúmenes de la página, total de productos que cumplen el filtro).
+        """
+        criteria = (product_text_filter(query),) if query else ()
+        stmt = (select(*PRODUCT_SUMMARY_COLUMNS).where(*criteria)
+                .order_by(Product.name, Product.id).offset(offset).limit(limit))
+        async with self.session_provider() as session:
+            total = (await session.execute(select(func.count(Product.id)).where(*criteria))).scalar()
+            result = await session.execute(stmt)
+            return [ProductSummary.from_row(row) for row in result.all()], total
+
+    async def stream_card_rows(self, first_chunk_size: int = 20, chunk_size: int = 100) -> AsyncIterator[List[ProductCardRow]]:
+        """
+        Versión por bloques de get_card_rows para el renderizado progresivo.
+        Las categorías se agregan con una subconsulta correlacionada en lugar de
+        GROUP BY: así SQLite recorre el índice de nombre en orden y entrega las
+        primeras filas sin ordenar antes toda la tabla.
+        """
+        category_names = (
+            select(func.group_concat(Category.name, CATEGORY_SEPARATOR))
+            .select_from(product_category_association)
+            .join(Category, Category.id == product_category_association.c.category_id)
+            .where(product_category_association.c.product_id == Product.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(Product.id, Product.name, Product.stock, Product.image_path, category_names)
+            .order_by(Product.name)
+        )
+        async with self.session_provider() as session:
+            result = await session.stream(query)
+            size = first_chunk_size
+            while True:
+                rows = await result.fetchmany(size)
+                if not rows:
+                    break
+                yield [ProductCardRow.from_row(row) for row in rows]
+                size = chunk_size
 
     # Aquí se pueden añadir métodos de consulta más específicos si son necesarios,
     # que no encajen en las operaciones CRUD genéricas.
     # Por ejemplo, buscar por SKU, por categoría, etc.
-    async def get_by_sku(self, sku: str) -> Optional[Product]:
+    async def get_by_sku(self, sku: str, profile: str = "detail") -> Optional[Product]:
         """
-        Obtiene un producto por su SKU, cargando ansiosamente sus relaciones.
+        Obtiene un producto por su SKU, cargando lo que indica el perfil.
+        Para validar unicidad basta con profile="exists": una sola consulta de id y sku.
         """
         async with self.session_provider() as session:
             result = await session.execute(
                 select(Product)
-                .options(
-                    selectinload(Product.categories),  # Cargar la lista de categorías
-                    selectinload(Product.supplier)     # Cargar el objeto proveedor
-                )
+                .options(*product_loader_options(profile))
                 .filter(and_(Product.sku == sku))
             )
             return result.scalars().first()
 
         # ¡NUEVO!
 
-    async def get_filtered(self, filter_type: str) -> List[Product]:
+    async def get_filtered(self, filter_type: str, profile: str = "detail") -> List[Product]:
         """
         Obtiene una lista de productos basada en un filtro específico,
-        cargando ansiosamente sus relaciones.
+        cargando lo que indica el perfil.
         """
         async with self.session_provider() as session:
-            # ¡CAMBIO CLAVE! Añadir options() a la consulta base.
-            query = select(Product).options(
-                selectinload(Product.categories),
-                selectinload(Product.supplier)
-            )
+            query = select(Product).options(*product_loader_options(profile))
 
-            if filter_type == "low_stock":
-                query = query.filter(or_(Product.stock < 10, Product.stock == 0))
-            elif filter_type == "location":
-                # Placeholder: podrías filtrar por una ubicación específica
-                pass  # No se aplica filtro adicional
+            # "location" es un placeholder: podrías filtrar por una ubicación específica
+            query = query.filter(*product_filter_criteria(filter_type))
 
             result = await session.execute(query.order_by(Product.name))
-            return result.scalars().all()
+            return result.unique().scalars().all()
 
@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 # Importamos el modelo Supplier y la configuración de la base de datos
 from data.models.supplier_models import Supplier
 from data.database import AsyncSessionLocal
+from data.read_models import SupplierSummary
 # Importamos las operaciones CRUD genéricas
 from data.crud_operations import get_all_records, get_record_by_id
 
@@ -27,6 +28,17 @@ class SupplierRepository:
         """
         return await get_record_by_id(self.session_provider, Supplier, supplier_id)
 
+    async def get_summaries(self) -> List[SupplierSummary]:
+        """
+        Obtiene los proveedores como resúmenes ligeros (dropdowns y listados), ordenados por nombre.
+        """
+        async with self.session_provider() as session:
+            result = await session.execute(
+                select(Supplier.id, Supplier.name, Supplier.contact_person, Supplier.email, Supplier.phone)
+                .order_by(Supplier.name)
+            )
+            return [SupplierSummary.from_row(row) for row in result.all()]
+
     # Aquí podrías añadir en el futuro métodos específicos como:
     # async def create(self, supplier_data: Dict[str, Any]) -> Supplier: ...
     # async def update(self, supplier_id: int, supplier_data: Dict[str, Any]) -> Optional[Supplier]: ...
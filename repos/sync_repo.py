@@ -0,0 +1,229 @@
+# repos/sync_repo.py
+import json
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from data.change_log import (APPLYING_REMOTE, CREATED, DELETED, SYNCED_ENTITIES, SyncedEntity, get_instance_id,
+                             next_clock)
+from data.database import AsyncSessionLocal
+from data.models.product_models import Category
+from data.models.sync_models import ChangeLogEntry, SyncMeta, SyncPeer
+
+logger = logging.getLogger(__name__)
+
+SEEDED_KEY = "change_log_seeded"
+
+# Un cambio en el formato de intercambio: [origin, clock, entidad, clave, tipo, payload].
+WireEntry = List[Any]
+
+
+class SyncRepository:
+    """
+    Acceso a change_log y a las marcas de agua de cada par, y aplicación de los
+    cambios recibidos de otra instancia.
+
+    Resolución de conflictos (la misma en todas las instancias, así convergen):
+    - Campos ("set"): gana el cambio con mayor (clock, origin) que tocó ese campo.
+    - Contadores ("add", el stock): las diferencias se suman, en cualquier orden.
+    - Eliminación: gana sobre las ediciones concurrentes (una edición que llega
+      para un registro ya eliminado se descarta).
+    - Alta y eliminación de una misma clave se ordenan por (clock, origin): un
+      "deleted" no borra un alta posterior ni un "created" revive una baja posterior.
+    """
+
+    def __init__(self):
+        self.session_provider = AsyncSessionLocal
+
+    async def instance_id(self) -> str:
+        """Id de esta instancia (se crea con la primera llamada)."""
+        async with self.session_provider() as session:
+            instance_id = await session.run_sync(lambda s: get_instance_id(s.connection()))
+            await session.commit()
+            return instance_id
+
+    async def seed(self) -> int:
+        """
+        Registra como "created" los productos y clientes que existían antes del
+        change_log (solo la primera vez), para que también se sincronicen.
+        Returns:
+            Cuántos registros se agregaron al change_log.
+        """
+        async with self.session_provider() as session:
+            seeded = await session.run_sync(_seed)
+            await session.commit()
+        if seeded:
+            logger.info("change_log inicializado con %s registros existentes.", seeded)
+        return seeded
+
+    async def changes_since(self, after_seq: int, peer_id: Optional[str] = None,
+                            limit: int = 500) -> Tuple[List[WireEntry], int, bool]:
+        """
+        Cambios con seq > after_seq en orden de registro, sin los que vienen del par.
+        Args:
+            after_seq: Marca de agua del par.
+            peer_id: Par destino: se omiten sus propios cambios y los recibidos de él.
+            limit: Máximo de cambios por lote.
+        Returns:
+            (cambios, nueva marca de agua, si quedan más).
+        """
+        stmt = select(ChangeLogEntry.seq, ChangeLogEntry.origin, ChangeLogEntry.clock, ChangeLogEntry.entity,
+                      ChangeLogEntry.entity_key, ChangeLogEntry.kind, ChangeLogEntry.payload) \
+            .where(ChangeLogEntry.seq > after_seq)
+        if peer_id is not None:
+            stmt = stmt.where(ChangeLogEntry.origin != peer_id,
+                              or_(ChangeLogEntry.received_from.is_(None), ChangeLogEntry.received_from != peer_id))
+        async with self.session_provider() as session:
+            # El máximo se lee ANTES y acota la consulta: cada SELECT ve su propia
+            # instantánea, y un cambio confirmado entre ambas quedaría detrás de la marca.
+            max_seq = (await session.execute(select(func.max(ChangeLogEntry.seq)))).scalar() or 0
+            stmt = stmt.where(ChangeLogEntry.seq <= max_seq).order_by(ChangeLogEntry.seq).limit(limit + 1)
+            rows = (await session.execute(stmt)).all()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        # Sin más cambios para el par, la marca salta también los omitidos (hasta max_seq).
+        next_seq = rows[-1].seq if more else max(after_seq, max_seq)
+        entries = [[r.origin, r.clock, r.entity, r.entity_key, r.kind, json.loads(r.payload)] for r in rows]
+        return entries, next_seq, more
+
+    async def apply(self, entries: List[WireEntry], peer_id: str) -> Tuple[int, int]:
+        """
+        Aplica en una transacción los cambios recibidos de un par.
+        Returns:
+            (aplicados, duplicados ya conocidos).
+        """
+        async with self.session_provider() as session:
+            session.info[APPLYING_REMOTE] = True
+            result = await session.run_sync(_apply_entries, entries, peer_id)
+            await session.commit()
+        return result
+
+    async def get_watermarks(self, peer_id: str) -> Tuple[int, int]:
+        """Marcas de agua (enviado, recibido) del par; (0, 0) si nunca se sincronizó."""
+        async with self.session_provider() as session:
+            peer = await session.get(SyncPeer, peer_id)
+            return (peer.pushed_seq, peer.pulled_seq) if peer else (0, 0)
+
+    async def save_watermarks(self, peer_id: str, pushed_seq: Optional[int] = None,
+                              pulled_seq: Optional[int] = None) -> None:
+        """Guarda las marcas de agua del par (las que no se indiquen no cambian)."""
+        async with self.session_provider() as session:
+            peer = await session.get(SyncPeer, peer_id)
+            if peer is None:
+                peer = SyncPeer(peer_id=peer_id, pushed_seq=0, pulled_seq=0)
+                session.add(peer)
+            if pushed_seq is not None:
+                peer.pushed_seq = pushed_seq
+            if pulled_seq is not None:
+                peer.pulled_seq = pulled_seq
+            await session.commit()
+
+
+def _seed(session: Session) -> int:
+    if session.get(SyncMeta, SEEDED_KEY) is not None:
+        return 0
+    connection = session.connection()
+    origin = get_instance_id(connection)
+    clock = next_clock(connection)
+    logged = set(session.execute(select(ChangeLogEntry.entity, ChangeLogEntry.entity_key).distinct()).all())
+    entries = []
+    for spec in SYNCED_ENTITIES.values():
+        for obj in session.execute(select(spec.model)).scalars():
+            key = str(getattr(obj, spec.key))
+            if (spec.name, key) in logged:
+                continue
+            payload = spec.snapshot(obj)
+            for field, path in spec.relations.items():
+                relation, _, attribute = path.partition(".")
+                payload["set"][field] = sorted(getattr(item, attribute) for item in getattr(obj, relation))
+            entries.append(ChangeLogEntry(origin=origin, clock=clock + len(entries), entity=spec.name,
+                                          entity_key=key, kind=CREATED, payload=json.dumps(payload)))
+    session.add_all(entries)
+    session.add(SyncMeta(key=SEEDED_KEY, value="1"))
+    return len(entries)
+
+
+def _apply_entries(session: Session, entries: List[WireEntry], peer_id: str) -> Tuple[int, int]:
+    applied = duplicates = 0
+    for origin, clock, entity, key, kind, payload in entries:
+        known = session.execute(
+            select(ChangeLogEntry.seq).where(ChangeLogEntry.origin == origin, ChangeLogEntry.clock == clock)
+        ).first()
+        if known is not None:
+            duplicates += 1
+            continue
+        spec = SYNCED_ENTITIES.get(entity)
+        if spec is None:
+            logger.warning("Entidad de sincronización desconocida %r; se ignora el cambio.", entity)
+            continue
+        newer_fields, newer_kinds = _changes_after(session, spec, key, clock, origin)
+        session.add(ChangeLogEntry(origin=origin, clock=clock, entity=entity, entity_key=key, kind=kind,
+                                   payload=json.dumps(payload), received_from=peer_id))
+        _apply_one(session, spec, key, kind, payload, newer_fields, newer_kinds)
+        # Los siguientes cambios del lote ven este (ej. un alta y luego su edición).
+        session.flush()
+        applied += 1
+    return applied, duplicates
+
+
+def _changes_after(session: Session, spec: SyncedEntity, key: str, clock: int,
+                   origin: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Cambios ya registrados de la clave posteriores a (clock, origin).
+    Returns:
+        (campos que ya fijaron, tipos de cambio: created/updated/deleted).
+    """
+    rows = session.execute(
+        select(ChangeLogEntry.kind, ChangeLogEntry.payload).where(
+            ChangeLogEntry.entity == spec.name,
+            ChangeLogEntry.entity_key == key,
+            or_(ChangeLogEntry.clock > clock, and_(ChangeLogEntry.clock == clock, ChangeLogEntry.origin > origin)),
+        )
+    ).all()
+    fields: Set[str] = set()
+    kinds: Set[str] = set()
+    for kind, payload in rows:
+        kinds.add(kind)
+        fields.update(json.loads(payload).get("set", {}))
+    return fields, kinds
+
+
+def _apply_one(session: Session, spec: SyncedEntity, key: str, kind: str, payload: Dict[str, Any],
+               newer_fields: Set[str], newer_kinds: Set[str]) -> None:
+    obj = session.execute(select(spec.model).where(getattr(spec.model, spec.key) == key)).scalars().first()
+    if kind == DELETED:
+        # Un alta posterior de la misma clave (recreada en otro equipo) gana sobre esta baja.
+        if obj is not None and CREATED not in newer_kinds:
+            session.delete(obj)
+        return
+    if obj is None:
+        # Eliminado aquí (la eliminación gana sobre las ediciones), nunca creado, o
+        # un alta anterior a una baja ya registrada: nada que aplicar.
+        if kind != CREATED or DELETED in newer_kinds:
+            return
+        obj = spec.model()
+        setattr(obj, spec.key, key)
+        session.add(obj)
+        newer_fields = set()
+
+    for field, value in payload.get("set", {}).items():
+        if field in newer_fields:
+            continue
+        if field in spec.relations:
+            _set_relation(session, obj, spec, field, value)
+        elif field in spec.decoders:
+            setattr(obj, field, spec.decode(field, value))
+    for field, delta in payload.get("add", {}).items():
+        if field in spec.counters:
+            setattr(obj, field, (getattr(obj, field) or 0) + delta)
+
+
+def _set_relation(session: Session, obj: Any, spec: SyncedEntity, field: str, names: List[str]) -> None:
+    relation = spec.relations[field].partition(".")[0]
+    if relation != "categories":
+        return
+    existing = {c.name: c for c in session.execute(select(Category).where(Category.name.in_(names))).scalars()}
+    # Las categorías se identifican por nombre; las que no existen aquí se crean.
+    obj.categories = [existing.get(name) or Category(name=name) for name in names]
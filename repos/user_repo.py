@@ -1,12 +1,23 @@
 # repos/user_repo.py
+from functools import lru_cache
 from typing import List, Optional
 from sqlalchemy.future import select
 from sqlalchemy import and_
+from sqlalchemy.orm import with_polymorphic
 
 # Importamos los modelos y la configuración de la base de datos
-from data.models.user_models import User, UserRole
+from data.models.user_models import User, UserRole, Client, Admin
 from data.database import AsyncSessionLocal
-from data.crud_operations import get_all_records
+
+@lru_cache(maxsize=None)
+def any_user():
+    """
+    User con las columnas de todos los subtipos: una sola consulta con LEFT OUTER JOIN
+    a clients y admins. Sin esto, las columnas propias de Client/Admin quedan sin
+    cargar y leerlas dispararía una carga perezosa (que falla en sesiones asíncronas).
+    Se crea al primer uso porque with_polymorphic configura todos los mappers.
+    """
+    return with_polymorphic(User, [Client, Admin])
 
 class UserRepository:
     """
@@ -17,17 +28,21 @@ class UserRepository:
 
     async def get_all(self) -> List[User]:
         """
-        Obtiene todos los usuarios.
+        Obtiene todos los usuarios, cada uno con las columnas de su subtipo.
         """
-        return await get_all_records(self.session_provider, User)
+        async with self.session_provider() as session:
+            users = any_user()
+            result = await session.execute(select(users).order_by(users.last_name, users.first_name))
+            return result.scalars().all()
 
     async def get_by_username(self, username: str) -> Optional[User]:
         """
         Obtiene un usuario por su nombre de usuario (esencial para el login).
         """
+        users = any_user()
         async with self.session_provider() as session:
             result = await session.execute(
-                select(User).filter(and_(User.username == username))
+                select(users).filter(and_(users.username == username))
             )
             return result.scalars().first()
 
@@ -35,6 +50,8 @@ class UserRepository:
         """
         Obtiene un usuario por su ID.
         """
+        users = any_user()
         async with self.session_provider() as session:
-            return await session.get(User, user_id)
+            result = await session.execute(select(users).filter(users.id == user_id))
+            return result.scalars().first()
 
@@ -1,6 +1,7 @@
 # services/category_service.py
 from typing import List, Optional
 from data.models.product_models import Category
+from data.read_models import CategorySummary
 from repos.category_repo import CategoryRepository
 
 class CategoryService:
@@ -16,6 +17,12 @@ class CategoryService:
         """
         return await self.category_repo.get_all()
 
+    async def get_category_summaries(self) -> List[CategorySummary]:
+        """
+        Obtiene las categorías como pares (id, name), para dropdowns y filtros.
+        """
+        return await self.category_repo.get_summaries()
+
     async def get_category_by_id(self, category_id: int) -> Optional[Category]:
         """
         Obtiene una categoría por su ID.
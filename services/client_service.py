@@ -1,7 +1,8 @@
 # services/client_service.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 # Importamos el modelo Client
 from data.models.user_models import Client
+from data.read_models import ClientSummary
 # Importamos el repositorio de clientes
 from repos.client_repo import ClientRepository
 
@@ -48,13 +49,14 @@ class ClientService:
         # Usar el repositorio para persistir el cliente
         return await self.client_repo.create(client)
 
-    async def get_clients_list(self) -> List[Client]:
+    async def get_clients_list(self) -> List[ClientSummary]:
         """
-        Obtiene la lista de todos los clientes.
+        Obtiene la lista de todos los clientes para mostrarla.
+        Para editar un cliente se usa get_client_details, que carga la entidad completa.
         Returns:
-            Una lista de instancias de Client.
+            Una lista de ClientSummary.
         """
-        return await self.client_repo.get_all()
+        return await self.client_repo.get_summaries()
 
     async def get_client_details(self, client_id: int) -> Optional[Client]:
         """
@@ -107,22 +109,22 @@ class ClientService:
         # si el cliente tiene transacciones asociadas antes de eliminarlo.
         return await self.client_repo.delete(client_id)
 
-    # Métodos de búsqueda (podrían usar el global_search_db o métodos específicos del repo)
-    async def search_clients(self, query: str) -> List[Client]:
+    # Métodos de búsqueda: devuelven resúmenes, no entidades ORM
+    async def search_clients(self, query: str) -> List[ClientSummary]:
         """
         Busca clientes por nombre, apellido, o email.
         Args:
             query: La cadena de búsqueda.
         Returns:
-            Una lista de instancias de Client que coinciden con la búsqueda.
+            Una lista de ClientSummary que coinciden con la búsqueda.
         """
-        # Similar al ProductService, si global_search_db se usa,
-        # devolverá un dict con 'products' y 'clients'.
-        # Aquí, para mantener la responsabilidad del servicio de clientes,
-        # solo devolveremos los clientes.
-        from services.search import global_search  # Importar aquí para evitar dependencia circular si es necesario
-        search_results = await global_search(self.client_repo.session_provider, query)
-        client_dicts = search_results.get("clients", [])
-        # Convertir los diccionarios a instancias de Client
-        client = [Client.from_dict(c) for c in client_dicts]
-        return client  # Devuelve solo la parte de clientes
+        return await self.client_repo.search_summaries(query)
+
+    async def get_client_summary_page(self, offset: int, limit: int,
+                                      query: Optional[str] = None) -> Tuple[List[ClientSummary], int]:
+        """
+        Obtiene una página de resúmenes de clientes (ej. para la API local).
+        Returns:
+            (resúmenes de la página, total de clientes que cumplen el filtro).
+        """
+        return await self.client_repo.get_summary_page(offset, limit, query)
@@ -0,0 +1,206 @@
+# services/inventory_snapshot.py
+import bisect
+import json
+import logging
+import os
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+from core.change_bus import ChangeEvent, ChangeKind, change_bus
+from core.worker_pool import run_io
+from data.read_models import ProductCardRow
+from repos.product_repo import PRODUCT_ENTITY
+
+logger = logging.getLogger(__name__)
+
+
+# Fila mínima que necesita la tarjeta del inventario: la misma proyección que
+# devuelve ProductRepository.get_card_rows. Comparar dos filas es barato.
+InventoryRow = ProductCardRow
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data",
+                             "inventory_snapshot.json")
+
+
+# Campos de la fila que puede traer un evento de cambio de producto.
+ROW_FIELDS = frozenset(InventoryRow._fields) - {"id"}
+
+
+def row_from_product(product: Any) -> InventoryRow:
+    """Convierte un Product (con categorías cargadas) en una InventoryRow."""
+    return InventoryRow.from_product(product)
+
+
+class InventorySnapshot:
+    """
+    Última lista de inventario conocida.
+    signature: firma de la tabla en la DB (conteo, id máximo, max(modification_date)).
+    generation: generación de escrituras del proceso cuando se tomó (None si vino del archivo).
+    """
+    __slots__ = ("rows", "signature", "generation")
+
+    def __init__(self, rows: List[InventoryRow], signature: Sequence[Any], generation: Optional[int] = None):
+        self.rows = rows
+        self.signature = tuple(signature)
+        self.generation = generation
+
+
+class InventorySnapshotCache:
+    """
+    Guarda en memoria el último snapshot del inventario y, opcionalmente, en un
+    archivo JSON compacto para que el primer arranque también pinte al instante.
+
+    Las filas se cambian copiando la lista (copy-on-write): una vista que está
+    pintando snapshot.rows por bloques, entre awaits, sigue recorriendo la
+    lista que recibió aunque llegue un cambio.
+    """
+
+    def __init__(self, path: Optional[str] = SNAPSHOT_FILE):
+        self.path = path
+        self._snapshot: Optional[InventorySnapshot] = None
+        self._file_checked = False
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[InventorySnapshot]:
+        """
+        Devuelve el snapshot en memoria o, la primera vez, el guardado en disco.
+        Returns:
+            El InventorySnapshot o None si no hay ninguno.
+        """
+        with self._lock:
+            if self._snapshot is None and not self._file_checked:
+                self._file_checked = True
+                self._snapshot = self._load_file()
+            return self._snapshot
+
+    def store(self, snapshot: InventorySnapshot) -> None:
+        """Reemplaza el snapshot en memoria."""
+        with self._lock:
+            self._snapshot = snapshot
+            self._file_checked = True
+
+    def replace_row(self, product_id: int, row: Optional[InventoryRow]) -> Optional[Tuple[int, InventoryRow]]:
+        """
+        Cambia (o quita, con row=None) la fila de un producto en el snapshot en
+        memoria, para reflejar una escritura optimista sin recargar la lista.
+        La firma no se toca: la próxima revalidación confirma contra la DB.
+        Returns:
+            (índice, fila anterior) para deshacer el cambio, o None si el producto no estaba.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            rows = self._snapshot.rows
+            for index, current in enumerate(rows):
+                if current.id == product_id:
+                    break
+            else:
+                return None
+            if row is None:
+                self._snapshot.rows = rows[:index] + rows[index + 1:]
+            else:
+                rows = list(rows)
+                rows[index] = row
+                self._snapshot.rows = rows
+            return index, current
+
+    def restore_row(self, undo: Tuple[int, InventoryRow]) -> None:
+        """Deshace un replace_row (cuando la escritura optimista falló)."""
+        index, row = undo
+        with self._lock:
+            if self._snapshot is None:
+                return
+            rows = list(self._snapshot.rows)
+            for position, current in enumerate(rows):
+                if current.id == row.id:
+                    rows[position] = row
+                    break
+            else:
+                rows.insert(min(index, len(rows)), row)
+            self._snapshot.rows = rows
+
+    def apply_change(self, event: ChangeEvent) -> None:
+        """
+        Suscriptor del bus: aplica al snapshot en memoria un cambio de producto
+        confirmado (parchea, quita o inserta la fila en orden de nombre) para que
+        la próxima visita al inventario lo pinte sin esperar la revalidación.
+        """
+        if event.kind == ChangeKind.INVALIDATED:
+            # Otro proceso escribió (quizás categorías, que la firma de productos
+            # no refleja): las filas se siguen pintando, pero la próxima
+            # revalidación vuelve a leer la lista.
+            with self._lock:
+                if self._snapshot is not None:
+                    self._snapshot.signature = ()
+            return
+        if event.kind == ChangeKind.DELETED:
+            self.replace_row(event.entity_id, None)
+            return
+        changed = {key: value for key, value in event.values.items() if key in ROW_FIELDS}
+        if event.kind == ChangeKind.UPDATED:
+            if not changed:
+                return
+            with self._lock:
+                rows = self._snapshot.rows if self._snapshot is not None else ()
+                current = next((row for row in rows if row.id == event.entity_id), None)
+            if current is not None:
+                self.replace_row(event.entity_id, current._replace(**changed))
+            return
+        if not ROW_FIELDS <= changed.keys():
+            return
+        row = InventoryRow(id=event.entity_id, **changed)
+        with self._lock:
+            if self._snapshot is None or any(r.id == row.id for r in self._snapshot.rows):
+                return
+            rows = list(self._snapshot.rows)
+            # La lista está ordenada por nombre, como la consulta de tarjetas.
+            rows.insert(bisect.bisect_right([r.name for r in rows], row.name), row)
+            self._snapshot.rows = rows
+
+    def invalidate(self) -> None:
+        """Descarta el snapshot en memoria (el archivo se sobrescribe en el próximo persist)."""
+        with self._lock:
+            self._snapshot = None
+
+    async def persist(self) -> None:
+        """Escribe el snapshot actual en disco sin bloquear el event loop."""
+        snapshot = self._snapshot
+        if snapshot is None or not self.path:
+            return
+        await run_io(self._write_file, snapshot)
+
+    def _write_file(self, snapshot: InventorySnapshot) -> None:
+        data = {
+            "v": SNAPSHOT_VERSION,
+            "signature": list(snapshot.signature),
+            "rows": [[r.id, r.name, r.stock, r.image_path, list(r.category_names)] for r in snapshot.rows],
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            # Reemplazo atómico: nunca dejamos un archivo a medio escribir.
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("No se pudo guardar el snapshot del inventario: %s", e)
+
+    def _load_file(self) -> Optional[InventorySnapshot]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("v") != SNAPSHOT_VERSION:
+                return None
+            rows = [InventoryRow(r[0], r[1], r[2], r[3], tuple(r[4])) for r in data["rows"]]
+            logger.info("Snapshot del inventario cargado desde disco: %s productos.", len(rows))
+            return InventorySnapshot(rows, data["signature"])
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+            logger.warning("Snapshot del inventario inválido, se ignora: %s", e)
+            return None
+
+
+# Cache compartida por todas las vistas del proceso.
+inventory_snapshot_cache = InventorySnapshotCache()
+change_bus.subscribe(inventory_snapshot_cache.apply_change, entity=PRODUCT_ENTITY)
@@ -1,15 +1,21 @@
 # services/product_service.py
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 
 # Importamos el modelo Product
 from data.models.product_models import Product
+from data.read_models import ProductCardRow, ProductSummary
+from data.serializers import serialize_many
 # Importamos el repositorio de productos
 from repos.product_repo import ProductRepository
 from repos.category_repo import CategoryRepository # ¡NUEVO! Dependencia necesaria
 from price_parser import parse_price # Importaremos la utilidad de precios
 
 
+# Relaciones que se aplanan al exportar un producto.
+PRODUCT_EXPORT_NESTED = {"category_names": "categories.name", "supplier_name": "supplier.name"}
+
+
 class ProductService:
     """
     Clase de servicio para manejar la lógica de negocio relacionada con los productos.
@@ -40,7 +46,8 @@ class ProductService:
             raise ValueError("El stock no puede ser negativo.")
 
         # Verificar si el SKU ya existe para asegurar unicidad
-        existing_product = await self.product_repo.get_by_sku(sku)
+        # Solo comprobamos existencia: perfil "exists" (una consulta, sin relaciones).
+        existing_product = await self.product_repo.get_by_sku(sku, profile="exists")
         if existing_product:
             raise ValueError(f"Ya existe un producto con el SKU '{sku}'.")
 
@@ -79,6 +86,41 @@ class ProductService:
         """
         return await self.product_repo.get_all()
 
+    async def get_product_cards(self) -> List[ProductCardRow]:
+        """
+        Obtiene la lista de productos proyectada para las tarjetas del inventario.
+        """
+        return await self.product_repo.get_card_rows()
+
+    async def stream_product_cards(self, first_chunk_size: int = 20, chunk_size: int = 100) -> AsyncIterator[List[ProductCardRow]]:
+        """
+        Obtiene la proyección de tarjetas por bloques, para renderizado progresivo.
+        """
+        async for chunk in self.product_repo.stream_card_rows(first_chunk_size, chunk_size):
+            yield chunk
+
+    async def get_list_signature(self) -> Tuple[Any, ...]:
+        """
+        Obtiene la firma actual de la lista de productos (ver ProductRepository.get_list_signature).
+        """
+        return await self.product_repo.get_list_signature()
+
+    def get_data_generation(self) -> int:
+        """Generación de escrituras de productos en este proceso."""
+        return ProductRepository.generation
+
+    async def export_products(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Exporta el catálogo como diccionarios listos para JSON/CSV: fechas en ISO,
+        nombres de categorías y nombre del proveedor aplanados.
+        Args:
+            fields: Columnas a incluir (None para todas).
+        Returns:
+            Una lista de diccionarios, uno por producto.
+        """
+        products = await self.product_repo.get_all(profile="export")
+        return serialize_many(products, fields, PRODUCT_EXPORT_NESTED)
+
     async def get_product_details(self, product_id: int) -> Optional[Product]:
         """
         Obtiene los detalles de un producto específico por su ID.
@@ -89,33 +131,47 @@ class ProductService:
         """
         return await self.product_repo.get_by_id(product_id)
 
-    async def update_existing_product(self, product_id: int, new_data: Dict[str, Any]) -> Product:
+    async def validate_product_update(self, product_id: int, new_data: Dict[str, Any]) -> None:
         """
-        Actualiza un producto existente.
+        Validaciones de negocio de una edición, sin escribir (producto existente,
+        precio y stock no negativos, SKU libre). Son consultas de solo id y sku.
         Args:
             product_id: El ID del producto a actualizar.
-            new_data: Un diccionario con los campos y nuevos valores a actualizar.
-        Returns:
-            La instancia de Product actualizada.
+            new_data: Los campos y nuevos valores del formulario.
         Raises:
             ValueError: Si el producto no se encuentra o si alguna validación falla.
         """
-        # Primero, verificar si el producto existe
-        existing_product = await self.product_repo.get_by_id(product_id)
+        # Solo necesitamos saber que existe y su SKU actual.
+        existing_product = await self.product_repo.get_by_id(product_id, profile="exists")
         if not existing_product:
             raise ValueError(f"Producto con ID {product_id} no encontrado.")
 
-        # Aplicar validaciones de negocio a los datos que se intentan actualizar
         if 'suggested_price' in new_data and new_data['suggested_price'] < 0:
             raise ValueError("El precio sugerido no puede ser negativo.")
         if 'stock' in new_data and new_data['stock'] < 0:
             raise ValueError("El stock no puede ser negativo.")
         if 'sku' in new_data and new_data['sku'] != existing_product.sku:
             # Si se intenta cambiar el SKU, verificar unicidad
-            product_with_new_sku = await self.product_repo.get_by_sku(new_data['sku'])
+            product_with_new_sku = await self.product_repo.get_by_sku(new_data['sku'], profile="exists")
             if product_with_new_sku and product_with_new_sku.id != product_id:
                 raise ValueError(f"El SKU '{new_data['sku']}' ya está en uso por otro producto.")
 
+    async def update_existing_product(self, product_id: int, new_data: Dict[str, Any],
+                                      validate: bool = True) -> Product:
+        """
+        Actualiza un producto existente.
+        Args:
+            product_id: El ID del producto a actualizar.
+            new_data: Un diccionario con los campos y nuevos valores a actualizar.
+            validate: False si el llamador ya ejecutó validate_product_update.
+        Returns:
+            La instancia de Product actualizada.
+        Raises:
+            ValueError: Si el producto no se encuentra o si alguna validación falla.
+        """
+        if validate:
+            await self.validate_product_update(product_id, new_data)
+
         # Usar el repositorio para actualizar el producto
         updated_product = await self.product_repo.update(product_id, new_data)
         if not updated_product:  # Esto no debería ocurrir si ya verificamos la existencia
@@ -134,37 +190,41 @@ class ProductService:
         # si el producto está asociado a alguna venta activa antes de eliminarlo.
         return await self.product_repo.delete(product_id)
 
-    # Métodos de búsqueda (podrían usar el global_search_db o métodos específicos del repo)
-    async def search_products(self, query: str) -> List[Product]:
+    # Métodos de búsqueda: devuelven resúmenes, no entidades ORM
+    async def search_products(self, query: str) -> List[ProductSummary]:
         """
         Busca productos por nombre, descripción o SKU.
         Args:
             query: La cadena de búsqueda.
         Returns:
-            Una lista de instancias de Product que coinciden con la búsqueda.
+            Una lista de ProductSummary que coinciden con la búsqueda.
         """
-        # Para una búsqueda más compleja, podríamos usar el global_search_db
-        # o implementar un método de búsqueda específico en ProductRepository.
-        # Por simplicidad, aquí asumimos que el repositorio puede manejarlo.
-        # Si global_search_db se usa, devolverá un dict con 'products' y 'clients'.
-        # Aquí, para mantener la responsabilidad del servicio de productos,
-        # solo devolveremos los productos.
-
-        # Opción 1: Si ProductRepository tuviera un método search_by_text
-        # return await self.product_repo.search_by_text(query)
+        return await self.product_repo.search_summaries(query)
 
-        # Opción 2: Usando global_search_db y filtrando solo productos
-        from services.search import global_search  # Importar aquí para evitar dependencia circular si es necesario
-        search_results = await global_search(self.product_repo.session_provider, query)
-        product_dicts = search_results.get("products", [])
+    async def get_product_summary_page(self, offset: int, limit: int,
+                                       query: Optional[str] = None) -> Tuple[List[ProductSummary], int]:
+        """
+        Obtiene una página de resúmenes de productos (ej. para la API local).
+        Returns:
+            (resúmenes de la página, total de productos que cumplen el filtro).
+        """
+        return await self.product_repo.get_summary_page(offset, limit, query)
 
-        # Convertir cada dict a Product
-        products = [Product.from_dict(prod) for prod in product_dicts]
+    async def get_product_by_sku(self, sku: str) -> Optional[Product]:
+        """
+        Obtiene un producto por su SKU (ej. lo que lee un escáner de códigos).
+        Returns:
+            La instancia de Product con categorías y proveedor, o None si no existe.
+        """
+        return await self.product_repo.get_by_sku(sku)
 
-        # global_search devuelve diccionarios, convertirlos a objetos Product si es necesario
-        # Esto requeriría un método Product.from_dict() o similar, o simplemente devolver los dicts.
-        # Por ahora, asumimos que los resultados de global_search son suficientes.
-        return products # Devuelve solo la parte de productos
+    async def search_product_cards(self, query: str) -> List[ProductCardRow]:
+        """
+        Igual que search_products, pero con la proyección de la tarjeta del inventario.
+        Returns:
+            Una lista de ProductCardRow que coinciden con la búsqueda.
+        """
+        return await self.product_repo.search_card_rows(query)
 
     async def get_product_by_id(self, product_id: int) -> Optional[Product]:
         """
@@ -187,4 +247,15 @@ class ProductService:
         if filter_type == "all":
             return await self.product_repo.get_all()
         else:
-            return await self.product_repo.get_filtered(filter_type)
\ No newline at end of file
+            return await self.product_repo.get_filtered(filter_type)
+
+    async def get_product_cards_by_filter(self, filter_type: str) -> List[ProductCardRow]:
+        """
+        Versión de get_products_by_filter que devuelve filas de tarjeta.
+        """
+        if filter_type not in ["all", "low_stock", "location", "scan"]:
+            raise ValueError("Tipo de filtro no válido.")
+
+        if filter_type == "all":
+            return await self.product_repo.get_card_rows()
+        return await self.product_repo.get_filtered_card_rows(filter_type)
@@ -1,39 +1,41 @@
 # --- Funciones de Búsqueda Específicas (ejemplo para búsqueda global) ---
 
 from sqlalchemy.future import select
-from typing import List, Dict, Any, Callable
+from typing import Any, List, Dict, Callable, Union
 from data.models.product_models import Product
-from data.models.user_models import Client# Importar modelos específicos para la búsqueda
+from data.read_models import ProductSummary, ClientSummary
+from data.serializers import serialize_many
+# Columnas y criterios compartidos con los repositorios, así la búsqueda global
+# y las búsquedas específicas devuelven exactamente los mismos resúmenes.
+from repos.product_repo import PRODUCT_SUMMARY_COLUMNS, product_text_filter
+from repos.client_repo import client_summary_query, client_text_filter
 
 # Función de búsqueda global que utiliza un proveedor de sesión para realizar consultas
-async def global_search(session_provider: Callable, query: str) -> Dict[str, List[Dict[str, Any]]]:
+async def global_search(session_provider: Callable, query: str) -> Dict[str, List[Union[ProductSummary, ClientSummary]]]:
     """
     Realiza una búsqueda global de productos y clientes usando un proveedor de sesión.
+    Solo se seleccionan las columnas de los resúmenes: no se crean entidades ORM.
     Args:
         session_provider: Función que retorna una AsyncSession.
         query: La cadena de búsqueda.
     Returns:
-        Un diccionario con listas de productos y clientes que coinciden.
+        Un diccionario con listas de ProductSummary y ClientSummary que coinciden.
     """
     async with session_provider() as session:
-        search_query_like = f"%{query}%"
-
         products_result = await session.execute(
-            select(Product).filter(
-                (Product.name.like(search_query_like)) |
-                (Product.sku.like(search_query_like)) |
-                (Product.description.like(search_query_like))
-            )
+            select(*PRODUCT_SUMMARY_COLUMNS).where(product_text_filter(query)).order_by(Product.name)
         )
-        products = [p.to_dict() for p in products_result.scalars().all()]
+        products = [ProductSummary.from_row(row) for row in products_result.all()]
 
-        clients_result = await session.execute(
-            select(Client).filter(
-                (Client.first_name.like(search_query_like)) |
-                (Client.last_name.like(search_query_like)) |
-                (Client.email.like(search_query_like))
-            )
-        )
-        clients = [c.to_dict() for c in clients_result.scalars().all()]
+        clients_result = await session.execute(client_summary_query(client_text_filter(query)))
+        clients = [ClientSummary.from_row(row) for row in clients_result.all()]
+
+        return {"products": products, "clients": clients}
 
-        return {"products": products, "clients": clients}
\ No newline at end of file
+
+def search_results_to_dicts(results: Dict[str, List[Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Convierte el resultado de global_search en diccionarios (ej. para JSON),
+    con el serializador cacheado de cada read model.
+    """
+    return {key: serialize_many(items) for key, items in results.items()}
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 # Importamos el modelo y el repositorio
 from data.models.supplier_models import Supplier
+from data.read_models import SupplierSummary
 from repos.supplier_repo import SupplierRepository
 
 class SupplierService:
@@ -19,6 +20,12 @@ class SupplierService:
         """
         return await self.supplier_repo.get_all()
 
+    async def get_supplier_summaries(self) -> List[SupplierSummary]:
+        """
+        Obtiene los proveedores como resúmenes ligeros, para dropdowns y listados.
+        """
+        return await self.supplier_repo.get_summaries()
+
     async def get_supplier_by_id(self, supplier_id: int) -> Optional[Supplier]:
         """
         Obtiene un proveedor por su ID.
@@ -3,6 +3,7 @@ from typing import List, Optional
 import bcrypt  # Usaremos bcrypt para el manejo de contraseñas
 
 # Importamos el modelo y el repositorio
+from core.worker_pool import run_cpu
 from data.models.user_models import User
 from repos.user_repo import UserRepository
 
@@ -27,8 +28,9 @@ class UserService:
             return None  # Usuario no encontrado
 
         # Verificar la contraseña usando bcrypt
-        # La contraseña del formulario se codifica a bytes para la comparación
-        if bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
+        # La contraseña del formulario se codifica a bytes para la comparación.
+        # bcrypt es lento a propósito (~100-300 ms): corre en el pool de CPU, no en el event loop.
+        if await run_cpu(bcrypt.checkpw, password.encode('utf-8'), user.password_hash.encode('utf-8')):
             return user  # Contraseña correcta
 
         return None  # Contraseña incorrecta
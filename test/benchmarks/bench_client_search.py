@@ -0,0 +1,84 @@
+# test/benchmarks/bench_client_search.py
+"""
+Mide el listado y la búsqueda de clientes sobre una base sintética: la ruta
+anterior (select(Client) con JOIN users/clients y entidades ORM) frente a la
+proyección ClientSummary sobre `users` y la búsqueda de email por lower(email).
+
+Uso:
+    python test/benchmarks/bench_client_search.py [cantidad_de_clientes]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Permite ejecutar el script directamente desde cualquier carpeta.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from data.models.user_models import Client
+from data.synthetic_data import SyntheticConfig, populate
+from repos.client_repo import ClientRepository
+
+
+async def timed(label: str, coro_factory, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await coro_factory()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    size = len(result) if isinstance(result, list) else int(result is not None)
+    print(f"{label:<42} filas={size:>7}  mejor={best:>9.2f} ms")
+    return best
+
+
+async def main(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        # Solo clientes: los emails sintéticos van en mayúsculas y minúsculas mezcladas.
+        await populate(engine, SyntheticConfig(products=0, clients=count))
+        session_provider = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+        repo = ClientRepository()
+        repo.session_provider = session_provider
+        email = f"cliente{count // 2}@ejemplo.com"
+
+        async def old_list():
+            async with session_provider() as session:
+                return (await session.execute(select(Client))).scalars().all()
+
+        async def old_search(query: str):
+            async with session_provider() as session:
+                like = f"%{query}%"
+                result = await session.execute(select(Client).filter(
+                    Client.first_name.like(like) | Client.last_name.like(like) | Client.email.like(like)
+                ))
+                return result.scalars().all()
+
+        async def old_email():
+            # Antes: igualdad exacta; con el email en otra capitalización no lo encontraba.
+            async with session_provider() as session:
+                return (await session.execute(select(Client).filter(Client.email == email))).scalars().first()
+
+        print(f"Clientes sintéticos: {count}")
+        await timed("listado: select(Client) (antes)", old_list, repeat=2)
+        await timed("listado: get_summaries", repo.get_summaries, repeat=2)
+        await timed("búsqueda 'lópez': select(Client) (antes)", lambda: old_search("lópez"))
+        await timed("búsqueda 'lópez': search_summaries", lambda: repo.search_summaries("lópez"))
+        await timed("búsqueda 'lópez': search_summaries(50)", lambda: repo.search_summaries("lópez", limit=50))
+        await timed("email exacto (antes)", old_email)
+        await timed("email sin mayúsculas: get_by_email", lambda: repo.get_by_email(email.upper()))
+
+        async with engine.connect() as conn:
+            plan = await conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM users WHERE lower(email) = :email"), {"email": email})
+            print("Plan lower(email):", "; ".join(row[-1] for row in plan))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
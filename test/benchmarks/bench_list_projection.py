@@ -0,0 +1,56 @@
+# test/benchmarks/bench_list_projection.py
+"""
+Compara ProductRepository.get_all (entidades ORM + selectinload) con la
+proyección de tarjetas get_card_rows sobre un catálogo sintético.
+
+Uso:
+    python test/benchmarks/bench_list_projection.py [cantidad_de_productos]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Permite ejecutar el script directamente desde cualquier carpeta.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from data.synthetic_data import SyntheticConfig, populate
+from repos.product_repo import ProductRepository
+
+
+async def measure(label: str, coro_factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await coro_factory()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} filas={len(result):>7}  tiempo={elapsed_ms:>9.1f} ms  "
+          f"memoria retenida={current / 1e6:>7.1f} MB  pico={peak / 1e6:>7.1f} MB")
+    del result
+    return elapsed_ms, current, peak
+
+
+async def main(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        # 2 categorías por producto y 10 proveedores, como el catálogo original del benchmark.
+        await populate(engine, SyntheticConfig(products=count, suppliers=10, categories=20,
+                                               categories_per_product=(2, 2), clients=0))
+        repo = ProductRepository()
+        repo.session_provider = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+        print(f"Catálogo sintético: {count} productos")
+        orm = await measure("get_all (ORM)", repo.get_all)
+        cards = await measure("get_card_rows", repo.get_card_rows)
+        print(f"Ahorro: tiempo x{orm[0] / cards[0]:.1f}, memoria retenida x{orm[1] / max(cards[1], 1):.1f}, "
+              f"pico x{orm[2] / max(cards[2], 1):.1f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
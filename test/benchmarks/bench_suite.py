@@ -0,0 +1,279 @@
+# test/benchmarks/bench_suite.py
+"""
+Suite de benchmarks de repositorios, servicios y búsqueda sobre catálogos
+sintéticos de distintos tamaños.
+
+Para cada tamaño se siembra una base SQLite temporal (o se reutiliza la de
+--db-cache) y se mide cada operación: latencia p50/p95 y pico de memoria
+(tracemalloc, en una pasada aparte para no distorsionar la latencia).
+Los resultados se comparan con las líneas base guardadas y el script termina
+con código 1 si alguna operación empeora más allá del umbral.
+
+Uso:
+    python test/benchmarks/bench_suite.py                      # 1k y 10k, compara con la base
+    python test/benchmarks/bench_suite.py --sizes 1000,100000 --repeat 30
+    python test/benchmarks/bench_suite.py --update-baseline    # guarda los resultados como base
+    python test/benchmarks/bench_suite.py --sizes 1000000 --db-cache /tmp/gemtrack-bench
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Permite ejecutar el script directamente desde cualquier carpeta.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from data.models.product_models import Product
+from data.synthetic_data import CUTS, GEM_NAMES, SyntheticConfig, populate, sku_for
+from repos.product_repo import ProductRepository
+from services.product_service import ProductService
+from services.search import global_search
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = "1000,10000"
+SEED = 20240501
+# Cambia cuando cambian los datos generados, para no reutilizar bases viejas de --db-cache.
+DATA_VERSION = 2
+
+
+# --- Base sembrada -------------------------------------------------------
+
+async def open_database(size: int, cache_dir: Optional[str], tmp_dir: str, writes: bool = False):
+    """
+    Devuelve un engine sobre una base sembrada de `size` productos (reutilizando la cache).
+    Con --db-cache y operaciones de escritura se mide sobre una copia temporal de
+    la base cacheada: así cada ejecución parte del mismo catálogo y no de uno que
+    crece con las escrituras de las anteriores.
+    """
+    directory = cache_dir or tmp_dir
+    os.makedirs(directory, exist_ok=True)
+    name = f"bench_{size}_{SEED}_v{DATA_VERSION}.db"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        start = time.perf_counter()
+        try:
+            stats = await populate(engine, SyntheticConfig(products=size, seed=SEED))
+        except BaseException:
+            os.remove(path)
+            raise
+        finally:
+            await engine.dispose()
+        print(f"  sembrado en {time.perf_counter() - start:.1f} s, "
+              f"{stats['rows_per_second']} filas/s ({path})")
+    if cache_dir and writes:
+        working_copy = os.path.join(tmp_dir, name)
+        shutil.copyfile(path, working_copy)
+        path = working_copy
+    return create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+
+# --- Operaciones -------------------------------------------------------------
+
+class Context:
+    """Repositorio, servicio y datos de apoyo ligados a la base del benchmark."""
+
+    def __init__(self, engine, size: int):
+        self.size = size
+        self.session_provider = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+        self.repo = ProductRepository()
+        self.repo.session_provider = self.session_provider
+        self.service = ProductService()
+        self.service.product_repo.session_provider = self.session_provider
+        self.service.category_repo.session_provider = self.session_provider
+        self.rng = random.Random(SEED)
+        self.created = 0
+
+
+async def op_get_all(ctx: Context, i: int):
+    return await ctx.repo.get_all()
+
+
+async def op_get_filtered(ctx: Context, i: int):
+    return await ctx.repo.get_filtered("low_stock")
+
+
+async def op_get_by_sku(ctx: Context, i: int):
+    return await ctx.repo.get_by_sku(sku_for(ctx.rng.randrange(ctx.size) + 1))
+
+
+async def op_global_search(ctx: Context, i: int):
+    return await global_search(ctx.session_provider, f"{GEM_NAMES[i % len(GEM_NAMES)]} {CUTS[i % len(CUTS)]} 1.")
+
+
+async def op_create_product(ctx: Context, i: int):
+    ctx.created += 1
+    return await ctx.service.create_new_product({
+        "sku": f"BENCH-{time.time_ns()}-{ctx.created}", "name": f"Nueva gema {ctx.created}",
+        "stock": 5, "suggested_price": 20.0, "buying_price": 12.0, "category_ids": [1, 2],
+    })
+
+
+async def op_update_product(ctx: Context, i: int):
+    product_id = ctx.rng.randrange(ctx.size) + 1
+    return await ctx.service.update_existing_product(product_id, {"stock": i % 40})
+
+
+# (nombre, función, pesada): las pesadas materializan todo el catálogo y se
+# repiten menos veces.
+OPERATIONS = [
+    ("get_all", op_get_all, True),
+    ("get_filtered_low_stock", op_get_filtered, True),
+    ("get_by_sku", op_get_by_sku, False),
+    ("global_search", op_global_search, True),
+    ("create_new_product", op_create_product, False),
+    ("update_existing_product", op_update_product, False),
+]
+# Operaciones que modifican la base sembrada.
+WRITE_OPERATIONS = frozenset({"create_new_product", "update_existing_product"})
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano (sin interpolar)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+async def measure(ctx: Context, func: Callable[[Context, int], Awaitable[Any]], repeat: int,
+                  with_memory: bool) -> Dict[str, float]:
+    await func(ctx, -1)  # calentamiento (caches de SQLAlchemy y de SQLite)
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = await func(ctx, i)
+        samples.append((time.perf_counter() - start) * 1000)
+        del result
+    stats = {"p50_ms": round(percentile(samples, 50), 3), "p95_ms": round(percentile(samples, 95), 3)}
+    if with_memory:
+        tracemalloc.start()
+        result = await func(ctx, repeat)
+        stats["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 3)
+        tracemalloc.stop()
+        del result
+    return stats
+
+
+# --- Líneas base --------------------------------------------------------------
+
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_regressions(results: Dict[str, Dict[str, Dict[str, float]]], baselines: Dict[str, Any],
+                     threshold: float, min_delta_ms: float) -> List[str]:
+    """
+    Compara los resultados con las líneas base.
+    Una operación empeora si su p50 y su p95 (o su pico de memoria) superan la
+    base en más de `threshold` (ej. 0.25 = 25%): exigir ambos percentiles evita
+    falsas alarmas por un único valor atípico en las operaciones pesadas, que
+    se repiten pocas veces. Las diferencias menores que `min_delta_ms` se
+    consideran ruido.
+    Returns:
+        Una descripción por cada regresión encontrada.
+    """
+    regressions = []
+    for size, operations in results.items():
+        for name, current in operations.items():
+            base = baselines.get("results", {}).get(size, {}).get(name)
+            if not base:
+                continue
+            worse = [
+                key for key in ("p50_ms", "p95_ms")
+                if current[key] > base[key] * (1 + threshold) and current[key] - base[key] > min_delta_ms
+            ]
+            if len(worse) == 2:
+                regressions.append(f"{size} {name}: p50 {base['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms, "
+                                   f"p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+            if "peak_mb" in current and "peak_mb" in base and current["peak_mb"] > base["peak_mb"] * (1 + threshold) \
+                    and current["peak_mb"] - base["peak_mb"] > 1:
+                regressions.append(f"{size} {name}: pico {base['peak_mb']:.1f} -> {current['peak_mb']:.1f} MB")
+    return regressions
+
+
+# --- Principal -----------------------------------------------------------------
+
+async def run_suite(args) -> int:
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    selected = set(args.only.split(",")) if args.only else None
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writes = any(name in WRITE_OPERATIONS and (not selected or name in selected) for name, _, _ in OPERATIONS)
+        for size in sizes:
+            print(f"Catálogo de {size} productos")
+            engine = await open_database(size, args.db_cache, tmp_dir, writes)
+            ctx = Context(engine, size)
+            async with ctx.session_provider() as session:
+                total = (await session.execute(select(func.count(Product.id)))).scalar_one()
+            results[str(size)] = {}
+            for name, func_, heavy in OPERATIONS:
+                if selected and name not in selected:
+                    continue
+                repeat = args.heavy_repeat if heavy else args.repeat
+                stats = await measure(ctx, func_, repeat, not args.no_memory)
+                results[str(size)][name] = stats
+                memory = f"  pico={stats['peak_mb']:>9.2f} MB" if "peak_mb" in stats else ""
+                print(f"  {name:<26} p50={stats['p50_ms']:>10.2f} ms  p95={stats['p95_ms']:>10.2f} ms{memory}")
+            print(f"  ({total} productos antes de las escrituras del benchmark)")
+            await engine.dispose()
+
+    if args.update_baseline:
+        baselines = load_baselines(args.baseline)
+        baselines.setdefault("results", {}).update(results)
+        baselines["updated"] = datetime.now().isoformat()
+        baselines["python"] = platform.python_version()
+        baselines["platform"] = sys.platform
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Líneas base guardadas en {args.baseline}")
+        return 0
+
+    baselines = load_baselines(args.baseline)
+    if not baselines:
+        print("No hay líneas base; ejecuta con --update-baseline para crearlas.")
+        return 0
+    regressions = find_regressions(results, baselines, args.threshold, args.min_delta_ms)
+    if regressions:
+        print("REGRESIONES (umbral {:.0%}):".format(args.threshold))
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("Sin regresiones respecto a las líneas base.")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmarks de GemTrack sobre catálogos sintéticos.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Tamaños de catálogo separados por coma (ej. 1000,10000,100000,1000000).")
+    parser.add_argument("--only", default="", help="Operaciones a medir, separadas por coma.")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeticiones de las operaciones ligeras.")
+    parser.add_argument("--heavy-repeat", type=int, default=5, help="Repeticiones de las operaciones pesadas.")
+    parser.add_argument("--no-memory", action="store_true", help="No medir el pico de memoria.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Archivo JSON de líneas base.")
+    parser.add_argument("--update-baseline", action="store_true", help="Guardar los resultados como líneas base.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento tolerado (0.25 = 25%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Diferencias menores se consideran ruido.")
+    parser.add_argument("--db-cache", default=None,
+                        help="Carpeta donde conservar las bases sembradas entre ejecuciones (recomendado para 1M).")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_suite(parse_args())))
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from data.models.base_model import Base
+# Importar los modelos para que sus tablas queden registradas en Base.metadata
+from data.models import product_models, supplier_models, sync_models, user_models  # noqa: F401
+# Registro de cambios para la sincronización (after_flush de las sesiones)
+import data.change_log  # noqa: F401
+
+
+@pytest.fixture
+def session_provider(tmp_path):
+    """Fábrica de sesiones asíncronas sobre una base de datos SQLite temporal."""
+    # NullPool: cada prueba usa su propio event loop (asyncio.run), así que no
+    # reutilizamos conexiones de aiosqlite entre loops.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'gemtrack_test.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False, class_=AsyncSession)
+    asyncio.run(engine.dispose())
@@ -0,0 +1,35 @@
+"""Dobles de Flet compartidos por las pruebas de UI."""
+from flet.core.connection import Connection
+from flet.core.protocol import PageCommandsBatchResponsePayload
+
+
+class FakeConnection(Connection):
+    """Conexión mínima: asigna ids a los controles agregados como lo haría el cliente."""
+
+    def __init__(self, pubsubhub=None):
+        super().__init__()
+        self.next_id = 0
+        if pubsubhub is not None:
+            # Hub compartido por varias páginas (sesiones) de la misma prueba.
+            self.pubsubhub = pubsubhub
+
+    def send_commands(self, session_id, commands):
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = []
+                for _ in command.commands:
+                    self.next_id += 1
+                    ids.append(f"_{self.next_id}")
+                results.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+class MemoryStorage(dict):
+    """client_storage en memoria: la conexión falsa no responde invokeMethod."""
+
+    def set(self, key, value):
+        self[key] = value
+
+    def remove(self, key):
+        self.pop(key, None)
@@ -0,0 +1,97 @@
+import asyncio
+import gc
+
+import flet as ft
+from flet.core.pubsub.pubsub_hub import PubSubHub
+
+from core.change_bus import ChangeBus, ChangeEvent, ChangeKind, change_bus
+from data.models.product_models import Category
+from services.inventory_snapshot import InventorySnapshot, InventorySnapshotCache
+from services.product_service import ProductService
+from fakes import FakeConnection
+from views.inventory_view2 import InventoryView
+
+
+class Listener:
+    def __init__(self):
+        self.events = []
+
+    def on_change(self, event):
+        self.events.append(event)
+
+
+def test_bus_filters_by_entity_isolates_failures_and_drops_dead_subscribers():
+    bus = ChangeBus()
+    listener, everything = Listener(), []
+    bus.subscribe(listener.on_change, entity="product")
+    unsubscribe = bus.subscribe(everything.append)
+
+    assert bus.publish(ChangeEvent("client", 1, ChangeKind.DELETED)) == 1
+    assert bus.publish(ChangeEvent("product", 2, "updated", {"stock": 3})) == 2
+    assert [(e.entity_id, e.fields) for e in listener.events] == [(2, frozenset({"stock"}))]
+    assert [e.entity for e in everything] == ["client", "product"]
+
+    unsubscribe()
+    unsubscribe()
+    del listener
+    gc.collect()
+    assert bus.subscriber_count() == 0
+
+    def broken(event):
+        raise RuntimeError("suscriptor roto")
+
+    survivor = []
+    bus.subscribe(broken)
+    bus.subscribe(survivor.append)
+    assert bus.publish(ChangeEvent("product", 3, ChangeKind.DELETED)) == 1
+    assert bus.failed == 1 and [e.entity_id for e in survivor] == [3]
+
+
+def test_repository_writes_patch_the_open_inventory_and_the_snapshot(session_provider):
+    cache = InventorySnapshotCache(path=None)
+    unsubscribe = change_bus.subscribe(cache.apply_change, entity="product")
+    events = Listener()
+    change_bus.subscribe(events.on_change, entity="product")
+    service = ProductService()
+    service.product_repo.session_provider = session_provider
+    service.category_repo.session_provider = session_provider
+
+    async def run():
+        async with session_provider() as session:
+            session.add(Category(name="Anillos"))
+            await session.commit()
+        for name, sku in (("Ambar", "A-1"), ("Jade", "J-1")):
+            await service.create_new_product({"name": name, "sku": sku, "stock": 5, "category_ids": [1]})
+
+        page = ft.Page(FakeConnection(PubSubHub(asyncio.get_running_loop())), "s1", asyncio.get_running_loop())
+        view = InventoryView(page)
+        rows = await service.get_product_cards()
+        cache.store(InventorySnapshot(list(rows), ("firma",), 0))
+        view._apply_rows(rows)
+        page.views.append(view)
+        page.update()
+        cards = list(view.products_list_container.controls)
+
+        # Escrituras desde otro servicio: la vista no recarga, solo aplica los eventos.
+        created = await service.create_new_product({"name": "Cuarzo", "sku": "C-1", "stock": 2, "category_ids": [1]})
+        await service.update_existing_product(rows[1].id, {"stock": 0})
+        await service.remove_product(rows[0].id)
+        # Los deltas llegan a la sesión por pubsub, en tareas del event loop.
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return view, rows, cards, created
+
+    try:
+        view, rows, cards, created = asyncio.run(run())
+    finally:
+        unsubscribe()
+
+    assert [(e.kind, e.entity_id) for e in events.events[-3:]] == [
+        (ChangeKind.CREATED, created.id), (ChangeKind.UPDATED, rows[1].id), (ChangeKind.DELETED, rows[0].id)]
+    shown = [row for row, _ in view._cards_by_id.values()]
+    assert sorted((r.name, r.stock, r.category_names) for r in shown) == [
+        ("Cuarzo", 2, ("Anillos",)), ("Jade", 0, ("Anillos",))]
+    controls = view.products_list_container.controls
+    # "Cuarzo" se insertó en orden antes de "Jade"; solo la tarjeta de "Jade" se reconstruyó.
+    assert controls[0] is view._cards_by_id[created.id][1] and cards[1] not in controls and len(controls) == 2
+    assert [(r.name, r.stock) for r in cache.get().rows] == [("Cuarzo", 2), ("Jade", 0)]
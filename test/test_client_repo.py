@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime
+
+from data.models.user_models import Admin, Client, DepartmentEnum, PermissionEnum, UserRole
+from data.database import ensure_indexes
+from repos.client_repo import ClientRepository
+from repos.user_repo import UserRepository
+
+
+def _person(cls, username: str, first_name: str, last_name: str, **extra):
+    return cls(username=username, password_hash="x", first_name=first_name, last_name=last_name,
+               email=f"{username}@Example.com", phone_number="555", date_of_birth=datetime(1990, 1, 1), **extra)
+
+
+async def _seed(session_provider):
+    async with session_provider() as session:
+        session.add_all([
+            _person(Client, "zoe", "Zoe", "Zapata", role=UserRole.CLIENT, shipping_address="Calle 1"),
+            _person(Client, "ana", "Ana", "Arias", role=UserRole.CLIENT),
+            _person(Admin, "root", "Rita", "Admin", role=UserRole.ADMIN,
+                    permissions=PermissionEnum.ADMIN, department=DepartmentEnum.IT),
+        ])
+        await session.commit()
+
+
+def test_client_projection_skips_admins_and_email_lookup_ignores_case(session_provider):
+    async def run():
+        await _seed(session_provider)
+        repo = ClientRepository()
+        repo.session_provider = session_provider
+        return await repo.get_summaries(), await repo.search_summaries("a", limit=1), await repo.get_by_email("ZOE@example.COM")
+
+    summaries, limited, by_email = asyncio.run(run())
+    assert [s.last_name for s in summaries] == ["Arias", "Zapata"]
+    assert [s.first_name for s in limited] == ["Ana"]
+    assert by_email.username == "zoe" and by_email.shipping_address == "Calle 1"
+
+
+def test_user_repository_loads_subtype_columns_in_one_query(session_provider):
+    async def run():
+        await _seed(session_provider)
+        repo = UserRepository()
+        repo.session_provider = session_provider
+        return await repo.get_all(), await repo.get_by_username("root")
+
+    users, admin = asyncio.run(run())
+    assert [(type(u).__name__, u.last_name) for u in users] == [
+        ("Admin", "Admin"), ("Client", "Arias"), ("Client", "Zapata"),
+    ]
+    # Las columnas de cada subtipo ya están cargadas aunque la sesión esté cerrada.
+    assert users[2].shipping_address == "Calle 1"
+    assert admin.department is DepartmentEnum.IT
+
+
+def test_ensure_indexes_is_idempotent_with_expression_indexes(session_provider):
+    engine = session_provider.kw["bind"]
+
+    async def run():
+        for _ in range(2):
+            async with engine.begin() as conn:
+                await conn.run_sync(ensure_indexes)
+        async with engine.connect() as conn:
+            rows = await conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")
+            return {row[0] for row in rows}
+
+    assert {"ix_users_email_lower", "ix_users_role_name", "ix_products_name"} <= asyncio.run(run())
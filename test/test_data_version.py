@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core.change_bus import ChangeKind, change_bus
+from data.data_version import DataVersionWatcher
+from services.inventory_snapshot import InventorySnapshot, InventorySnapshotCache
+
+
+def test_only_writes_from_other_processes_invalidate_the_caches(session_provider):
+    engine = session_provider.kw["bind"]
+    # Otro proceso: un engine independiente sobre el mismo archivo.
+    other_process = create_async_engine(engine.url, poolclass=NullPool)
+    cache = InventorySnapshotCache(path=None)
+    cache.store(InventorySnapshot([], ("firma",), 0))
+    unsubscribe = change_bus.subscribe(cache.apply_change)
+    events = []
+    unsubscribe_events = change_bus.subscribe(events.append)
+
+    async def write(target):
+        async with target.begin() as conn:
+            await conn.execute(text("INSERT INTO categories (name) VALUES ('c' || random())"))
+
+    async def run():
+        watcher = DataVersionWatcher(engine, interval=0.01)
+        try:
+            first = await watcher.check()
+            await write(engine)
+            local = await watcher.check()
+            idle = await watcher.check()
+            await write(other_process)
+            external = await watcher.check()
+            return first, local, idle, external, watcher.stats()
+        finally:
+            await watcher.stop()
+            await other_process.dispose()
+
+    try:
+        first, local, idle, external, stats = asyncio.run(run())
+    finally:
+        unsubscribe()
+        unsubscribe_events()
+
+    assert (first, local, idle, external) == (False, False, False, True)
+    assert stats["checks"] == 4 and stats["external_changes"] == 1
+    assert [(e.entity, e.kind) for e in events] == [(None, ChangeKind.INVALIDATED)]
+    # La próxima revalidación del inventario vuelve a leer la lista.
+    assert cache.get().signature == ()
+
+
+def test_local_commit_racing_the_pragma_read_is_not_taken_as_external(session_provider):
+    engine = session_provider.kw["bind"]
+    path = engine.url.database
+    events = []
+    unsubscribe = change_bus.subscribe(events.append)
+
+    async def run():
+        watcher = DataVersionWatcher(engine, interval=0.01)
+        race = []
+
+        def local_commit():
+            # Lo que hace un commit de este proceso: el evento "commit" y luego la escritura.
+            watcher._on_local_commit(None)
+            with sqlite3.connect(path) as conn:
+                conn.execute("INSERT INTO categories (name) VALUES ('c' || random())")
+
+        def around_pragma(when):
+            def listener(conn, cursor, statement, *args):
+                if statement == "PRAGMA data_version" and race == [when]:
+                    race.clear()
+                    local_commit()
+            return listener
+
+        listeners = [("before_cursor_execute", around_pragma("before")),
+                     ("after_cursor_execute", around_pragma("after"))]
+        for name, listener in listeners:
+            event.listen(engine.sync_engine, name, listener)
+        try:
+            results = [await watcher.check()]
+            # El commit cae justo después de leer el pragma, y luego justo antes.
+            for when in ("after", "before"):
+                race.append(when)
+                results += [await watcher.check(), await watcher.check()]
+            return results
+        finally:
+            for name, listener in listeners:
+                event.remove(engine.sync_engine, name, listener)
+            await watcher.stop()
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        unsubscribe()
+    assert results == [False] * 5 and events == []
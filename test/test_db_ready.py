@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from data.db_ready import DatabaseReadiness
+
+
+class FailingReadiness(DatabaseReadiness):
+    async def _initialize(self):
+        await asyncio.sleep(0)
+        raise RuntimeError("disco lleno")
+
+
+class SlowReadiness(DatabaseReadiness):
+    async def _initialize(self):
+        await asyncio.sleep(0.01)
+
+
+def test_wait_shares_one_initialization():
+    async def run():
+        readiness = SlowReadiness()
+        first = readiness.start()
+        assert readiness.start() is first
+        assert not readiness.is_ready()
+        await asyncio.gather(readiness.wait(), readiness.wait())
+        return readiness
+
+    readiness = asyncio.run(run())
+    assert readiness.is_ready()
+    assert readiness.error() is None
+
+
+def test_initialization_error_is_surfaced():
+    async def run():
+        readiness = FailingReadiness()
+        with pytest.raises(RuntimeError):
+            await readiness.wait()
+        return readiness
+
+    readiness = asyncio.run(run())
+    assert not readiness.is_ready()
+    assert isinstance(readiness.error(), RuntimeError)
+
+
+def test_cancelled_waiter_does_not_cancel_initialization():
+    async def run():
+        readiness = SlowReadiness()
+        waiter = asyncio.ensure_future(readiness.wait())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await readiness.wait()
+        return readiness
+
+    assert asyncio.run(run()).is_ready()
@@ -0,0 +1,64 @@
+import asyncio
+
+from core.change_bus import ChangeEvent, ChangeKind
+from data.models.product_models import Product
+from repos.product_repo import ProductRepository
+from services.inventory_snapshot import InventoryRow, InventorySnapshot, InventorySnapshotCache
+
+
+def test_snapshot_persists_to_compact_file(tmp_path):
+    path = tmp_path / "inventory_snapshot.json"
+    rows = [InventoryRow(1, "Zafiro", 3, "uploads/z.png", ("Piedras",)), InventoryRow(2, "Rubí", 0, None, ())]
+    cache = InventorySnapshotCache(str(path))
+    cache.store(InventorySnapshot(rows, (2, 2, None), generation=5))
+    asyncio.run(cache.persist())
+
+    cold = InventorySnapshotCache(str(path)).get()
+    assert cold.rows == rows
+    assert cold.signature == (2, 2, None)
+    # La generación es del proceso: no se guarda en disco.
+    assert cold.generation is None
+
+
+def test_corrupt_snapshot_file_is_ignored(tmp_path):
+    path = tmp_path / "inventory_snapshot.json"
+    path.write_text("{no es json")
+    assert InventorySnapshotCache(str(path)).get() is None
+
+
+def test_list_signature_changes_on_writes(session_provider):
+    repo = ProductRepository()
+    repo.session_provider = session_provider
+
+    async def run():
+        empty = await repo.get_list_signature()
+        product = await repo.create(Product(sku="SKU-1", name="Topacio", stock=1))
+        created = await repo.get_list_signature()
+        await repo.update(product.id, {"stock": 2})
+        updated = await repo.get_list_signature()
+        await repo.delete(product.id)
+        deleted = await repo.get_list_signature()
+        return empty, created, updated, deleted
+
+    generation = ProductRepository.generation
+    empty, created, updated, deleted = asyncio.run(run())
+    assert empty == (0, None, None)
+    assert created != empty
+    assert updated != created
+    assert deleted != updated
+    assert ProductRepository.generation == generation + 3
+
+
+def test_changes_leave_the_rows_a_reader_already_holds_untouched():
+    rows = [InventoryRow(1, "Ámbar", 3, None, ()), InventoryRow(2, "Rubí", 0, None, ())]
+    cache = InventorySnapshotCache(path=None)
+    cache.store(InventorySnapshot(list(rows), (2, 2, None)))
+    # Una vista que pinta por bloques recorre esta lista entre awaits.
+    rendering = cache.get().rows
+    cache.apply_change(ChangeEvent("product", 3, ChangeKind.CREATED,
+                                   {"name": "Jade", "stock": 1, "image_path": None, "category_names": ()}))
+    cache.apply_change(ChangeEvent("product", 1, ChangeKind.DELETED))
+    undo = cache.replace_row(2, rows[1]._replace(stock=9))
+    cache.restore_row(undo)
+    assert rendering == rows
+    assert [(r.id, r.stock) for r in cache.get().rows] == [(3, 1), (2, 0)]
@@ -0,0 +1,111 @@
+import asyncio
+import gc
+import weakref
+from datetime import datetime
+
+import flet as ft
+from flet.core.pubsub.pubsub_hub import PubSubHub
+
+from core.change_bus import ChangeEvent, ChangeKind
+import core.live_updates as live_updates
+from core.live_updates import decode_delta, encode_delta, get_live_updates
+from data.synthetic_data import SyntheticConfig, generate
+from repos.product_repo import ProductRepository
+from services.product_service import ProductService
+from fakes import FakeConnection
+from views.inventory_view2 import InventoryView
+
+
+async def _deliver():
+    """Deja correr las tareas que pubsub programó en el event loop."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_delta_keeps_only_simple_values():
+    event = ChangeEvent("product", 7, ChangeKind.CREATED,
+                        {"name": "Ópalo", "stock": 3, "category_names": ["Aretes"], "creation_date": datetime.now()})
+    delta = encode_delta(event)
+    assert delta == ("product", 7, "c", {"name": "Ópalo", "stock": 3, "category_names": ("Aretes",)})
+    decoded = decode_delta(delta)
+    assert (decoded.entity, decoded.entity_id, decoded.kind, decoded.fields) == (
+        "product", 7, ChangeKind.CREATED, frozenset({"name", "stock", "category_names"}))
+
+
+def test_every_open_inventory_patches_its_cards_without_requerying(session_provider, monkeypatch):
+    async def seed():
+        async with session_provider.kw["bind"].begin() as conn:
+            await conn.run_sync(generate, SyntheticConfig(products=4, suppliers=1, categories=3, clients=1))
+
+    asyncio.run(seed())
+    writer = ProductService()
+    writer.product_repo.session_provider = session_provider
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        hub = PubSubHub(loop)
+        rows = await writer.get_product_cards()
+        sessions = []
+        for session_id in ("s1", "s2"):
+            page = ft.Page(FakeConnection(hub), session_id, loop)
+            view = InventoryView(page)
+            view._apply_rows(rows)
+            page.views.append(view)
+            page.update()
+            sessions.append((page, view, get_live_updates(page)))
+
+        async def no_requery(*args, **kwargs):
+            raise AssertionError("ninguna sesión debe volver a consultar el catálogo")
+
+        monkeypatch.setattr(ProductRepository, "get_card_rows", no_requery)
+        monkeypatch.setattr(ProductRepository, "stream_card_rows", no_requery)
+
+        # Escribe la sesión s1; s2 (y la propia s1) reciben el delta por pubsub.
+        await writer.update_existing_product(rows[0].id, {"stock": 42, "name": "Turmalina"})
+        await writer.remove_product(rows[1].id)
+        await _deliver()
+
+        # Una sesión cerrada deja de recibir cambios.
+        sessions[1][0]._close()
+        await writer.update_existing_product(rows[2].id, {"stock": 1})
+        await _deliver()
+        return rows, sessions
+
+    rows, sessions = asyncio.run(run())
+    (page1, view1, receiver1), (page2, view2, receiver2) = sessions
+    for view in (view1, view2):
+        assert rows[1].id not in view._cards_by_id
+        assert view._cards_by_id[rows[0].id][0][1:3] == ("Turmalina", 42)
+        assert len(view.products_list_container.controls) == 3
+    assert receiver1.received == 3 and receiver2.received == 2
+    assert not receiver1.closed and receiver2.closed
+    assert view1._cards_by_id[rows[2].id][0].stock == 1
+    assert view2._cards_by_id[rows[2].id][0].stock == rows[2].stock
+
+
+def test_closed_sessions_are_released_and_never_chosen_to_broadcast():
+    async def session(hub, session_id):
+        page = ft.Page(FakeConnection(hub), session_id, asyncio.get_running_loop())
+        page.views.append(InventoryView(page))
+        page.update()
+        return page
+
+    async def run():
+        hub = PubSubHub(asyncio.get_running_loop())
+        # Cada sesión de Flet corre en su propia tarea (la página queda en su contexto).
+        open_page = await asyncio.create_task(session(hub, "s1"))
+        closed_page = await asyncio.create_task(session(hub, "s2"))
+        receiver = get_live_updates(open_page)
+        closed_ref = weakref.ref(closed_page)
+        # Flet cierra la sesión: desmonta sus vistas (se cancelan sus tareas) y la suelta.
+        closed_page._close()
+        del closed_page
+        await _deliver()
+        gc.collect()
+        registered = list(live_updates._receivers.keys())
+        live_updates._broadcast(ChangeEvent("product", 1, ChangeKind.UPDATED, {"stock": 1}))
+        await _deliver()
+        return closed_ref() is None, registered == [open_page], receiver.received
+
+    # La sesión cerrada se libera y el cambio se difunde por la que sigue abierta.
+    assert asyncio.run(run()) == (True, True, 1)
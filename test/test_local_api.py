@@ -0,0 +1,163 @@
+import asyncio
+import gzip
+import json
+import socket
+
+import api.local_api as local_api
+from api.local_api import LocalApi, start_local_api
+from core.change_bus import change_bus
+from data.synthetic_data import SyntheticConfig, generate
+from repos.product_repo import ProductRepository
+from services.category_service import CategoryService
+from services.client_service import ClientService
+from services.product_service import ProductService
+
+
+def make_api(session_provider):
+    products, clients, categories = ProductService(), ClientService(), CategoryService()
+    for repo in (products.product_repo, products.category_repo, clients.client_repo, categories.category_repo):
+        repo.session_provider = session_provider
+    return LocalApi(products, clients, categories, engine=session_provider.kw["bind"])
+
+
+async def seed(session_provider, **kwargs):
+    async with session_provider.kw["bind"].begin() as conn:
+        await conn.run_sync(generate, SyntheticConfig(suppliers=2, **kwargs))
+
+
+async def request(reader, writer, target, headers=None, method="GET"):
+    """Envía una solicitud por una conexión abierta y lee la respuesta completa."""
+    lines = [f"{method} {target} HTTP/1.1", "Host: localhost"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        response_headers[name.lower()] = value.strip()
+    length = int(response_headers["content-length"])
+    body = await reader.readexactly(length) if method != "HEAD" else b""
+    return status, response_headers, body
+
+
+def test_paginated_reads_with_etags_gzip_and_keep_alive(session_provider):
+    async def run():
+        await seed(session_provider, products=120, categories=4, clients=7)
+        api = make_api(session_provider)
+        server = await start_local_api(port=0, api=api)
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        try:
+            status, headers, body = await request(reader, writer, "/api/products?limit=100")
+            first = json.loads(body)
+            assert status == 200 and headers["connection"] == "keep-alive"
+            assert (first["total"], len(first["items"]), first["next_offset"]) == (120, 100, 100)
+            last = json.loads((await request(reader, writer, "/api/products?offset=100&limit=100"))[2])
+            assert (len(last["items"]), last["next_offset"]) == (20, None)
+            skus = [item["sku"] for item in first["items"] + last["items"]]
+            assert len(set(skus)) == 120
+
+            # Revalidación: mismo ETag, 304 sin cuerpo y sin consultar la base de datos.
+            misses = api.misses
+            status, _, body = await request(reader, writer, "/api/products?limit=100",
+                                            {"If-None-Match": headers["etag"]})
+            assert (status, body, api.misses) == (304, b"", misses)
+
+            status, zipped_headers, zipped = await request(reader, writer, "/api/products?limit=100",
+                                                           {"Accept-Encoding": "gzip, deflate"})
+            assert zipped_headers["content-encoding"] == "gzip"
+            assert json.loads(gzip.decompress(zipped)) == first
+            assert len(zipped) < int(headers["content-length"])
+
+            # Una escritura invalida la cache: cambia el ETag.
+            repo = ProductRepository()
+            repo.session_provider = session_provider
+            await repo.update(first["items"][0]["id"], {"name": "Renombrado"})
+            status, new_headers, body = await request(reader, writer, "/api/products?limit=100",
+                                                      {"If-None-Match": headers["etag"]})
+            assert status == 200 and new_headers["etag"] != headers["etag"]
+            assert "Renombrado" in [item["name"] for item in json.loads(body)["items"]]
+
+            return server.connections, server.requests
+        finally:
+            writer.close()
+            await server.close()
+            api.close()
+
+    connections, requests = asyncio.run(run())
+    assert (connections, requests) == (1, 5)
+
+
+def test_detail_search_and_error_routes(session_provider):
+    async def run():
+        await seed(session_provider, products=10, categories=3, clients=3)
+        api = make_api(session_provider)
+        server = await start_local_api(port=0, api=api)
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        try:
+            page = json.loads((await request(reader, writer, "/api/products?limit=1"))[2])
+            summary = page["items"][0]
+            by_id = json.loads((await request(reader, writer, f"/api/products/{summary['id']}"))[2])
+            by_sku = json.loads((await request(reader, writer, f"/api/products/sku/{summary['sku']}"))[2])
+            assert by_id == by_sku and by_id["sku"] == summary["sku"] and by_id["category_names"]
+
+            clients = json.loads((await request(reader, writer, "/api/clients"))[2])
+            assert clients["total"] == 3
+            client = json.loads((await request(reader, writer, f"/api/clients/{clients['items'][0]['id']}"))[2])
+            assert "password_hash" not in client
+
+            categories = json.loads((await request(reader, writer, "/api/categories?limit=2"))[2])
+            assert (categories["total"], len(categories["items"])) == (3, 2)
+
+            found = json.loads((await request(reader, writer, f"/api/search?q={summary['sku']}"))[2])
+            assert summary["id"] in [item["id"] for item in found["products"]]
+
+            statuses = [
+                (await request(reader, writer, "/api/products/999999"))[0],
+                (await request(reader, writer, "/api/nada"))[0],
+                (await request(reader, writer, "/api/products?limit=x"))[0],
+                (await request(reader, writer, "/api/search"))[0],
+                (await request(reader, writer, "/api/products", method="POST"))[0],
+            ]
+            head = await request(reader, writer, "/api/health", method="HEAD")
+            return statuses, head
+        finally:
+            writer.close()
+            await server.close()
+            api.close()
+
+    statuses, (head_status, head_headers, _) = asyncio.run(run())
+    assert statuses == [404, 404, 400, 400, 405]
+    assert head_status == 200 and int(head_headers["content-length"]) > 0
+
+
+def test_shared_api_starts_once_per_process_and_failed_starts_leave_no_listeners(monkeypatch):
+    monkeypatch.setenv("GEMTRACK_API_PORT", "0")
+    monkeypatch.setattr(local_api, "_shared_start", None)
+
+    async def run():
+        # Dos sesiones de Flet al mismo tiempo: un solo servidor.
+        first, second = await asyncio.gather(local_api.start_shared_local_api(),
+                                             local_api.start_shared_local_api())
+        third = await local_api.start_shared_local_api()
+        await first.close()
+        first.handler.__self__.close()
+
+        subscribers = change_bus.subscriber_count()
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            try:
+                await local_api.start_local_api(port=busy.getsockname()[1])
+            except OSError:
+                failed = True
+            else:
+                failed = False
+        return first, second, third, failed, subscribers, change_bus.subscriber_count()
+
+    first, second, third, failed, before, after = asyncio.run(run())
+    assert first is second is third
+    assert failed and after == before
@@ -0,0 +1,67 @@
+import logging
+import threading
+
+import pytest
+
+from core.logging_config import SampledLogger, setup_logging, stop_logging
+
+
+@pytest.fixture
+def isolated_root():
+    """Restaura la raíz y los niveles tocados por setup_logging al terminar."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    flags = (logging._srcfile, logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+    yield root
+    stop_logging()
+    logging._srcfile, logging.logThreads, logging.logProcesses, logging.logMultiprocessing = flags
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    for name in ("views", "repos"):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+class ThreadProbe:
+    """Argumento que anota en qué hilo se formateó el mensaje."""
+
+    def __init__(self):
+        self.formatted_in = []
+
+    def __str__(self):
+        self.formatted_in.append(threading.current_thread().name)
+        return "probe"
+
+
+def test_records_are_formatted_and_written_by_the_listener_thread(isolated_root, tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMTRACK_LOG_LEVELS", "views=DEBUG,repos=WARNING")
+    log_file = tmp_path / "gemtrack.log"
+    assert setup_logging(level="INFO", log_file=str(log_file)) is setup_logging()
+
+    probe = ThreadProbe()
+    logging.getLogger("controllers.inventory_controller").info("Cargados %s productos (%s)", 3, probe)
+    logging.getLogger("views.inventory_view2").debug("Detalle de la vista")
+    logging.getLogger("repos.product_repo").info("No debería escribirse")
+    stop_logging()
+
+    written = log_file.read_text(encoding="utf-8")
+    assert "controllers.inventory_controller - Cargados 3 productos (probe)" in written
+    assert "Detalle de la vista" in written and "No debería escribirse" not in written
+    assert probe.formatted_in and threading.main_thread().name not in probe.formatted_in
+
+
+def test_sampled_logger_skips_repeats_within_the_interval(caplog):
+    logger = logging.getLogger("test.sampled")
+    clock = [100.0]
+    sampled = SampledLogger(logger, interval=1.0, clock=lambda: clock[0])
+    caplog.set_level(logging.INFO, logger="test.sampled")
+
+    for query in ("a", "ab", "abc"):
+        sampled.info("Buscando %r", query)
+    clock[0] += 1.5
+    sampled.info("Buscando %r", "abcd")
+    sampled.debug("Nivel inactivo %s", 1)
+
+    assert [r.getMessage() for r in caplog.records] == ["Buscando 'a'", "Buscando 'abcd' (+2 similares omitidos)"]
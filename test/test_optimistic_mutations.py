@@ -0,0 +1,166 @@
+import asyncio
+
+import flet as ft
+from flet.core.pubsub.pubsub_hub import PubSubHub
+import pytest
+
+import controllers.inventory_controller as inventory_controller
+from data.synthetic_data import SyntheticConfig, generate
+from services.inventory_snapshot import InventorySnapshot, InventorySnapshotCache
+from fakes import FakeConnection
+from views.inventory_view2 import InventoryView
+
+
+@pytest.fixture
+def inventory(session_provider, monkeypatch):
+    """InventoryView montada sobre una DB con 5 productos y un snapshot de la lista."""
+    async def seed():
+        async with session_provider.kw["bind"].begin() as conn:
+            await conn.run_sync(generate, SyntheticConfig(products=5, suppliers=2, categories=3, clients=1))
+
+    asyncio.run(seed())
+    cache = InventorySnapshotCache(path=None)
+    monkeypatch.setattr(inventory_controller, "inventory_snapshot_cache", cache)
+
+    async def build():
+        conn = FakeConnection(PubSubHub(asyncio.get_running_loop()))
+        conn.page_url = "http://localhost"
+        page = ft.Page(conn, "s1", asyncio.get_running_loop())
+        view = InventoryView(page)
+        service = view.controller.product_service
+        service.product_repo.session_provider = session_provider
+        rows = await service.get_product_cards()
+        cache.store(InventorySnapshot(list(rows), ("firma",), 0))
+        view._apply_rows(rows)
+        page.views.append(view)
+        page.update()
+
+        async def no_reload(*args):
+            raise AssertionError("la mutación no debe recargar el catálogo")
+
+        monkeypatch.setattr(service, "get_product_cards", no_reload)
+        return page, view, rows
+
+    return cache, build
+
+
+async def _confirm_delete(page, view, product_id):
+    await view.controller.delete_product_clicked(None, product_id)
+    confirm = page.dialog.actions[1]
+    await confirm.on_click(None)
+
+
+def test_delete_removes_only_that_card_and_rolls_back_on_failure(inventory, monkeypatch):
+    cache, build = inventory
+
+    async def run():
+        page, view, rows = await build()
+        cards = list(view.products_list_container.controls)
+        await _confirm_delete(page, view, rows[1].id)
+        after_delete = list(view.products_list_container.controls)
+        remaining = [row.id for row in await view.controller.product_service.product_repo.get_card_rows()]
+
+        async def failing_remove(product_id):
+            raise RuntimeError("disco lleno")
+
+        monkeypatch.setattr(view.controller.product_service, "remove_product", failing_remove)
+        await _confirm_delete(page, view, rows[3].id)
+        return page, view, rows, cards, after_delete, remaining
+
+    page, view, rows, cards, after_delete, remaining = asyncio.run(run())
+    # Las otras tarjetas son los mismos controles: solo se quitó una.
+    assert after_delete == cards[:1] + cards[2:]
+    assert rows[1].id not in remaining and len(remaining) == 4
+    assert [r.id for r in cache.get().rows] == [r.id for r in rows if r.id != rows[1].id]
+    # La eliminación fallida dejó la tarjeta (y el snapshot) como estaban, con un error visible.
+    assert view.products_list_container.controls == after_delete
+    assert rows[3].id in {r.id for r in cache.get().rows}
+    assert page.snack_bar.bgcolor == ft.Colors.RED and "disco lleno" in page.snack_bar.content.value
+
+
+def test_edit_patches_the_cached_row_and_reverts_it_on_failure(inventory, monkeypatch):
+    cache, build = inventory
+
+    async def run():
+        page, view, rows = await build()
+        target = rows[0]
+        updated = await view.controller.update_product_clicked(None, target.id, {"name": "Zafiro editado", "stock": 7})
+        patched = cache.get().rows[0]
+
+        in_flight = []
+
+        async def rejecting_update(product_id, new_data, validate=True):
+            # Mientras la escritura está en curso, el snapshot ya muestra la edición.
+            in_flight.append(cache.get().rows[0].name)
+            raise ValueError("El SKU ya está en uso")
+
+        monkeypatch.setattr(view.controller.product_service, "update_existing_product", rejecting_update)
+        view._apply_rows(cache.get().rows)
+        failed = await view.controller.update_product_clicked(None, target.id, {"name": "Nombre duplicado"})
+        return view, target, updated, patched, failed, in_flight
+
+    view, target, updated, patched, failed, in_flight = asyncio.run(run())
+    assert updated is not None and updated.name == "Zafiro editado"
+    assert (patched.name, patched.stock) == ("Zafiro editado", 7)
+    assert in_flight == ["Nombre duplicado"] and failed is None
+    assert cache.get().rows[0] == patched
+    assert view._cards_by_id[target.id][0] == patched
+
+
+def test_invalid_edit_stays_on_the_form_without_touching_the_snapshot(inventory, monkeypatch):
+    cache, build = inventory
+
+    async def run():
+        page, view, rows = await build()
+        repo = view.controller.product_service.product_repo
+        other_sku = (await repo.get_by_id(rows[1].id, profile="exists")).sku
+        navigations = []
+        monkeypatch.setattr(page, "go", navigations.append)
+        before = list(cache.get().rows)
+        result = await view.controller.update_product_clicked(None, rows[0].id, {"name": "Copia", "sku": other_sku})
+        return page, before, result, navigations
+
+    page, before, result, navigations = asyncio.run(run())
+    # SKU duplicado: no se navega (el formulario conserva lo escrito) ni se parchea la tarjeta.
+    assert result is None and navigations == []
+    assert cache.get().rows == before
+    assert "ya está en uso" in page.snack_bar.content.value
+
+
+def test_form_strings_are_converted_and_validated_once(inventory, monkeypatch):
+    cache, build = inventory
+
+    async def run():
+        page, view, rows = await build()
+        service = view.controller.product_service
+        validations = []
+        validate = service.validate_product_update
+
+        async def counted_validate(product_id, new_data):
+            validations.append(product_id)
+            await validate(product_id, new_data)
+
+        monkeypatch.setattr(service, "validate_product_update", counted_validate)
+        navigations = []
+        monkeypatch.setattr(page, "go", navigations.append)
+        # Los campos de texto del formulario llegan como cadenas.
+        rejected = await view.controller.update_product_clicked(
+            None, rows[0].id, {"stock": "muchos", "suggested_price": "1.500"})
+        rejected_message = page.snack_bar.content.value
+        updated = await view.controller.update_product_clicked(
+            None, rows[0].id, {"stock": " 12 ", "suggested_price": "1.500.000"})
+
+        async def broken_lookup(*args, **kwargs):
+            raise RuntimeError("database is locked")
+
+        # Un error de la base de datos al validar también llega al usuario.
+        monkeypatch.setattr(service.product_repo, "get_by_id", broken_lookup)
+        failed = await view.controller.update_product_clicked(None, rows[0].id, {"stock": "3"})
+        failures = (failed, page.snack_bar.content.value)
+        return rows, rejected, rejected_message, updated, validations, navigations, failures
+
+    rows, rejected, rejected_message, updated, validations, navigations, failures = asyncio.run(run())
+    assert rejected is None and "números válidos" in rejected_message
+    assert (updated.stock, updated.suggested_price) == (12, 1500000.0)
+    assert validations == [rows[0].id, rows[0].id] and navigations == ["/inventory"]
+    assert failures == (None, "Error inesperado: database is locked")
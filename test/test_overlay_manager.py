@@ -0,0 +1,76 @@
+import asyncio
+import gc
+import tracemalloc
+import weakref
+
+import flet as ft
+
+from core.overlay_manager import get_overlay_manager
+from fakes import FakeConnection, MemoryStorage
+from views.inventory_view2 import InventoryView
+from views.product_add_view import ProductAddView
+from views.product_form_view import ProductFormView
+
+NAVIGATIONS = 1000
+
+
+def _navigate(page, overlays, view):
+    """Lo mismo que route_change en main2.py: reemplaza la vista y envía el diff."""
+    page.views.clear()
+    page.views.append(view)
+    overlays.release_except(page.views)
+    page.update()
+
+
+def test_overlay_and_memory_stay_flat_across_navigations():
+    async def run():
+        page = ft.Page(FakeConnection(), "s1", asyncio.get_running_loop())
+        page._Page__client_storage = MemoryStorage()
+        overlays = get_overlay_manager(page)
+        screens = [InventoryView, ProductAddView, ProductFormView]
+
+        def navigate(i):
+            _navigate(page, overlays, screens[i % len(screens)](page))
+
+        # Calentamiento: cachés de Flet, imports y el picker compartido.
+        for i in range(30):
+            navigate(i)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        overlay_sizes = set()
+        for i in range(NAVIGATIONS):
+            navigate(i)
+            overlay_sizes.add((type(page.views[-1]).__name__, len(page.overlay)))
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        return overlay_sizes, growth, overlays.stats()
+
+    overlay_sizes, growth, stats = asyncio.run(run())
+    # Solo el picker compartido, más el BottomSheet mientras se ve el inventario.
+    assert overlay_sizes == {("InventoryView", 2), ("ProductAddView", 1), ("ProductFormView", 1)}
+    assert stats["shared"] == 1 and stats["owners"] <= 1
+    # Antes cada visita dejaba sus pickers (y la vista entera) colgados del overlay.
+    assert growth < 512 * 1024, f"la memoria creció {growth / 1024:.0f} KiB en {NAVIGATIONS} navegaciones"
+
+
+def test_closed_session_releases_its_page_and_overlay_controls():
+    async def session():
+        # Cada sesión de Flet corre en su propia tarea (la página queda en su contexto).
+        page = ft.Page(FakeConnection(), "s1", asyncio.get_running_loop())
+        page._Page__client_storage = MemoryStorage()
+        overlays = get_overlay_manager(page)
+        _navigate(page, overlays, ProductAddView(page))
+        assert get_overlay_manager(page) is overlays
+        return weakref.ref(page), weakref.ref(overlays), weakref.ref(page.overlay[0])
+
+    async def run():
+        refs = await asyncio.create_task(session())
+        await asyncio.sleep(0)
+        gc.collect()
+        return [ref() for ref in refs]
+
+    # Sin referencias desde registros globales, la página, el gestor y el picker se liberan.
+    assert asyncio.run(run()) == [None, None, None]
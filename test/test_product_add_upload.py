@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+import time
+
+import flet as ft
+
+import views.product_add_view as product_add_view
+from fakes import FakeConnection, MemoryStorage
+from views.product_add_view import ProductAddView
+
+
+class FakeFile:
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+
+class FakeResult:
+    def __init__(self, paths):
+        self.files = [FakeFile(path) for path in paths]
+
+
+def test_multi_file_upload_copies_concurrently_and_adds_thumbnails_incrementally(tmp_path, monkeypatch):
+    sources = []
+    for i in range(20):
+        path = tmp_path / "camara" / f"IMG_{i:04d}.JPG"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(os.urandom(2048) + bytes([i]))
+        sources.append(str(path))
+    # Una foto repetida: mismo contenido, mismo archivo en uploads.
+    sources.append(sources[3])
+    monkeypatch.setattr(product_add_view, "assets_dir", str(tmp_path / "assets"))
+
+    lock, active, peak = threading.Lock(), [0], [0]
+    copy = product_add_view.copy_with_sha256
+
+    def tracked_copy(src, dest_dir):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.01)
+            return copy(src, dest_dir)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(product_add_view, "copy_with_sha256", tracked_copy)
+
+    async def run():
+        page = ft.Page(FakeConnection(), "s1", asyncio.get_running_loop())
+        page._Page__client_storage = MemoryStorage()
+        view = ProductAddView(page)
+        page.views.append(view)
+        page.update()
+        view._on_add_image_result(FakeResult(sources[:2]))
+        while view.tasks.pending():
+            await asyncio.sleep(0.01)
+        first = list(view.thumbnails_row.controls)
+
+        # Lo que ve el cliente mientras se copia el segundo lote: una miniatura por archivo terminado.
+        row_sizes = []
+        original_flush = view.scheduler.flush
+
+        def flush():
+            original_flush()
+            row_sizes.append(len(view.image_paths))
+
+        view.scheduler.flush = flush
+        view._on_add_image_result(FakeResult(sources[2:]))
+        while view.tasks.pending():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+        return view, first, row_sizes
+
+    view, first, row_sizes = asyncio.run(run())
+    assert len(view.image_paths) == 20 and len(set(view.image_paths)) == 20
+    assert len(os.listdir(tmp_path / "assets" / "uploads")) == 20
+    assert view.main_image_preview.src == view.image_paths[0]
+    # Las miniaturas del primer lote son los mismos controles: no se reconstruyeron.
+    assert view.thumbnails_row.controls[:2] == first and len(view.thumbnails_row.controls) == 20
+    assert 1 < peak[0] <= product_add_view.UPLOAD_WORKERS
+    assert len(set(row_sizes)) > 2
+
+
+def test_replacing_the_main_image_copies_in_the_background_under_its_content_hash(tmp_path, monkeypatch):
+    first, second = tmp_path / "a" / "IMG_0001.JPG", tmp_path / "b" / "IMG_0001.JPG"
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_bytes(os.urandom(2048))
+    monkeypatch.setattr(product_add_view, "assets_dir", str(tmp_path / "assets"))
+
+    async def run():
+        page = ft.Page(FakeConnection(), "s1", asyncio.get_running_loop())
+        page._Page__client_storage = MemoryStorage()
+        view = ProductAddView(page)
+        page.views.append(view)
+        page.update()
+        view._on_add_image_result(FakeResult([str(first)]))
+        while view.tasks.pending():
+            await asyncio.sleep(0.01)
+        added = view.image_paths[0]
+        view._on_replace_image_result(FakeResult([str(second)]))
+        while view.tasks.pending():
+            await asyncio.sleep(0.01)
+        return view, added
+
+    view, added = asyncio.run(run())
+    # Mismo nombre de archivo, distinto contenido: la imagen anterior no se pisa.
+    assert view.image_paths[0] != added and view.main_image_preview.src == view.image_paths[0]
+    assert len(os.listdir(tmp_path / "assets" / "uploads")) == 2
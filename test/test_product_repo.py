@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from data.models.product_models import Category, Product
+from repos.product_repo import ProductRepository
+
+
+def _repo(session_provider) -> ProductRepository:
+    repo = ProductRepository()
+    repo.session_provider = session_provider
+    return repo
+
+
+async def _seed_products(session_provider, count: int):
+    async with session_provider() as session:
+        category = Category(name="Esmeraldas")
+        session.add_all([
+            Product(sku=f"SKU-{i:03d}", name=f"Producto {i:03d}", stock=i, categories=[category])
+            for i in range(count)
+        ])
+        await session.commit()
+
+
+def test_card_rows_project_card_columns_and_categories(session_provider):
+    async def run():
+        async with session_provider() as session:
+            rubies, gems = Category(name="Rubíes"), Category(name="Gemas")
+            session.add_all([
+                Product(sku="A", name="Anillo", stock=2, image_path="uploads/a.png", categories=[rubies, gems]),
+                Product(sku="B", name="Broche", stock=0),
+            ])
+            await session.commit()
+        repo = _repo(session_provider)
+        rows = await repo.get_card_rows()
+        streamed = [row async for chunk in repo.stream_card_rows(first_chunk_size=1) for row in chunk]
+        return rows, streamed
+
+    rows, streamed = asyncio.run(run())
+    assert rows == streamed
+    assert [tuple(r) for r in rows] == [
+        (1, "Anillo", 2, "uploads/a.png", ("Gemas", "Rubíes")),
+        (2, "Broche", 0, None, ()),
+    ]
+
+
+def test_search_and_filters_return_read_models(session_provider):
+    async def run():
+        async with session_provider() as session:
+            session.add_all([
+                Product(sku="RB-1", name="Anillo rubí", stock=3, description="Oro"),
+                Product(sku="ES-1", name="Collar", stock=40, description="Esmeralda"),
+            ])
+            await session.commit()
+        repo = _repo(session_provider)
+        return (
+            await repo.search_summaries("esmeralda"),
+            await repo.search_card_rows("RB"),
+            await repo.get_filtered_card_rows("low_stock"),
+        )
+
+    summaries, cards, low_stock = asyncio.run(run())
+    assert [(s.sku, s.name, s.stock) for s in summaries] == [("ES-1", "Collar", 40)]
+    assert not hasattr(summaries[0], "__dict__")
+    assert [c.name for c in cards] == ["Anillo rubí"]
+    assert [c.name for c in low_stock] == ["Anillo rubí"]
+
+
+def test_loader_profiles_issue_only_needed_queries(session_provider):
+    statements = []
+    engine = session_provider.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    async def run():
+        await _seed_products(session_provider, 3)
+        statements.clear()
+        repo = _repo(session_provider)
+        counts = {}
+        for profile in ("exists", "card", "detail", "export"):
+            start = len(statements)
+            product = await repo.get_by_sku("SKU-001", profile=profile)
+            counts[profile] = len(statements) - start
+        return product, counts
+
+    product, counts = asyncio.run(run())
+    assert counts == {"exists": 1, "card": 2, "detail": 2, "export": 2}
+    assert [c.name for c in product.categories] == ["Esmeraldas"]
+
+    with pytest.raises(ValueError):
+        asyncio.run(_repo(session_provider).get_all(profile="todo"))
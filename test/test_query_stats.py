@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+from sqlalchemy import select
+
+from data import query_stats as qs
+from data.models.product_models import Product
+
+
+def test_statements_grouped_by_action_and_n_plus_one_flagged(session_provider, monkeypatch, tmp_path):
+    stats = qs.QueryStats(enabled=True, n_plus_one_threshold=3)
+    monkeypatch.setattr(qs, "query_stats", stats)
+    qs.install(session_provider.kw["bind"].sync_engine, stats)
+
+    @qs.tracked_action("Demo.lista")
+    async def list_then_fetch_each():
+        async with session_provider() as session:
+            ids = (await session.execute(select(Product.id))).scalars().all()
+            for product_id in ids:  # N+1 a propósito
+                await session.execute(select(Product.name).where(Product.id == product_id))
+
+    @qs.tracked_action("Demo.stream")
+    async def stream():
+        async with session_provider() as session:
+            yield (await session.execute(select(Product.id))).scalars().all()
+
+    async def run():
+        async with session_provider() as session:
+            session.add_all([Product(sku=f"S{i}", name=f"P{i}") for i in range(4)])
+            await session.commit()
+        await list_then_fetch_each()
+        return [chunk async for chunk in stream()]
+
+    assert asyncio.run(run()) == [[1, 2, 3, 4]]
+    report = {a["action"]: a for a in stats.report()["actions"]}
+    demo = report["Demo.lista"]
+    assert (demo["runs"], demo["statements"]) == (1, 5)
+    assert [s["max_repeats_per_run"] for s in demo["n_plus_one_suspects"]] == [4]
+    assert report["Demo.stream"]["statements"] == 1
+    # El INSERT del seed quedó fuera de toda acción.
+    assert report[qs.NO_ACTION]["statements"] >= 1
+    assert report["Demo.stream"]["top_statements"][0]["rows"] == 4
+
+    path = stats.dump(str(tmp_path / "stats.json"))
+    assert json.loads(open(path, encoding="utf-8").read())["actions"]
@@ -0,0 +1,26 @@
+import asyncio
+from datetime import datetime
+
+from data.models.product_models import Product
+from data.models.user_models import Client, UserRole
+from data.read_models import ClientSummary, ProductSummary
+from services.search import global_search
+
+
+def test_global_search_returns_summaries(session_provider):
+    async def run():
+        async with session_provider() as session:
+            session.add_all([
+                Product(sku="P-1", name="Perla Ana", stock=1),
+                Client(username="ana", password_hash="x", first_name="Ana", last_name="Pérez",
+                       email="ana@example.com", phone_number="555", date_of_birth=datetime(1990, 1, 1),
+                       role=UserRole.CLIENT),
+            ])
+            await session.commit()
+        return await global_search(session_provider, "Ana")
+
+    results = asyncio.run(run())
+    assert [type(p) for p in results["products"]] == [ProductSummary]
+    assert results["products"][0].sku == "P-1"
+    assert results["clients"] == [ClientSummary(1, "Ana", "Pérez", "ana@example.com", "555")]
+    assert results["clients"][0].full_name == "Ana Pérez"
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from data.models.product_models import Category, Product
+from data.models.supplier_models import Supplier
+from data.models.user_models import Client, UserRole
+from data.read_models import ProductSummary
+from data.serializers import deserialize, serialize, serialize_many, serializers
+
+
+def test_product_serializer_supports_subsets_nested_and_iso_dates():
+    product = Product(id=1, sku="A-1", name="Anillo", stock=2, creation_date=datetime(2024, 5, 1, 10, 30),
+                      categories=[Category(name="Oro"), Category(name="Rubíes")], supplier=Supplier(name="Gemas SA"))
+
+    full = product.to_dict()
+    assert full["creation_date"] == "2024-05-01T10:30:00"
+    assert full["modification_date"] is None
+    assert "categories" not in full
+
+    nested = {"category_names": "categories.name", "supplier_name": "supplier.name"}
+    assert serialize(product, ["id", "name"], nested) == {
+        "id": 1, "name": "Anillo", "category_names": ["Oro", "Rubíes"], "supplier_name": "Gemas SA",
+    }
+    # Un serializador por combinación, generado una sola vez.
+    assert serializers.serializer(Product, ["id", "name"], nested) is serializers.serializer(Product, ["id", "name"], nested)
+    # Las claves salen en el orden en que se pidieron, también para el mismo conjunto en otro orden.
+    reordered = {"supplier_name": "supplier.name", "category_names": "categories.name"}
+    assert list(serialize(product, ["id"], nested)) == ["id", "category_names", "supplier_name"]
+    assert list(serialize(product, ["id"], reordered)) == ["id", "supplier_name", "category_names"]
+
+    with pytest.raises(ValueError):
+        serialize(product, ["no_existe"])
+
+
+def test_client_to_dict_uses_subclass_columns_and_hides_password():
+    client = Client(id=7, username="ana", password_hash="secreto", first_name="Ana", last_name="Pérez",
+                    phone_number="555", date_of_birth=datetime(1990, 1, 2), role=UserRole.CLIENT,
+                    shipping_address="Calle 1")
+
+    data = client.to_dict()
+    assert data["first_name"] == "Ana" and data["shipping_address"] == "Calle 1"
+    assert data["role"] == "client"
+    assert data["date_of_birth"] == "1990-01-02T00:00:00"
+    assert "password_hash" not in data
+
+
+def test_read_models_and_deserialize():
+    summary = ProductSummary(1, "A-1", "Anillo", None, 2, 10.0, "en_stock", None)
+    assert serialize_many([summary]) == [summary._asdict()]
+    assert serialize_many([]) == []
+
+    product = deserialize(Product, {"sku": "B-1", "name": "Broche", "category_ids": [1, 2]})
+    assert (product.sku, product.name) == ("B-1", "Broche")
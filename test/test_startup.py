@@ -0,0 +1,28 @@
+import json
+import sys
+
+from core.startup import StartupTimeline, lazy_view, timeline
+
+
+def test_timeline_marks_once_and_dumps_json_lines(tmp_path):
+    t = StartupTimeline()
+    t.mark("imports")
+    t.mark("first_paint", once=True)
+    t.mark("first_paint", once=True)
+    assert [e["name"] for e in t.events] == ["imports", "first_paint"]
+
+    path = tmp_path / "startup.jsonl"
+    t.dump(str(path))
+    t.dump(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert [e["name"] for e in json.loads(lines[0])["events"]] == ["imports", "first_paint"]
+
+
+def test_lazy_view_imports_module_on_first_use(monkeypatch):
+    monkeypatch.delitem(sys.modules, "json.tool", raising=False)
+    factory = lazy_view("json.tool", "main")
+    assert "json.tool" not in sys.modules
+
+    assert factory.load() is sys.modules["json.tool"].main
+    assert timeline.has("import:json.tool")
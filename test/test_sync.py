@@ -0,0 +1,175 @@
+import asyncio
+import sqlite3
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import NullPool
+
+from data.models.base_model import Base
+from data.models.product_models import Category, Product
+from data.synthetic_data import SyntheticConfig, generate
+from repos.product_repo import ProductRepository
+from repos.sync_repo import SyncRepository
+from services.sync_service import LocalTransport, SyncServer, SyncService
+
+
+class Instance:
+    """Una instancia de GemTrack con su propio SQLite."""
+
+    def __init__(self, path):
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+        self.sessions = async_sessionmaker(bind=self.engine, expire_on_commit=False, autoflush=False,
+                                           class_=AsyncSession)
+        self.sync_repo = SyncRepository()
+        self.sync_repo.session_provider = self.sessions
+        self.products = ProductRepository()
+        self.products.session_provider = self.sessions
+
+    async def create_schema(self, config=None):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            if config is not None:
+                await conn.run_sync(generate, config)
+
+    async def catalog(self):
+        async with self.sessions() as session:
+            products = (await session.execute(
+                select(Product).options(selectinload(Product.categories)))).scalars().all()
+        return {p.sku: (p.name, p.description, p.stock, tuple(sorted(c.name for c in p.categories)))
+                for p in products}
+
+    async def product(self, sku):
+        return await self.products.get_by_sku(sku)
+
+
+def sync(device, server):
+    return SyncService(device.sync_repo).sync(LocalTransport(SyncServer(server.sync_repo)), batch_size=7)
+
+
+def test_offline_devices_converge_through_the_server(tmp_path):
+    server, a, b = (Instance(tmp_path / f"{name}.db") for name in ("server", "a", "b"))
+
+    async def run():
+        await server.create_schema()
+        await a.create_schema(SyntheticConfig(products=20, categories=3, suppliers=2, clients=3))
+        await b.create_schema()
+        # Primera sincronización: el catálogo existente de A llega a B a través del servidor.
+        await sync(a, server)
+        first_b = await sync(b, server)
+        assert await b.catalog() == await a.catalog()
+        assert first_b["applied"] == 23  # 20 productos y 3 clientes
+
+        skus = sorted(await a.catalog())
+        sold, renamed, removed = skus[0], skus[1], skus[2]
+        stock = (await a.catalog())[sold][2]
+
+        # Sin conexión: cada equipo vende y edita por su cuenta.
+        a_sold, b_sold = await a.product(sold), await b.product(sold)
+        await a.products.update(a_sold.id, {"stock": stock - 2})
+        await b.products.update(b_sold.id, {"stock": stock - 3})
+        await a.products.update((await a.product(renamed)).id, {"name": "Nombre de A"})
+        await b.products.update((await b.product(renamed)).id, {"name": "Nombre de B"})
+        await a.products.delete((await a.product(removed)).id)
+        await b.products.update((await b.product(removed)).id, {"description": "editado en B"})
+        async with a.sessions() as session:
+            category = (await session.execute(select(Category).limit(1))).scalars().first()
+        new_product = Product(sku="NUEVO-1", name="Nuevo", stock=4, categories=[category, Category(name="Nueva")])
+        await a.products.create(new_product)
+
+        await sync(a, server)
+        await sync(b, server)
+        await sync(a, server)
+
+        catalogs = [await server.catalog(), await a.catalog(), await b.catalog()]
+        # Un segundo ciclo ya no intercambia cambios.
+        idle = await sync(b, server)
+        return catalogs, sold, stock, renamed, removed, category.name, idle
+
+    catalogs, sold, stock, renamed, removed, category_name, idle = asyncio.run(run())
+
+    server_catalog, a_catalog, b_catalog = catalogs
+    assert server_catalog == a_catalog == b_catalog
+    # Las ventas de ambos equipos se suman en lugar de pisarse.
+    assert a_catalog[sold][2] == stock - 5
+    # Mismo campo editado en dos equipos: el mismo ganador en todas las instancias.
+    assert a_catalog[renamed][0] in ("Nombre de A", "Nombre de B")
+    # La eliminación gana sobre la edición concurrente.
+    assert removed not in a_catalog
+    assert a_catalog["NUEVO-1"] == ("Nuevo", None, 4, tuple(sorted((category_name, "Nueva"))))
+    assert (idle["pushed"], idle["pulled"]) == (0, 0)
+
+
+def test_newer_create_wins_over_an_older_delete_of_the_same_sku(tmp_path):
+    server, a, b = (Instance(tmp_path / f"{name}.db") for name in ("server", "a", "b"))
+
+    async def run():
+        await server.create_schema()
+        await a.create_schema(SyntheticConfig(products=3, categories=3, suppliers=2, clients=1))
+        await b.create_schema()
+        await sync(a, server)
+        await sync(b, server)
+
+        # B crea y elimina DUP; A (con un reloj más adelantado) crea DUP después.
+        await b.products.create(Product(sku="DUP", name="De B", stock=1))
+        await b.products.delete((await b.product("DUP")).id)
+        for sku in sorted(await a.catalog()):
+            await a.products.update((await a.product(sku)).id, {"description": "revisado"})
+        await a.products.create(Product(sku="DUP", name="De A", stock=2))
+
+        for _ in range(2):
+            await sync(a, server)
+            await sync(b, server)
+        return [(await instance.catalog()).get("DUP") for instance in (server, a, b)]
+
+    assert asyncio.run(run()) == [("De A", None, 2, ())] * 3
+
+
+def test_change_committed_between_batch_queries_is_not_skipped(tmp_path):
+    device = Instance(tmp_path / "device.db")
+    selects = []
+
+    def commit_from_another_connection(conn, cursor, statement, parameters, context, executemany):
+        # Otro escritor confirma P2 entre las dos consultas de changes_since.
+        if statement.startswith("SELECT") and "change_log" in statement:
+            selects.append(statement)
+            if len(selects) == 2:
+                with sqlite3.connect(tmp_path / "device.db") as other:
+                    other.execute("INSERT INTO change_log (origin, clock, entity, entity_key, kind, payload) "
+                                  "VALUES ('otro', 100, 'product', 'P2', 'created', '{}')")
+
+    async def run():
+        await device.create_schema()
+        await device.products.create(Product(sku="P1", name="P1", stock=1))
+        event.listen(device.engine.sync_engine, "before_cursor_execute", commit_from_another_connection)
+        try:
+            first, watermark, _ = await device.sync_repo.changes_since(0)
+        finally:
+            event.remove(device.engine.sync_engine, "before_cursor_execute", commit_from_another_connection)
+        second, _, _ = await device.sync_repo.changes_since(watermark)
+        return [entry[3] for entry in first], [entry[3] for entry in second]
+
+    assert asyncio.run(run()) == (["P1"], ["P2"])
+
+
+def test_incremental_sync_traffic_does_not_depend_on_catalog_size(tmp_path):
+    async def traffic(products):
+        server = Instance(tmp_path / f"server-{products}.db")
+        device = Instance(tmp_path / f"device-{products}.db")
+        await server.create_schema()
+        await device.create_schema(SyntheticConfig(products=products, categories=3, suppliers=2, clients=1))
+        await sync(device, server)
+
+        product = await device.product((await device.products.get_all())[0].sku)
+        await device.products.update(product.id, {"stock": (product.stock or 0) + 1})
+        transport = LocalTransport(SyncServer(server.sync_repo))
+        stats = await SyncService(device.sync_repo).sync(transport)
+        return stats, transport.bytes_sent + transport.bytes_received, transport.requests
+
+    small_stats, small_bytes, small_requests = asyncio.run(traffic(30))
+    large_stats, large_bytes, large_requests = asyncio.run(traffic(600))
+
+    assert (small_stats["pushed"], small_stats["pulled"]) == (large_stats["pushed"], large_stats["pulled"]) == (1, 0)
+    assert small_requests == large_requests == 3  # hello, push y pull
+    assert abs(large_bytes - small_bytes) < 64
+    assert large_bytes < 1024
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from data.models.product_models import Product, product_category_association
+from data.models.user_models import Client
+from data.synthetic_data import SyntheticConfig, generate, sku_for
+from repos.client_repo import ClientRepository
+from repos.product_repo import ProductRepository
+
+
+def _populate(session_provider, config):
+    async def run():
+        async with session_provider.kw["bind"].begin() as conn:
+            return await conn.run_sync(generate, config)
+    return asyncio.run(run())
+
+
+def test_generator_counts_distributions_and_orm_round_trip(session_provider):
+    config = SyntheticConfig(products=2000, suppliers=5, categories=8, clients=40,
+                             out_of_stock_ratio=0.1, low_stock_ratio=0.2, categories_per_product=(1, 3))
+    stats = _populate(session_provider, config)
+    assert stats["rows"]["products"] == 2000 and stats["rows"]["users"] == 40
+
+    async def run():
+        async with session_provider() as session:
+            stocks = (await session.execute(select(Product.stock))).scalars().all()
+            fan_out = (await session.execute(
+                select(func.count()).select_from(product_category_association)
+                .group_by(product_category_association.c.product_id)
+            )).scalars().all()
+            clients = (await session.execute(select(func.count()).select_from(Client))).scalar()
+        repo = ProductRepository()
+        repo.session_provider = session_provider
+        clients_repo = ClientRepository()
+        clients_repo.session_provider = session_provider
+        return stocks, fan_out, clients, await repo.get_by_sku(sku_for(7)), await clients_repo.get_by_email("cliente3@ejemplo.com")
+
+    stocks, fan_out, clients, product, client = asyncio.run(run())
+    assert 0.07 < sum(s == 0 for s in stocks) / 2000 < 0.13
+    assert 0.16 < sum(0 < s < 10 for s in stocks) / 2000 < 0.24
+    assert set(fan_out) == {1, 2, 3} and len(fan_out) == 2000
+    assert clients == 40
+    # Las filas insertadas sin el ORM se leen con sus tipos (fechas, relaciones).
+    assert isinstance(product.creation_date, datetime) and product.supplier is not None
+    assert 1 <= len(product.categories) <= 3
+    assert client.username == "cliente3" and isinstance(client.date_of_birth, datetime)
+
+
+def test_generator_is_deterministic_and_appends(session_provider):
+    config = SyntheticConfig(products=300, clients=10, seed=7)
+
+    async def rows(provider):
+        async with provider() as session:
+            return (await session.execute(select(Product.sku, Product.name, Product.stock).order_by(Product.id))).all()
+
+    _populate(session_provider, config)
+    first = asyncio.run(rows(session_provider))
+    # Una segunda pasada continúa los ids sin chocar con SKU, nombres ni emails únicos.
+    stats = _populate(session_provider, config)
+    both = asyncio.run(rows(session_provider))
+    assert stats["rows"]["products"] == 300 and len(both) == 600
+    assert both[300].sku == sku_for(301)
+    # Con la misma semilla se repiten las distribuciones (no los ids).
+    assert [r.stock for r in both[300:]] == [r.stock for r in first]
+
+
+def test_config_rejects_impossible_distributions():
+    with pytest.raises(ValueError):
+        SyntheticConfig(categories=2, categories_per_product=(1, 3))
+    with pytest.raises(ValueError):
+        SyntheticConfig(out_of_stock_ratio=0.6, low_stock_ratio=0.5)
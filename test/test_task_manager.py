@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from core.task_manager import TaskManager, TaskPriority
+
+
+async def _settle(futures):
+    await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+
+
+def test_close_cancels_pending_tasks_and_rejects_new_ones():
+    writes = []
+
+    async def load(label):
+        await asyncio.sleep(0.05)
+        writes.append(label)  # en la app: escribir en los controles de la vista
+
+    async def run():
+        tasks = TaskManager("InventoryView", asyncio.get_running_loop(), max_concurrent=1)
+        running, queued = tasks.run(load, "running"), tasks.run(load, "queued")
+        await asyncio.sleep(0.01)
+        assert tasks.close() == 2
+        late = tasks.run(load, "late")
+        await _settle([running, queued, late])
+        await asyncio.sleep(0.06)
+        return tasks, running, queued, late
+
+    tasks, running, queued, late = asyncio.run(run())
+    assert writes == []
+    assert running.cancelled() and queued.cancelled() and late.cancelled()
+    assert tasks.pending() == 0
+    [stats] = tasks.stats()
+    assert stats["started"] == 1 and stats["cancelled"] == 2 and stats["completed"] == 0
+
+
+def test_concurrency_limit_priorities_keys_and_durations():
+    order = []
+
+    async def job(label, delay=0.0):
+        order.append(label)
+        await asyncio.sleep(delay)
+        return label
+
+    async def run():
+        tasks = TaskManager("InventoryView", asyncio.get_running_loop(), max_concurrent=1)
+        blocker = tasks.run(job, "blocker", 0.02, name="blocker")
+        await asyncio.sleep(0)
+        futures = [
+            tasks.run(job, "low", name="job", priority=TaskPriority.LOW),
+            tasks.run(job, "search a", name="search", key="product_list"),
+            tasks.run(job, "high", name="job", priority=TaskPriority.HIGH),
+            # Reemplaza a la búsqueda anterior, que nunca llega a correr.
+            tasks.run(job, "search ab", name="search", key="product_list"),
+        ]
+        await _settle([blocker, *futures])
+        return tasks, futures
+
+    tasks, futures = asyncio.run(run())
+    assert order == ["blocker", "high", "search ab", "low"]
+    assert futures[1].cancelled() and futures[3].result() == "search ab"
+    stats = {s["name"]: s for s in tasks.stats()}
+    assert stats["blocker"]["completed"] == 1 and stats["blocker"]["total_ms"] >= 15
+    assert stats["job"]["completed"] == 2 and stats["job"]["wait_ms"] >= 15
+    assert stats["search"]["completed"] == 1
+
+
+def test_failed_tasks_are_counted_and_free_their_slot():
+    async def boom():
+        raise RuntimeError("falló la consulta")
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        tasks = TaskManager("ProductAddView", asyncio.get_running_loop(), max_concurrent=1)
+        failed, after = tasks.run(boom), tasks.run(ok)
+        await _settle([failed, after])
+        return tasks, failed, after
+
+    tasks, failed, after = asyncio.run(run())
+    with pytest.raises(RuntimeError):
+        failed.result()
+    assert after.result() == "ok"
+    assert [s["failed"] for s in tasks.stats() if s["name"].endswith("boom")] == [1]
@@ -0,0 +1,72 @@
+import asyncio
+
+import flet as ft
+
+from core import ui_stats as ui_stats_module
+from core.ui_stats import UiStats, install
+from core.update_scheduler import UpdateScheduler
+from fakes import FakeConnection
+
+
+def _card(i: int) -> ft.Control:
+    return ft.Card(ft.Container(ft.Row([ft.Text(f"Producto {i}"), ft.Text("SKU"), ft.IconButton(ft.Icons.EDIT)])))
+
+
+class InventoryScreen:
+    """Stand-in de una vista: las pruebas corren en el módulo test.*, no en views.*."""
+
+    def __init__(self, page, column, scheduler):
+        self.page, self.column, self.scheduler = page, column, scheduler
+
+    def on_load(self, count: int):
+        self.column.controls = [_card(i) for i in range(count)]
+        self.scheduler.mark_dirty(self.column)
+
+    def on_rename(self, name: str):
+        self.column.controls[0].content.content.controls[0].value = name
+        self.scheduler.mark_dirty(self.column)
+
+
+def test_updates_are_measured_per_screen_and_handler(monkeypatch):
+    # Las funciones de este módulo cuentan como "origen" igual que las de views/.
+    monkeypatch.setattr(ui_stats_module, "_SOURCE_MODULES", ("test_ui_stats", "test.test_ui_stats"))
+    stats = UiStats(enabled=True)
+
+    async def run():
+        # Los manejadores se despachan desde el loop, como lo hace Flet con los eventos.
+        loop = asyncio.get_running_loop()
+        page = ft.Page(FakeConnection(), "s1", loop)
+        page.route = "/inventory"
+        install(page, stats)
+        column = ft.Column()
+        screen = InventoryScreen(page, column, UpdateScheduler(page))
+        loop.call_soon(page.add, column)
+        loop.call_soon(screen.on_load, 20)
+        loop.call_soon(screen.on_rename, "A")  # se fusiona con on_load en el mismo tick
+        for _ in range(3):
+            await asyncio.sleep(0)
+        loop.call_soon(screen.on_rename, "B")
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+    [screen] = stats.report()["screens"]
+    handlers = {h["source"]: h for h in screen["handlers"]}
+    # page.add(column) también se mide aunque no pase por page.update().
+    assert screen["screen"] == "/inventory" and screen["updates"] == 3
+
+    load = handlers["InventoryScreen.on_load"]
+    # 20 tarjetas x 6 controles (Card, Container, Row, 2 Text, IconButton).
+    assert load["controls"] == 120 and load["coalesced"] == 1 and load["payload_bytes"] > 2000
+
+    rename = handlers["InventoryScreen.on_rename"]
+    assert rename["updates"] == 1 and rename["controls"] == 1
+    assert 0 < rename["payload_bytes"] < load["payload_bytes"] / 20
+
+
+def test_disabled_stats_do_not_wrap_the_page():
+    page = ft.Page(FakeConnection(), "s1", asyncio.new_event_loop())
+    original = page.update
+    install(page, UiStats(enabled=False))
+    assert page.update == original
+    page.loop.close()
@@ -0,0 +1,75 @@
+import asyncio
+import gc
+import weakref
+
+from core.update_scheduler import UpdateScheduler, get_scheduler
+
+
+class FakeControl:
+    def __init__(self, page=None):
+        self.page = page
+
+
+class FakePage:
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.updates = []
+
+    def update(self, *controls):
+        self.updates.append(controls)
+
+
+def test_mark_dirty_without_loop_updates_immediately():
+    page = FakePage()
+    scheduler = UpdateScheduler(page)
+    scheduler.mark_dirty()
+    assert page.updates == [()]
+    assert scheduler.stats() == {"requested": 1, "flushed": 1, "absorbed": 0}
+
+
+def test_mark_dirty_coalesces_within_one_tick():
+    async def run():
+        page = FakePage(asyncio.get_running_loop())
+        scheduler = UpdateScheduler(page)
+        for _ in range(5):
+            scheduler.mark_dirty()
+        assert page.updates == []
+        await asyncio.sleep(0)
+        return page, scheduler
+
+    page, scheduler = asyncio.run(run())
+    assert page.updates == [()]
+    assert scheduler.stats() == {"requested": 5, "flushed": 1, "absorbed": 4}
+
+
+def test_control_updates_skip_unmounted_controls():
+    async def run():
+        page = FakePage(asyncio.get_running_loop())
+        mounted, detached = FakeControl(page), FakeControl()
+        scheduler = UpdateScheduler(page)
+        scheduler.mark_dirty(mounted)
+        scheduler.mark_dirty(detached)
+        scheduler.mark_dirty(mounted)
+        await asyncio.sleep(0)
+        return page, mounted
+
+    page, mounted = asyncio.run(run())
+    assert page.updates == [(mounted,)]
+
+
+def test_get_scheduler_is_shared_per_page():
+    page = FakePage()
+    assert get_scheduler(page) is get_scheduler(page)
+    assert get_scheduler(page) is not get_scheduler(FakePage())
+
+
+def test_registry_does_not_keep_closed_pages_alive():
+    page = FakePage()
+    scheduler = get_scheduler(page)
+    page_ref = weakref.ref(page)
+    del page
+    gc.collect()
+    # La sesión cerrada se libera; el scheduler que quedó suelto ya no actualiza nada.
+    assert page_ref() is None and scheduler.page is None
+    scheduler.mark_dirty()
+    assert scheduler.stats()["flushed"] == 0
@@ -0,0 +1,66 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+import bcrypt
+
+import core.worker_pool as worker_pool
+from core.worker_pool import BoundedExecutor, cpu_pool, run_cpu
+from data.utils import parse_price_string
+
+
+def test_bounded_executor_applies_backpressure_and_reports_saturation():
+    gate = threading.Event()
+    pool = BoundedExecutor("test", lambda: concurrent.futures.ThreadPoolExecutor(max_workers=2),
+                           workers=2, queue_size=2)
+
+    async def run():
+        jobs = [asyncio.ensure_future(pool.run(gate.wait)) for _ in range(6)]
+        await asyncio.sleep(0.05)
+        busy = pool.stats()
+        gate.set()
+        await asyncio.gather(*jobs)
+        return busy
+
+    busy = asyncio.run(run())
+    pool.shutdown()
+    # Solo `queue_size` trabajos llegan al executor; el resto espera sin bloquear el loop.
+    assert busy["in_flight"] == 2 and busy["waiting"] == 4 and busy["saturation"] == 1.0
+    done = pool.stats()
+    assert done["completed"] == 6 and done["in_flight"] == 0 and done["max_in_flight"] == 2
+    assert done["backpressure_waits"] == 4 and done["backpressure_ms"] > 0
+
+
+def test_cpu_work_runs_in_another_process():
+    password_hash = bcrypt.hashpw(b"secreto", bcrypt.gensalt(rounds=4))
+
+    async def run():
+        return await asyncio.gather(
+            run_cpu(os.getpid),
+            run_cpu(bcrypt.checkpw, b"secreto", password_hash),
+            run_cpu(parse_price_string, "1,500,000.50"),
+        )
+
+    try:
+        pid, valid, price = asyncio.run(run())
+    finally:
+        cpu_pool.shutdown()
+    assert pid != os.getpid() and valid is True
+    assert price == 1500000.5
+
+
+def test_cpu_pool_falls_back_to_threads_without_process_support(monkeypatch):
+    def no_semaphores(*args, **kwargs):
+        raise NotImplementedError("sem_open")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_semaphores)
+    pool = BoundedExecutor("cpu-test", lambda: worker_pool._cpu_executor(2), workers=2, queue_size=8)
+    try:
+        pid = asyncio.run(pool.run(os.getpid))
+    finally:
+        pool.shutdown()
+    assert pid == os.getpid()
+
+    monkeypatch.setattr(worker_pool.sys, "platform", "android")
+    assert not worker_pool.processes_supported()
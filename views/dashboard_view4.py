@@ -1,6 +1,7 @@
 import flet as ft
 from components.navigation_card2 import NavigationCard
 from flet import NavigationBarDestination
+from core.update_scheduler import get_scheduler
 
 
 class DashboardView(ft.View):
@@ -108,7 +109,7 @@ class DashboardView(ft.View):
 
         # --- CORRECCIÓN CLAVE 3: Actualizar solo si la página existe ---
         if self.page:
-            self.page.update()
+            get_scheduler(self.page).mark_dirty()
 
     def build_cards_area(self):
         return ft.Container(
@@ -1,15 +1,26 @@
 # views/inventory_view.py
 from pathlib import Path
+import asyncio
 import flet as ft
-from typing import Optional
+from typing import Optional, Dict, List, Tuple
 import logging
 import os
 import shutil
 # Importamos los componentes y controladores necesarios
 from components.inventory_product_card import InventoryProductCard
 from controllers.inventory_controller import InventoryController
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from core.change_bus import ChangeEvent, ChangeKind
+from core.live_updates import get_live_updates
+from core.logging_config import SampledLogger
+from core.overlay_manager import get_overlay_manager
+from core.task_manager import TaskPriority, get_task_manager
+from core.update_scheduler import get_scheduler
+from data.db_ready import db_ready
+from services.inventory_snapshot import PRODUCT_ENTITY, ROW_FIELDS, InventoryRow
+
+logger = logging.getLogger(__name__)
+# Cada búsqueda o filtro vuelve a parchear la lista: registro muestreado.
+patch_log = SampledLogger(logger, interval=1.0)
 
 # Obtiene la ruta absoluta al directorio de assets usando pathlib y os
 assets_dir = os.path.join(Path(os.path.dirname(__file__)).parent, "assets") # Asumiendo que estás en views/product_form_view.py
@@ -22,7 +33,7 @@ class InventoryView(ft.View):
     """
 
     def __init__(self, page: ft.Page):
-        logging.info("Iniciando constructor de InventoryView (refactorizado).")
+        logger.info("Iniciando constructor de InventoryView (refactorizado).")
         super().__init__(
             route="/inventory",
             bgcolor=ft.Colors.BLACK,
@@ -30,11 +41,15 @@ class InventoryView(ft.View):
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
         )
         self.page = page
+        self.scheduler = get_scheduler(page)
+        self.overlays = get_overlay_manager(page)
+        # Tareas en segundo plano de la vista: se cancelan al desmontarla.
+        self.tasks = get_task_manager(self, max_concurrent=3)
         try:
             self.controller = InventoryController(page)
-            logging.info("InventoryController inicializado en InventoryView.")
+            logger.info("InventoryController inicializado en InventoryView.")
         except Exception as e:
-            logging.error(f"Error al inicializar InventoryController: {e}", exc_info=True)
+            logger.error("Error al inicializar InventoryController: %s", e, exc_info=True)
             self.controls.append(ft.Text("Error crítico al cargar el controlador.", color=ft.Colors.RED_500))
             return
 
@@ -53,9 +68,9 @@ class InventoryView(ft.View):
             label_style=ft.TextStyle(color=ft.Colors.GREY_400),
         )
 
-        # ¡NUEVO! - FilePicker para la opción de "Subir desde el Dispositivo"
-        self.file_picker = ft.FilePicker(on_result=self._on_file_picker_result)
-        self.page.overlay.append(self.file_picker)
+        # ¡NUEVO! - FilePicker para la opción de "Subir desde el Dispositivo".
+        # Es el picker compartido de la página: se registra en el overlay una sola vez.
+        self.file_picker = self.overlays.file_picker(self, self._on_file_picker_result)
 
         # ¡NUEVO! - Definición del BottomSheet para las opciones de "Add Item"
         self.add_item_bs = ft.BottomSheet(
@@ -71,7 +86,7 @@ class InventoryView(ft.View):
                         ft.ListTile(
                             title=ft.Text("Subir desde el Dispositivo", color=ft.Colors.WHITE),
                             leading=ft.Icon(ft.Icons.UPLOAD_FILE, color=ft.Colors.WHITE),
-                            on_click=lambda e: self.file_picker.pick_files(
+                            on_click=lambda e: self.overlays.file_picker(self, self._on_file_picker_result).pick_files(
                                 allow_multiple=True,
                                 allowed_extensions=["png", "jpg", "jpeg", "mp4"]
                             )
@@ -83,8 +98,8 @@ class InventoryView(ft.View):
             ),
             bgcolor=ft.Colors.BLACK,
         )
-        # Añadir el BottomSheet al overlay de la página para que pueda mostrarse
-        self.page.overlay.append(self.add_item_bs)
+        # El BottomSheet es de esta vista: se quita del overlay al desmontarla.
+        self.overlays.attach(self, self.add_item_bs)
 
         # ¡CAMBIO CLAVE! Añadimos un ProgressRing para la retroalimentación de carga.
         self.progress_ring = ft.ProgressRing(visible=False)
@@ -97,14 +112,25 @@ class InventoryView(ft.View):
             spacing=10,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER  # Centrar el anillo
         )
+        # Tarjetas pintadas, por ID de producto: permite parchear la lista
+        # (reutilizar las tarjetas que no cambiaron) tras una revalidación.
+        self._cards_by_id: Dict[int, Tuple[object, InventoryProductCard]] = {}
+        # False mientras la lista muestra una búsqueda o un filtro: los productos
+        # creados solo se insertan cuando se ve el catálogo completo.
+        self._showing_catalog = True
+        # Cambios de productos confirmados (de esta u otra sesión, llegan por
+        # pubsub): se aplican a la lista en pantalla sin recargarla.
+        self._unsubscribe_changes = get_live_updates(page).subscribe(self._on_product_change, entity=PRODUCT_ENTITY)
         self.controller.set_view(self)
+        # La propia vista recibe los resultados de búsqueda y filtros (update_list).
+        self.controller.set_product_list_view(self)
 
         self._build_ui()
-        logging.info("UI de InventoryView (refactorizada) construida.")
+        logger.info("UI de InventoryView (refactorizada) construida.")
 
 
     def _build_ui(self):
-        logging.info("Ejecutando _build_ui en InventoryView (refactorizado).")
+        logger.info("Ejecutando _build_ui en InventoryView (refactorizado).")
         self.controls = [
             # Encabezado (se mantiene)
             ft.Container(
@@ -192,26 +218,34 @@ class InventoryView(ft.View):
             )
         ]
 
+    def will_unmount(self):
+        """Cancela las tareas pendientes, deja de escuchar cambios y libera el BottomSheet y el FilePicker compartido."""
+        self.tasks.close()
+        if hasattr(self, "_unsubscribe_changes"):
+            self._unsubscribe_changes()
+        self.overlays.release(self)
+        super().will_unmount()
+
     # --- ¡NUEVOS MÉTODOS para el flujo de "Add Item"! ---
 
     def _open_add_item_menu(self, e):
         """Abre el menú de opciones para agregar un nuevo item."""
         self.add_item_bs.open = True
-        self.add_item_bs.update()
+        self.scheduler.mark_dirty(self.add_item_bs)
 
     def _handle_take_photo(self, e):
         """Manejador para la opción de tomar foto (placeholder)."""
         self.add_item_bs.open = False
-        self.add_item_bs.update()
         self.page.snack_bar = ft.SnackBar(ft.Text("Funcionalidad de cámara pendiente."), bgcolor=ft.Colors.BLUE_GREY)
         self.page.snack_bar.open = True
-        self.page.update()
+        # Un único update cubre el cierre del BottomSheet y el SnackBar.
+        self.scheduler.mark_dirty()
 
     def _copy_and_get_relative_path(self, file_path: str, file_name: str) -> Optional[str]:
         """Copia un archivo a la carpeta de assets/uploads y devuelve la ruta relativa."""
         # Asegúrate de que self.page.assets_dir esté disponible
         if not assets_dir:
-            logging.error("El directorio de assets no está configurado en la página.")
+            logger.error("El directorio de assets no está configurado en la página.")
             return None
         uploads_dir = os.path.join(assets_dir, "uploads")
         os.makedirs(uploads_dir, exist_ok=True)
@@ -230,63 +264,230 @@ class InventoryView(ft.View):
                 # Manejar el error si no se pudo copiar
                 self.page.snack_bar = ft.SnackBar(ft.Text("Error al procesar la imagen."), bgcolor=ft.Colors.RED)
                 self.page.snack_bar.open = True
-                self.page.update()
+                self.scheduler.mark_dirty()
         else:
-            logging.info("Selección de archivo cancelada.")
+            logger.info("Selección de archivo cancelada.")
 
     # --- Métodos existentes que se mantienen o se simplifican ---
 
     # ¡MÉTODO MODIFICADO Y UNIFICADO!
     async def load_data(self, e=None):
         """
-        Implementa el patrón 'Cargar y Luego Mostrar' para una carga de datos robusta.
+        Stale-while-revalidate: si hay un snapshot de la última visita se pinta al
+        instante y luego se revalida en segundo plano; solo se parchea la lista si
+        los datos cambiaron. Sin snapshot, la lista se carga de forma progresiva.
         """
-        logging.info("Ejecutando load_data en InventoryView (con patrón de carga).")
+        logger.info("Ejecutando load_data en InventoryView.")
+        snapshot = self.controller.get_cached_inventory()
+        if snapshot is not None:
+            await self._render_rows_progressively(snapshot.rows)
+            try:
+                await db_ready.wait()
+                fresh_rows = await self.controller.revalidate_inventory(snapshot)
+            except Exception as ex:
+                # Nos quedamos con la lista del snapshot; el error ya se registró.
+                logger.error("Error al revalidar la lista de productos: %s", ex, exc_info=True)
+                return
+            if fresh_rows is not None:
+                self._apply_rows(fresh_rows)
+            return
+
+        await self._stream_rows()
 
-        # --- FASE 1: Mostrar Carga y Mensaje (si existe) ---
-        self.products_list_container.controls.clear()
+    async def _stream_rows(self):
+        """
+        Carga la lista de productos de forma progresiva: cada bloque que entrega
+        el controlador se convierte en tarjetas y se pinta con un único update,
+        así la primera pantalla aparece sin esperar al catálogo completo.
+        """
+        # --- FASE 1: Mostrar Carga ---
         self.progress_ring.visible = True
+        self.products_list_container.controls = [self.progress_ring]
+        self._cards_by_id = {}
 
-        # ¡CAMBIO CLAVE! Forzar la actualización de la UI ANTES de cualquier operación async.
-        # Esto muestra el ProgressRing inmediatamente y libera el hilo de la UI.
-        self.page.update()
+        # ¡CAMBIO CLAVE! Marcar la UI como sucia ANTES de cualquier operación async.
+        # El scheduler la envía en cuanto la consulta cede el event loop, así el
+        # ProgressRing aparece de inmediato sin un update extra.
+        self.scheduler.mark_dirty()
 
-        # --- FASE 2: Cargar Datos (la parte lenta) ---
-        product_cards = []
+        # --- FASE 2: Cargar y pintar por bloques ---
+        loaded = 0
         try:
-            products = await self.controller.load_products()
-            logging.info(f"Productos cargados: {len(products)}.")
-
-            if products:
-                for product in products:
-                    product_cards.append(
-                        InventoryProductCard(
-                            product,
-                            on_edit_click=self._on_edit_product_click,
-                            on_delete_click=self._on_delete_product_click
-                        )
-                    )
-            else:
-                product_cards.append(
-                    ft.Text("No hay productos para mostrar.", color=ft.Colors.GREY_400)
-                )
+            # Normalmente la DB ya está lista (main2 crea esta vista después),
+            # pero si no, esperamos aquí con el ProgressRing visible.
+            await db_ready.wait()
+            async for chunk in self.controller.stream_inventory_rows():
+                if loaded == 0:
+                    # Primer bloque: el ProgressRing deja su lugar a las tarjetas.
+                    self.progress_ring.visible = False
+                    self.products_list_container.controls = []
+                self.products_list_container.controls.extend(self._card_for_row(row) for row in chunk)
+                loaded += len(chunk)
+                # Un update coalescido por bloque; Flet solo envía las tarjetas nuevas.
+                self.scheduler.mark_dirty(self.products_list_container)
+
+            if loaded == 0:
+                self.products_list_container.controls = [self._empty_text()]
         except Exception as ex:
-            logging.error(f"Error al construir las tarjetas de producto:  {ex}", exc_info=True)
-            product_cards.append(ft.Text("Error al cargar la lista de productos.", color=ft.Colors.RED))
+            logger.error("Error al construir las tarjetas de producto:  %s", ex, exc_info=True)
+            if loaded == 0:
+                self.products_list_container.controls = []
+            self.products_list_container.controls.append(
+                ft.Text("Error al cargar la lista de productos.", color=ft.Colors.RED)
+            )
 
-        # --- FASE 3: Mostrar Resultados ---
+        # --- FASE 3: Estado final ---
         self.progress_ring.visible = False
-        self.products_list_container.controls = product_cards  # Asignar la lista completa de una vez
+        self.scheduler.mark_dirty(self.products_list_container)
+        logger.info("Lista de productos renderizada en la UI: %s productos.", loaded)
+
+    async def _render_rows_progressively(self, rows: List, first_chunk_size: int = 20, chunk_size: int = 100):
+        """Pinta filas ya disponibles (snapshot) por bloques, cediendo el loop entre bloques."""
+        self.progress_ring.visible = False
+        self._cards_by_id = {}
+        if not rows:
+            self.products_list_container.controls = [self._empty_text()]
+            self.scheduler.mark_dirty(self.products_list_container)
+            return
+
+        self.products_list_container.controls = []
+        start, size = 0, first_chunk_size
+        while start < len(rows):
+            self.products_list_container.controls.extend(
+                self._card_for_row(row) for row in rows[start:start + size]
+            )
+            self.scheduler.mark_dirty(self.products_list_container)
+            # Cedemos el loop para que el scheduler envíe este bloque antes de construir el siguiente.
+            await asyncio.sleep(0)
+            start += size
+            size = chunk_size
+        logger.info("Lista de productos pintada desde el snapshot: %s productos.", len(rows))
+
+    def _apply_rows(self, rows: List):
+        """
+        Parchea la lista con filas frescas: las tarjetas cuya fila no cambió se
+        reutilizan, así Flet solo envía las que son nuevas o distintas.
+        """
+        previous = self._cards_by_id
+        self._cards_by_id = {}
+        controls = []
+        rebuilt = 0
+        for row in rows:
+            current = previous.get(row.id)
+            if current is not None and current[0] == row:
+                self._cards_by_id[row.id] = current
+                controls.append(current[1])
+            else:
+                controls.append(self._card_for_row(row))
+                rebuilt += 1
+        removed = len(previous.keys() - self._cards_by_id.keys())
+        self.products_list_container.controls = controls or [self._empty_text()]
+        self.scheduler.mark_dirty(self.products_list_container)
+        patch_log.info("Lista de productos parcheada: %s tarjetas nuevas/cambiadas, %s eliminadas.", rebuilt, removed)
+
+    async def update_list(self, rows: List):
+        """
+        Muestra los resultados de una búsqueda o filtro. El controlador entrega
+        filas de tarjeta, así que se reutilizan las tarjetas que ya estaban en pantalla.
+        """
+        self._apply_rows(rows)
+
+    def remove_product_card(self, product_id: int) -> Optional[Tuple[int, object, InventoryProductCard]]:
+        """
+        Quita la tarjeta de un producto sin recargar la lista (eliminación optimista).
+        Returns:
+            (posición, fila, tarjeta) para restaurarla si la escritura falla, o None si no estaba.
+        """
+        entry = self._cards_by_id.pop(product_id, None)
+        if entry is None:
+            return None
+        controls = self.products_list_container.controls
+        index = controls.index(entry[1])
+        del controls[index]
+        if not self._cards_by_id:
+            controls.append(self._empty_text())
+        self.scheduler.mark_dirty(self.products_list_container)
+        return index, entry[0], entry[1]
+
+    def restore_product_card(self, removed: Tuple[int, object, InventoryProductCard]):
+        """Vuelve a poner una tarjeta quitada con remove_product_card, en su posición."""
+        index, row, card = removed
+        if row.id in self._cards_by_id:
+            return
+        if not self._cards_by_id:
+            # Solo quedaba el texto de "no hay productos".
+            self.products_list_container.controls = []
+        controls = self.products_list_container.controls
+        controls.insert(min(index, len(controls)), card)
+        self._cards_by_id[row.id] = (row, card)
+        self.scheduler.mark_dirty(self.products_list_container)
+
+    def patch_product_row(self, row):
+        """Reemplaza solo la tarjeta de un producto si su fila cambió (edición optimista o su reversión)."""
+        entry = self._cards_by_id.get(row.id)
+        if entry is None or entry[0] == row:
+            return
+        controls = self.products_list_container.controls
+        controls[controls.index(entry[1])] = self._card_for_row(row)
+        self.scheduler.mark_dirty(self.products_list_container)
+
+    def insert_product_row(self, row):
+        """Inserta la tarjeta de un producto nuevo en su posición por nombre."""
+        if row.id in self._cards_by_id:
+            return
+        if not self._cards_by_id:
+            self.products_list_container.controls = []
+        rows_by_card = {id(card): shown for shown, card in self._cards_by_id.values()}
+        controls = self.products_list_container.controls
+        index = next((i for i, control in enumerate(controls)
+                      if id(control) in rows_by_card and rows_by_card[id(control)].name > row.name), len(controls))
+        controls.insert(index, self._card_for_row(row))
+        self.scheduler.mark_dirty(self.products_list_container)
+
+    def _on_product_change(self, event: ChangeEvent):
+        """Suscriptor del bus: aplica un cambio de producto confirmado a la tarjeta afectada."""
+        if event.kind == ChangeKind.INVALIDATED:
+            # Otro proceso escribió: se relee la lista y se parchean solo las tarjetas distintas.
+            if self._showing_catalog:
+                self.tasks.run(self._refresh_rows, key="product_list", priority=TaskPriority.LOW)
+            return
+        if event.kind == ChangeKind.DELETED:
+            self.remove_product_card(event.entity_id)
+            return
+        changed = {key: value for key, value in event.values.items() if key in ROW_FIELDS}
+        if event.kind == ChangeKind.UPDATED:
+            entry = self._cards_by_id.get(event.entity_id)
+            if entry is not None and changed:
+                self.patch_product_row(entry[0]._replace(**changed))
+        elif self._showing_catalog and ROW_FIELDS <= changed.keys():
+            self.insert_product_row(InventoryRow(id=event.entity_id, **changed))
+
+    async def _refresh_rows(self):
+        self._apply_rows(await self.controller.refresh_inventory())
+
+    def _card_for_row(self, row) -> InventoryProductCard:
+        """Crea la tarjeta de una fila y la registra por ID de producto."""
+        card = self._build_product_card(row)
+        self._cards_by_id[row.id] = (row, card)
+        return card
+
+    def _build_product_card(self, product) -> InventoryProductCard:
+        """Crea la tarjeta de un producto con los manejadores de la vista."""
+        return InventoryProductCard(
+            product,
+            on_edit_click=self._on_edit_product_click,
+            on_delete_click=self._on_delete_product_click
+        )
 
-        # Actualizar la UI para mostrar la lista final
-        self.page.update()
-        logging.info("Lista de productos renderizada en la UI.")
+    @staticmethod
+    def _empty_text() -> ft.Text:
+        return ft.Text("No hay productos para mostrar.", color=ft.Colors.GREY_400)
 
     def _on_edit_product_click(self, e, product_id: int):
         """
             Manejador síncrono que navega a la página de edición.
         """
-        logging.info(f"Navegando para editar producto ID: {product_id}.")
+        logger.info("Navegando para editar producto ID: %s.", product_id)
         self.page.go(f"/product/edit/{product_id}")
 
     def _on_delete_product_click(self, e, product_id: int):
@@ -294,18 +495,19 @@ class InventoryView(ft.View):
             Manejador síncrono que le pide a la página que ejecute la
             corutina de eliminación del controlador en segundo plano.
         """
-        logging.info(f"Clic en eliminar producto ID: {product_id}.")
-        self.page.run_task(self.controller.delete_product_clicked, e, product_id)
+        logger.info("Clic en eliminar producto ID: %s.", product_id)
+        self.tasks.run(self.controller.delete_product_clicked, e, product_id, priority=TaskPriority.HIGH)
 
     # ¡MODIFICADO!
     def _filter_products(self, filter_type: str):
         """
         Captura el evento de clic en un botón de filtro y lo delega al controlador.
         """
-        logging.info(f"Evento de filtro '{filter_type}' capturado en la vista.")
-        # Usamos page.run_task para ejecutar la corutina del controlador en segundo plano
-        self.page.run_task(self.controller.filter_products, filter_type)
-        self.page.update()
+        logger.info("Evento de filtro '%s' capturado en la vista.", filter_type)
+        self._showing_catalog = filter_type == "all"
+        # La corutina del controlador corre en segundo plano; un filtro o búsqueda
+        # nuevo cancela al anterior, ambos escriben en la misma lista.
+        self.tasks.run(self.controller.filter_products, filter_type, key="product_list")
 
     # ¡MODIFICADO!
     def _handle_search_click(self, e):
@@ -314,8 +516,9 @@ class InventoryView(ft.View):
         if not self.search_field.visible and self.search_field.value:
             # Si se oculta el campo y tenía texto, limpiar la búsqueda
             self.search_field.value = ""
-            self.page.run_task(self.controller.search_products, "")
-        self.page.update()
+            self._showing_catalog = True
+            self.tasks.run(self.controller.search_products, "", key="product_list")
+        self.scheduler.mark_dirty()
 
     def _handle_bottom_navigation(self, e):
         # ... (lógica de navegación)
@@ -326,4 +529,5 @@ class InventoryView(ft.View):
     # ¡NUEVO!
     def _on_search_change(self, e):
         """Delega la búsqueda al controlador cada vez que el texto cambia."""
-        self.page.run_task(self.controller.search_products, e.control.value)
+        self._showing_catalog = not e.control.value
+        self.tasks.run(self.controller.search_products, e.control.value, key="product_list")
@@ -1,16 +1,24 @@
 # views/product_add_view.py
+import asyncio
 import flet as ft
-from typing import Optional
+from typing import Dict, List, Optional
 import logging
 import os
-import shutil
 from pathlib import Path
 from controllers.inventory_controller import InventoryController
+from core.overlay_manager import get_overlay_manager
+from core.task_manager import get_task_manager
+from core.update_scheduler import get_scheduler
+from core.worker_pool import run_io
+from data.utils import copy_with_sha256
 # ¡CAMBIO! Importamos los servicios directamente para desacoplar la vista del controlador
 # La vista solo necesita los datos, no toda la lógica del controlador.
 from services.supplier_service import SupplierService
 from services.category_service import CategoryService
 
+logger = logging.getLogger(__name__)
+
+
 # --- Definición de Colores y Estilos para mantener consistencia ---
 APP_BG_COLOR = "#000000"
 PRIMARY_TEXT_COLOR = "#E0E0E0"
@@ -22,6 +30,9 @@ BORDER_COLOR_FOCUSED = "#2F80ED"
 # Obtiene la ruta absoluta al directorio de assets usando pathlib y os
 assets_dir = os.path.join(Path(os.path.dirname(__file__)).parent, "assets") # Asumiendo que estás en views/product_form_view.py
 
+# Archivos que se copian a la vez al agregar varias imágenes.
+UPLOAD_WORKERS = 4
+
 class ProductAddView(ft.View):
     """
     Vista de formulario rediseñada para agregar un nuevo producto,
@@ -29,7 +40,7 @@ class ProductAddView(ft.View):
     """
 
     def __init__(self, page: ft.Page, product_id: Optional[int] = None):
-        logging.info(f"Iniciando constructor de ProductAddView. product_id: {product_id}")
+        logger.info("Iniciando constructor de ProductAddView. product_id: %s", product_id)
         super().__init__(
             route="/product/add_new",
             bgcolor=APP_BG_COLOR,
@@ -37,6 +48,10 @@ class ProductAddView(ft.View):
             scroll=ft.ScrollMode.ADAPTIVE
         )
         self.page = page
+        self.scheduler = get_scheduler(page)
+        self.overlays = get_overlay_manager(page)
+        # Tareas en segundo plano de la vista (ej. copiar imágenes): se cancelan al desmontarla.
+        self.tasks = get_task_manager(self)
         self.product_id_to_edit = product_id
 
         # --- Inicialización de Servicios y Controlador ---
@@ -44,9 +59,9 @@ class ProductAddView(ft.View):
             self.supplier_service = SupplierService()
             self.category_service = CategoryService()
             self.controller = InventoryController(page)
-            logging.info("Servicios y controlador inicializados correctamente.")
+            logger.info("Servicios y controlador inicializados correctamente.")
         except Exception as e:
-            logging.error(f"Error al inicializar servicios/controlador: {e}", exc_info=True)
+            logger.error("Error al inicializar servicios/controlador: %s", e, exc_info=True)
             # Mostrar error en la UI si falla la inicialización
             self.controls.append(ft.Text("Error crítico al inicializar la vista.", color=ft.Colors.RED))
             return
@@ -69,15 +84,14 @@ class ProductAddView(ft.View):
             fit=ft.ImageFit.CONTAIN,
         )
         self.thumbnails_row = ft.Row(scroll=ft.ScrollMode.ADAPTIVE)
+        # Miniaturas ya construidas (por ruta) y las de archivos que aún se están copiando.
+        self._thumbnails: Dict[str, ft.Container] = {}
+        self._pending_thumbnails: List[ft.Container] = []
 
-        # FilePicker para agregar nuevas imágenes
-        self.add_image_picker = ft.FilePicker(on_result=self._on_add_image_result)
-        self.page.overlay.append(self.add_image_picker)
-
-        # FilePicker para reemplazar la imagen principal
-        self.replace_image_picker = ft.FilePicker(on_result=self._on_replace_image_result)
-        self.page.overlay.append(self.replace_image_picker)
-        logging.info("FilePickers añadidos al overlay de la página.")
+        # Un solo FilePicker (el compartido de la página) sirve para agregar
+        # imágenes y para reemplazar la principal: cada botón lo reapunta a su
+        # manejador antes de abrirlo.
+        self.overlays.file_picker(self)
 
         # --- Controles del Formulario ---
         self.sku_field = ft.TextField(label="SKU*", border_color=ft.Colors.GREY_700, bgcolor=FIELD_BG_COLOR,
@@ -159,10 +173,10 @@ class ProductAddView(ft.View):
         # Esto es síncrono y prepara la vista antes de las llamadas de red.
         self._update_image_previews()
 
-        logging.info("Constructor de ProductAddView finalizado.")
+        logger.info("Constructor de ProductAddView finalizado.")
 
     def _build_ui(self):
-        logging.info("Construyendo la UI de ProductAddView.")
+        logger.info("Construyendo la UI de ProductAddView.")
         # --- Encabezado ---
         self.appbar = ft.AppBar(
             leading=ft.TextButton(
@@ -188,7 +202,7 @@ class ProductAddView(ft.View):
                     icon=ft.Icons.EDIT,
                         icon_color=ft.Colors.WHITE,
                         bgcolor=ACCENT_COLOR,
-                        on_click=lambda _: self.replace_image_picker.pick_files(
+                        on_click=lambda _: self.overlays.file_picker(self, self._on_replace_image_result).pick_files(
                             allow_multiple=False,
                             allowed_extensions=["png", "jpg","jpeg"])),
                     alignment=ft.alignment.top_right, padding=10),
@@ -204,7 +218,7 @@ class ProductAddView(ft.View):
             padding=20,
             bgcolor=APP_BG_COLOR,
             border_radius=10,
-            on_click=lambda _: self.add_image_picker.pick_files(
+            on_click=lambda _: self.overlays.file_picker(self, self._on_add_image_result).pick_files(
                 allow_multiple=True,
                 allowed_extensions=["png", "jpg", "jpeg"]),
             alignment=ft.alignment.center,
@@ -243,94 +257,179 @@ class ProductAddView(ft.View):
                                            width=float('inf'), on_click=self._on_save_click),
                          padding=ft.padding.symmetric(horizontal=20, vertical=10), alignment=ft.alignment.bottom_center)
         ]
-        logging.info("UI de ProductAddView construida.")
+        logger.info("UI de ProductAddView construida.")
 
     async def _load_async_data(self, e):
         """
         Carga datos que requieren llamadas de red (async) después de que la vista se monta.
         """
-        logging.info("Cargando datos asíncronos para el formulario (on_mount).")
+        logger.info("Cargando datos asíncronos para el formulario (on_mount).")
         try:
             # Cargar datos para dropdowns
-            suppliers = await self.supplier_service.get_all_suppliers()
+            suppliers = await self.supplier_service.get_supplier_summaries()
             self.supplier_dropdown.options = [ft.dropdown.Option(key=s.id, text=s.name) for s in suppliers]
-            logging.info(f"{len(suppliers)} proveedores cargados.")
+            logger.info("%s proveedores cargados.", len(suppliers))
 
-            categories = await self.category_service.get_all_categories()
+            categories = await self.category_service.get_category_summaries()
             self.category_dropdown.options = [ft.dropdown.Option(key=c.id, text=c.name) for c in categories]
-            logging.info(f"{len(categories)} categorías cargadas.")
+            logger.info("%s categorías cargadas.", len(categories))
 
             # Si estamos editando, cargar datos existentes
             if self.product_id_to_edit:
-                logging.info(f"Modo edición: cargando datos para producto ID {self.product_id_to_edit}.")
+                logger.info("Modo edición: cargando datos para producto ID %s.", self.product_id_to_edit)
                 # ... (lógica para cargar datos del producto)
 
-            self.page.update()
-            logging.info("Datos asíncronos cargados y UI actualizada.")
+            self.scheduler.mark_dirty()
+            logger.info("Datos asíncronos cargados y UI actualizada.")
         except Exception as e:
-            logging.error(f"Error en _load_async_data: {e}", exc_info=True)
+            logger.error("Error en _load_async_data: %s", e, exc_info=True)
 
-    def _copy_and_get_relative_path(self, file_path: str, file_name: str) -> str:
-        """Copia un archivo a la carpeta de assets/uploads y devuelve la ruta relativa."""
-        uploads_dir = os.path.join(assets_dir, "uploads")
-        os.makedirs(uploads_dir, exist_ok=True)
-        destination_path = os.path.join(uploads_dir, file_name)
-        shutil.copy(file_path, destination_path)
-        return f"uploads/{file_name}"
+    def will_unmount(self):
+        """Cancela las copias pendientes y suelta el manejador del FilePicker compartido."""
+        self.tasks.close()
+        self.overlays.release(self)
+        super().will_unmount()
 
     def _on_add_image_result(self, e: ft.FilePickerResultEvent):
         if e.files:
-            logging.info(f"Agregando {len(e.files)} nueva(s) imagen(es).")
-            for file in e.files:
-                relative_path = self._copy_and_get_relative_path(file.path, file.name)
-                self.image_paths.append(relative_path)
-            self._update_image_previews()
+            logger.info("Agregando %s nueva(s) imagen(es).", len(e.files))
+            # Las copias corren en segundo plano: el formulario sigue respondiendo
+            # y cada miniatura aparece en cuanto su archivo termina de copiarse.
+            self.tasks.run(self._ingest_images, [file.path for file in e.files], name="ingest_images")
         else:
-            logging.warning("Selección de archivo para agregar cancelada.")
-        self.page.update()
+            logger.warning("Selección de archivo para agregar cancelada.")
+
+    async def _ingest_images(self, paths: List[str]):
+        """
+        Copia varias imágenes a assets/uploads, como mucho UPLOAD_WORKERS a la vez
+        (en el pool de E/S compartido). Cada archivo tiene una miniatura de
+        "cargando" que se reemplaza cuando termina; solo se envían al cliente las
+        miniaturas nuevas, las que ya estaban en la fila no se reconstruyen.
+        """
+        uploads_dir = os.path.join(assets_dir, "uploads")
+        placeholders = [self._build_pending_thumbnail() for _ in paths]
+        self._pending_thumbnails.extend(placeholders)
+        self.thumbnails_row.controls.extend(placeholders)
+        self.scheduler.mark_dirty(self.thumbnails_row)
+
+        semaphore = asyncio.Semaphore(UPLOAD_WORKERS)
+
+        async def ingest(path: str, placeholder: ft.Container):
+            async with semaphore:
+                try:
+                    return placeholder, await run_io(copy_with_sha256, path, uploads_dir)
+                except OSError as ex:
+                    logger.error("No se pudo copiar la imagen %s: %s", path, ex)
+                    return placeholder, None
+
+        jobs = [asyncio.ensure_future(ingest(path, placeholder)) for path, placeholder in zip(paths, placeholders)]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(jobs):
+                placeholder, file_name = await next_done
+                self._pending_thumbnails.remove(placeholder)
+                if placeholder in self.thumbnails_row.controls:
+                    self.thumbnails_row.controls.remove(placeholder)
+                if file_name is None:
+                    failed += 1
+                else:
+                    self._add_image(f"uploads/{file_name}")
+                self.scheduler.mark_dirty(self.thumbnails_row)
+        finally:
+            # Si la vista se cierra a mitad de la carga, no quedan copias colgadas.
+            for job in jobs:
+                job.cancel()
+        logger.info("%s imagen(es) agregadas, %s con error.", len(paths) - failed, failed)
+        if failed:
+            self.page.snack_bar = ft.SnackBar(ft.Text(f"No se pudieron agregar {failed} imagen(es)."),
+                                              bgcolor=ft.Colors.RED)
+            self.page.snack_bar.open = True
+            self.scheduler.mark_dirty()
+
+    def _add_image(self, path: str):
+        """Agrega una imagen ya copiada y su miniatura, detrás de las que ya estaban."""
+        if path in self.image_paths:
+            logger.info("La imagen %s ya estaba agregada.", path)
+            return
+        self.image_paths.append(path)
+        index = len(self.image_paths) - 1
+        self.thumbnails_row.controls.insert(index, self._thumbnail_for(index, path))
+        if index == self.main_image_index:
+            self.main_image_preview.src = path
+            self.scheduler.mark_dirty(self.main_image_preview)
 
     def _on_replace_image_result(self, e: ft.FilePickerResultEvent):
         if e.files:
-            logging.info("Reemplazando la imagen principal.")
-            relative_path = self._copy_and_get_relative_path(e.files[0].path, e.files[0].name)
-            if self.image_paths:
-                self.image_paths[0] = relative_path  # Reemplaza la primera imagen (la principal)
-            else:
-                self.image_paths.append(relative_path)
-            self._update_image_previews()
+            logger.info("Reemplazando la imagen principal.")
+            # Igual que al agregar: la copia corre en el pool de E/S, con nombre por contenido.
+            self.tasks.run(self._replace_main_image, e.files[0].path, name="replace_image")
         else:
-            logging.warning("Selección de archivo para reemplazar cancelada.")
-        self.page.update()
+            logger.warning("Selección de archivo para reemplazar cancelada.")
+
+    async def _replace_main_image(self, path: str):
+        """Copia la imagen elegida a assets/uploads y la pone en lugar de la principal."""
+        try:
+            file_name = await run_io(copy_with_sha256, path, os.path.join(assets_dir, "uploads"))
+        except OSError as ex:
+            logger.error("No se pudo copiar la imagen %s: %s", path, ex)
+            self.page.snack_bar = ft.SnackBar(ft.Text("No se pudo reemplazar la imagen."), bgcolor=ft.Colors.RED)
+            self.page.snack_bar.open = True
+            self.scheduler.mark_dirty()
+            return
+        relative_path = f"uploads/{file_name}"
+        if self.image_paths:
+            self.image_paths[0] = relative_path  # Reemplaza la primera imagen (la principal)
+        else:
+            self.image_paths.append(relative_path)
+        self._update_image_previews()
+        self.scheduler.mark_dirty()
 
     def _update_image_previews(self):
         """Actualiza la imagen principal y las miniaturas."""
-        logging.info(f"Actualizando vistas previas. Índice principal: {self.main_image_index}")
+        logger.info("Actualizando vistas previas. Índice principal: %s", self.main_image_index)
         if self.image_paths:
             # border = ft.border.all(2, ACCENT_COLOR) if i == self.main_image_index else None,
             # ¡CAMBIO! La imagen principal ahora es la que está en el índice seleccionado.
             self.main_image_preview.src = self.image_paths[self.main_image_index]
             # El borde ahora depende del índice seleccionado.
 
+            # Las miniaturas que ya existían se reutilizan: Flet solo envía las nuevas.
             self.thumbnails_row.controls = [
-                ft.Container(
-                    # ¡CAMBIO! La imagen principal ahora es la que está en el índice seleccionado.
-                    content=ft.Image(src=path, width=50, height=50, fit=ft.ImageFit.COVER, border_radius=8),
-                    border=ft.border.all(2, ACCENT_COLOR) if i == 0 else None,  # Resaltar la principal
-                    padding=2, on_click=lambda e,  index=i: self._set_main_image(index)
-                ) for i, path in enumerate(self.image_paths)
-            ]
+                self._thumbnail_for(i, path) for i, path in enumerate(self.image_paths)
+            ] + self._pending_thumbnails
         else:
             self.main_image_preview.src = "assets/images/placeholder.png"
-            self.thumbnails_row.controls = []
+            self.thumbnails_row.controls = list(self._pending_thumbnails)
         # self.page.update()
 
         # No es necesario llamar a page.update() aquí, ya que se llamará después de
         # que el constructor termine o después de una acción del usuario.
         # Los controles individuales se actualizan si es necesario.
-        if self.main_image_preview.page: self.main_image_preview.update()
-        if self.thumbnails_row.page: self.thumbnails_row.update()
-
-        logging.info(f"Vistas previas actualizadas. Imagen principal actualizada a: {self.main_image_preview.src}")
+        if self.main_image_preview.page:
+            self.scheduler.mark_dirty(self.main_image_preview, self.thumbnails_row)
+
+        logger.info("Vistas previas actualizadas. Imagen principal actualizada a: %s", self.main_image_preview.src)
+
+    def _thumbnail_for(self, index: int, path: str) -> ft.Container:
+        """Miniatura de una imagen; se construye una sola vez por posición y ruta."""
+        thumbnail = self._thumbnails.get(path)
+        if thumbnail is None or thumbnail.data != index:
+            thumbnail = ft.Container(
+                content=ft.Image(src=path, width=50, height=50, fit=ft.ImageFit.COVER, border_radius=8),
+                border=ft.border.all(2, ACCENT_COLOR) if index == 0 else None,  # Resaltar la principal
+                padding=2, on_click=lambda e: self._set_main_image(index), data=index,
+            )
+            self._thumbnails[path] = thumbnail
+        return thumbnail
+
+    @staticmethod
+    def _build_pending_thumbnail() -> ft.Container:
+        """Miniatura de "cargando" mientras se copia el archivo."""
+        return ft.Container(
+            content=ft.ProgressRing(width=20, height=20, stroke_width=2),
+            width=54, height=54, alignment=ft.alignment.center,
+            bgcolor="#111111", border_radius=8,
+        )
 
     # ¡NUEVO! Añade este método a tu clase ProductAddView si no lo tienes.
     def _set_main_image(self, index: int):
@@ -339,7 +438,7 @@ class ProductAddView(ft.View):
         SIN reordenar la lista.
         """
 
-        logging.info(f"Visualizando imagen del índice {index}.")
+        logger.info("Visualizando imagen del índice %s.", index)
         self.main_image_index = index
         # Simplemente volvemos a renderizar las vistas previas.
         # _update_image_previews ahora usará el nuevo índice para determinar
@@ -351,7 +450,7 @@ class ProductAddView(ft.View):
                 Ahora solo recolecta datos y delega TODA la operación al controlador.
                 Ya no maneja excepciones ni la navegación.
                 """
-        logging.info("Botón 'Guardar Producto' presionado.")
+        logger.info("Botón 'Guardar Producto' presionado.")
         # --- ¡CORRECCIÓN! Validar y convertir los datos ANTES de enviarlos ---
         try:
             # Limpiar el formato de miles (ej. '500.000' -> '500000') y convertir a float
@@ -365,12 +464,12 @@ class ProductAddView(ft.View):
             supplier_id = self.supplier_dropdown.value
 
         except ValueError as ve:
-            logging.error(f"Error de conversión de tipo en el formulario: {ve}")
+            logger.error("Error de conversión de tipo en el formulario: %s", ve)
             self.page.snack_bar = ft.SnackBar(ft.Text("Por favor, introduce números válidos para precios y stock."),
                                               bgcolor=ft.Colors.RED)
             self.page.snack_bar.open = True
+            self.scheduler.mark_dirty()
             return  # Detener la ejecución si los datos no son válidos
-        self.page.update()
 
         product_data = {
             "image_path": self.image_paths[0] if self.image_paths else None,
@@ -387,7 +486,8 @@ class ProductAddView(ft.View):
             "location": self.location_field.value,
         }
 
-        logging.info(f"Datos recolectados y validados: {product_data}")
+        # Copia: el registro se formatea después, en el hilo escritor.
+        logger.debug("Datos recolectados y validados: %s", dict(product_data))
 
         try:
             if self.product_id_to_edit is None:
@@ -406,14 +506,12 @@ class ProductAddView(ft.View):
                     # No hacemos nada más para no navegar fuera del formulario.
                     pass
             else:
-                # Lógica para actualizar (también debería devolver el producto actualizado)
-                updated_product = await self.controller.update_product_clicked(e, self.product_id_to_edit, product_data)
-                if updated_product:
-                    self.controller._show_snackbar(f"Producto '{updated_product.name}' actualizado exitosamente.")
-                    self.page.go("/inventory")
+                # Edición optimista: el controlador ya navega al inventario con la
+                # tarjeta editada y muestra el resultado (o revierte si falla).
+                await self.controller.update_product_clicked(e, self.product_id_to_edit, product_data)
 
         except Exception as ex:
-            logging.error(f"Error inesperado en _on_save_click: {ex}", exc_info=True)
+            logger.error("Error inesperado en _on_save_click: %s", ex, exc_info=True)
             self.controller._show_snackbar(f"Error crítico: {ex}", ft.Colors.RED)
 
 
@@ -6,11 +6,15 @@ import os
 import shutil
 from pathlib import Path
 from controllers.inventory_controller import InventoryController
+from core.overlay_manager import get_overlay_manager
 # ¡CAMBIO! Importamos los servicios directamente para desacoplar la vista del controlador
 # La vista solo necesita los datos, no toda la lógica del controlador.
 from services.supplier_service import SupplierService
 from services.product_service import ProductService
 
+logger = logging.getLogger(__name__)
+
+
 # Obtiene la ruta absoluta al directorio de assets usando pathlib y os
 assets_dir = os.path.join(Path(os.path.dirname(__file__)).parent, "assets") # Asumiendo que estás en views/product_form_view.py
 
@@ -37,10 +41,9 @@ class   ProductFormView(ft.View):
         # --- Controles del formulario ---
 
         # --- FilePicker para imágenes ---
-        self.file_picker = ft.FilePicker(on_result=self._on_file_picker_result)
-
-        # Es importante añadir el FilePicker al overlay de la página
-        page.overlay.append(self.file_picker)
+        # Usamos el FilePicker compartido de la página (se agrega al overlay una sola vez).
+        self.overlays = get_overlay_manager(page)
+        self.file_picker = self.overlays.file_picker(self, self._on_file_picker_result)
 
         # CORRECCIÓN: Inicializar el atributo correctamente:
         self.image_path = image_path   # Para guardar la ruta de la imagen
@@ -136,7 +139,7 @@ class   ProductFormView(ft.View):
                             ft.ElevatedButton(
                                 "Subir Imagen",
                                 icon=ft.Icons.UPLOAD_FILE,
-                                on_click=lambda _: self.file_picker.pick_files(
+                                on_click=lambda _: self.overlays.file_picker(self, self._on_file_picker_result).pick_files(
                                     allow_multiple=False,
                                     allowed_extensions=["png", "jpg", "jpeg"]
                                 ),
@@ -167,6 +170,11 @@ class   ProductFormView(ft.View):
             )
         ]
 
+    def will_unmount(self):
+        """Suelta el manejador del FilePicker compartido para no retener esta vista."""
+        self.overlays.release(self)
+        super().will_unmount()
+
     def _on_file_picker_result(self, e: ft.FilePickerResultEvent):
         if e.files:
             selected_file = e.files[0]
@@ -185,9 +193,9 @@ class   ProductFormView(ft.View):
             # Actualizar la vista previa de la imagen
             self.image_preview.src = self.image_path
             self.image_preview.update()
-            logging.info(f"Imagen guardada en: {self.image_path}")
+            logger.info("Imagen guardada en: %s", self.image_path)
         else:
-            logging.info("Selección de archivo cancelada.")
+            logger.info("Selección de archivo cancelada.")
 
     async def _load_data_for_editing(self, e):
         """Si estamos en modo edición, carga los datos del producto."""
@@ -198,11 +206,11 @@ class   ProductFormView(ft.View):
         for supplier in suppliers:
             # El `key` es el ID que guardaremos, el `text` es lo que ve el usuario
             supplier_options.append(
-                ft.dropdown.Option(key=supplier.id, text=f"{supplier.first_name} {supplier.last_name}"))
+                ft.dropdown.Option(key=supplier.id, text=supplier.name))
         self.supplier_dropdown.options = supplier_options
 
         if self.product_id_to_edit:
-            logging.info(f"Cargando datos para editar producto ID: {self.product_id_to_edit}")
+            logger.info("Cargando datos para editar producto ID: %s", self.product_id_to_edit)
             product = await self.controller.get_product_details(self.product_id_to_edit)
             if product:
                 self.name_field.value = product.name
@@ -224,7 +232,7 @@ class   ProductFormView(ft.View):
 
                 self.page.update()
             else:
-                logging.error(f"No se encontró el producto con ID {self.product_id_to_edit} para editar.")
+                logger.error("No se encontró el producto con ID %s para editar.", self.product_id_to_edit)
                 self.page.snack_bar = ft.SnackBar(ft.Text("Error: Producto no encontrado."), bgcolor=ft.Colors.RED)
                 self.page.snack_bar.open = True
                 self.page.go("/inventory")
@@ -245,15 +253,11 @@ class   ProductFormView(ft.View):
 
         }
 
+        # El controlador navega al inventario y muestra el resultado: al crear,
+        # solo si se guardó; al editar, de inmediato (edición optimista).
         if self.product_id_to_edit is None:
             # Agregar nuevo producto
             await self.controller.add_product_clicked(e, product_data)
         else:
             # Actualizar producto existente
             await self.controller.update_product_clicked(e, self.product_id_to_edit, product_data)
-
-        # Guardar mensaje de éxito para la siguiente vista
-        self.page.client_storage.set("snackbar_message",
-                                     f"Producto '{product_data['name']}' guardado exitosamente.")
-        # Después de guardar, volver a la lista de inventario
-        self.page.go("/inventory")